@@ -0,0 +1,187 @@
+"""
+Benchmarks for occurrence generation, storage and weekly snapshots.
+
+    python -m benchmarks.bench                          # run and compare with benchmarks/baseline.json
+    python -m benchmarks.bench --sizes 10 1000 1000000  # pick dataset sizes
+    python -m benchmarks.bench --save-baseline          # record the current numbers as the baseline
+
+Results are printed as JSON (or written with --output). When a baseline exists, any case that
+is slower than baseline by more than --tolerance is timed again with more repeats, and fails
+the run with exit status 1 only if it is still slow. Timings depend on the machine, so record a
+baseline on the machine the comparison runs on.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from models.bill import RecurringBill
+from models.occurrence_cache import occurrence_cache
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import WEEKDAYS
+from storage.data_manager import load_bills, save_bills
+from utils.weekly_snapshot import calculate_balance_and_income, get_bills_this_week
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TODAY = date(2025, 5, 7)
+FREQUENCIES = ["weekly", "biweekly", "monthly", "monthly", "semimonthly", "every 10 days"]
+
+# Cases faster than this are too noisy to compare against a baseline
+MIN_COMPARABLE_SECONDS = 0.02
+# File cases depend on the page cache and disk, so they need a longer run to compare
+IO_CASES = ("save_bills", "load_bills")
+IO_MIN_COMPARABLE_SECONDS = 0.1
+
+
+def generate_bills(count, seed=0):
+    """
+    Synthetic bills with mixed frequencies and start dates spread over four decades.
+    """
+    rng = random.Random(seed)
+    bills = []
+    for i in range(count):
+        start_date = date(1985, 1, 1) + timedelta(days=rng.randrange(365 * 40))
+        frequency = rng.choice(FREQUENCIES)
+        day = rng.choice(WEEKDAYS)
+        if frequency in ("weekly", "biweekly") and rng.random() < 0.8:
+            day = WEEKDAYS[start_date.weekday()]
+        elif frequency == "monthly" and rng.random() < 0.3:
+            day = str(rng.randrange(1, 29))
+        end_date = start_date + timedelta(days=rng.randrange(365, 365 * 30)) if rng.random() < 0.3 else None
+        bills.append(RecurringBill(f"Bill {i}", round(rng.uniform(5, 2000), 2), frequency, day, start_date,
+                                   end_date))
+    return bills
+
+
+def generate_pay_periods(count, seed=0):
+    rng = random.Random(seed + 1)
+    return [RecurringPayPeriod(f"Pay {i}", round(rng.uniform(500, 5000), 2), rng.choice(FREQUENCIES),
+                               rng.choice(WEEKDAYS), date(1985, 1, 1) + timedelta(days=rng.randrange(365 * 40)))
+            for i in range(count)]
+
+
+def best_of(repeat, fn):
+    """
+    Runs fn `repeat` times with a cold occurrence cache and returns the fastest wall time in
+    seconds. The garbage collector is paused while timing, as timeit does.
+    """
+    best = None
+    for _ in range(repeat):
+        occurrence_cache.clear()
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _cases(size, directory):
+    """
+    Returns {case name: fn} for one dataset size. File cases read and write under `directory`.
+    """
+    bills = generate_bills(size)
+    pays = generate_pay_periods(max(1, size // 10))
+    week_start = TODAY - timedelta(days=TODAY.weekday())
+    week_end = week_start + timedelta(days=6)
+    path = os.path.join(directory, f'bills_{size}.json')
+    save_bills(bills, path)  # So load_bills can be timed on its own
+
+    return {
+        f"get_occurrences_between/{size}": lambda: [bill.get_occurrences_between(week_start, week_end)
+                                                    for bill in bills],
+        f"payments_made_by/{size}": lambda: [bill.payments_made_by(TODAY) for bill in bills],
+        f"get_bills_this_week/{size}": lambda: get_bills_this_week(bills, TODAY),
+        f"calculate_balance_and_income/{size}": lambda: calculate_balance_and_income(pays, bills, TODAY),
+        f"save_bills/{size}": lambda: save_bills(bills, path),
+        f"load_bills/{size}": lambda: load_bills(path),
+    }
+
+
+def run(sizes, repeat=3, only=None):
+    """
+    Times every case for each size, or just the cases named in `only`.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for case, fn in _cases(size, directory).items():
+                if only is None or case in only:
+                    results[case] = best_of(repeat, fn)
+    return results
+
+
+def _min_comparable(case):
+    return IO_MIN_COMPARABLE_SECONDS if case.split("/")[0] in IO_CASES else MIN_COMPARABLE_SECONDS
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns a list of (case, baseline seconds, current seconds) for every case slower than
+    baseline * (1 + tolerance). Cases missing from either side, or too fast to measure
+    reliably (see MIN_COMPARABLE_SECONDS and IO_MIN_COMPARABLE_SECONDS), are skipped.
+    """
+    regressions = []
+    for case, seconds in results.items():
+        reference = baseline.get(case)
+        if reference is None or max(seconds, reference) < _min_comparable(case):
+            continue
+        if seconds > reference * (1 + tolerance):
+            regressions.append((case, reference, seconds))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bill Tracker benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 means 50%%")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    report = json.dumps({"results": results}, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report + "\n")
+    else:
+        print(report)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, 'r') as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        # A single slow run is often noise: time the flagged cases again and keep the best
+        flagged = {case for case, _, _ in regressions}
+        sizes = sorted({int(case.split("/")[1]) for case in flagged})
+        for case, seconds in run(sizes, args.repeat * 2, only=flagged).items():
+            results[case] = min(results[case], seconds)
+        regressions = compare(results, baseline, args.tolerance)
+    for case, reference, seconds in regressions:
+        print(f"REGRESSION {case}: {reference * 1000:.2f} ms -> {seconds * 1000:.2f} ms "
+              f"({seconds / reference:.1f}x)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+from benchmarks.bench import IO_MIN_COMPARABLE_SECONDS, MIN_COMPARABLE_SECONDS, compare, generate_bills, run
+
+
+def test_generated_bills_are_deterministic_and_mixed():
+    bills = generate_bills(200)
+    assert [bill.fingerprint() for bill in bills] == [bill.fingerprint() for bill in generate_bills(200)]
+    assert len({bill.frequency for bill in bills}) > 3
+    assert min(bill.start_date for bill in bills).year < 1995 < max(bill.start_date for bill in bills).year
+
+
+def test_run_reports_every_case():
+    results = run([10], repeat=1)
+    assert set(results) == {f"{case}/10" for case in (
+        "get_occurrences_between", "payments_made_by", "get_bills_this_week",
+        "calculate_balance_and_income", "save_bills", "load_bills")}
+    assert all(seconds >= 0 for seconds in results.values())
+    assert set(run([10], repeat=1, only={"load_bills/10"})) == {"load_bills/10"}
+
+
+def test_compare_flags_only_real_slowdowns():
+    slow = MIN_COMPARABLE_SECONDS * 10
+    baseline = {"a": slow, "b": slow, "tiny": MIN_COMPARABLE_SECONDS / 10}
+    results = {"a": slow * 1.2, "b": slow * 2, "tiny": MIN_COMPARABLE_SECONDS / 2, "new": slow}
+    assert compare(results, baseline, tolerance=0.5) == [("b", slow, slow * 2)]
+
+
+def test_file_cases_need_a_longer_run_to_compare():
+    slow = MIN_COMPARABLE_SECONDS * 2
+    assert slow < IO_MIN_COMPARABLE_SECONDS
+    baseline = {"load_bills/10000": slow, "get_bills_this_week/10000": slow}
+    results = {case: slow * 2 for case in baseline}
+    assert compare(results, baseline, tolerance=0.5) == [("get_bills_this_week/10000", slow, slow * 2)]
@@ -0,0 +1,286 @@
+"""
+Headless command line interface: `python -m billtracker <command>`.
+
+Nothing here imports customtkinter or tkcalendar, and each command imports the models and
+utils it needs only when it runs, so the CLI starts quickly and works without a display.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+BILLS_FILE = 'data/bills.json'
+PAY_PERIODS_FILE = 'data/pay_periods.json'
+LEDGER_FILE = 'data/bill_tracker.db'
+
+
+def _date(text):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date (use YYYY-MM-DD): {text}")
+
+
+def _load(args):
+    from storage.data_manager import load_bills_table, load_pay_periods_table
+
+    # Served from the binary cache next to each JSON file when it is up to date
+    return load_pay_periods_table(args.pay_periods), load_bills_table(args.bills)
+
+
+def _money(amount):
+    # Dollar amounts in results are exact conversions of cents, so they format exactly
+    from utils.money import format_cents, to_cents
+
+    return format_cents(to_cents(amount))
+
+
+def _emit(args, data, lines):
+    if args.json:
+        json.dump(data, sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+    else:
+        for line in lines:
+            print(line)
+
+
+def cmd_snapshot(args):
+    from storage.ledger import PaymentLedger
+    from utils.weekly_snapshot import get_week_range, weekly_summary
+
+    paychecks, bills = _load(args)
+    # Payments recorded by `reconcile` settle their bills; no ledger file means nothing recorded yet
+    ledger = PaymentLedger(args.ledger) if os.path.exists(args.ledger) else None
+    summary = weekly_summary(paychecks, bills, args.date, ledger)
+    start, end = get_week_range(args.date)
+
+    data = {
+        "week_start": start, "week_end": end,
+        "bills_due": [{"name": bill.name, "amount": bill.amount, "date": d} for bill, d in summary.bills_due],
+        "overdue": [{"name": bill.name, "amount": bill.amount, "date": d} for bill, d in summary.overdue],
+        "pay_received": [{"name": pay.name, "amount": pay.amount, "date": d} for pay, d in summary.pay_occurred],
+        "pay_upcoming": [{"name": pay.name, "amount": pay.amount, "date": d} for pay, d in summary.pay_upcoming],
+        "total_income": summary.total_income,
+        "total_bills": summary.total_bills,
+        "disposable_income": summary.disposable_income,
+    }
+    lines = [f"Week of {start.isoformat()} to {end.isoformat()}"]
+    for label, key in (("Bills due", "bills_due"), ("Overdue", "overdue"), ("Pay received", "pay_received"),
+                       ("Upcoming pay", "pay_upcoming")):
+        lines.append(f"{label}:")
+        lines.extend(f"  {entry['date'].strftime('%a %m/%d')}  {entry['name']}  {_money(entry['amount'])}"
+                     for entry in data[key])
+        if not data[key]:
+            lines.append("  None")
+    lines.append(f"Total income: {_money(summary.total_income)}")
+    lines.append(f"Total bills: {_money(summary.total_bills)}")
+    lines.append(f"Disposable income: {_money(summary.disposable_income)}")
+    _emit(args, data, lines)
+
+
+def cmd_forecast(args):
+    from utils.forecast import forecast, write_forecast_csv
+
+    paychecks, bills = _load(args)
+    rows = forecast(paychecks, bills, args.start, years=args.years, granularity=args.granularity,
+                    opening_balance=args.opening_balance)
+    if args.csv:
+        count = write_forecast_csv(rows, args.csv)
+        print(f"Wrote {count} rows to {args.csv}")
+        return
+
+    # Rows are streamed as they are produced, one JSON object per line in JSON mode
+    for row in rows:
+        if args.json:
+            print(json.dumps(row._asdict(), default=str))
+        else:
+            print(f"{row.period_start.isoformat()}  income {_money(row.income):>11}  bills {_money(row.bills):>11}"
+                  f"  balance {_money(row.balance):>13}")
+
+
+def cmd_due_between(args):
+    from utils.weekly_snapshot import cash_flow_timeline
+
+    _, bills = _load(args)
+    events = list(cash_flow_timeline([], bills, args.start, args.end))
+    data = [{"date": event.date, "name": event.item.name, "amount": event.amount} for event in events]
+    lines = [f"{entry['date'].isoformat()}  {entry['name']}  {_money(entry['amount'])}" for entry in data]
+    _emit(args, data, lines or ["None"])
+
+
+def cmd_allocate(args):
+    from utils.allocation import allocate
+    from utils.money import format_cents
+
+    paychecks, bills = _load(args)
+    report = allocate(paychecks, bills, args.start, args.end)
+    data = {
+        "allocations": [{"paycheck": a.paycheck.name, "date": a.date, "amount": a.amount, "committed": a.committed,
+                         "free": a.free, "bills": [{"name": bill.name, "date": d} for bill, d in a.bills]}
+                        for a in report.allocations],
+        "unfunded": [{"name": bill.name, "amount": bill.amount, "date": d} for bill, d in report.unfunded],
+    }
+    lines = []
+    for a in report.allocations:
+        lines.append(f"{a.date.isoformat()}  {a.paycheck.name}  {_money(a.amount)}  committed {_money(a.committed)}"
+                     f"  free {_money(a.free)}")
+        lines.extend(f"    {d.isoformat()}  {bill.name}  {format_cents(bill.amount_cents)}" for bill, d in a.bills)
+    if report.unfunded:
+        lines.append("Unfunded:")
+        lines.extend(f"    {d.isoformat()}  {bill.name}  {format_cents(bill.amount_cents)}"
+                     for bill, d in report.unfunded)
+    _emit(args, data, lines or ["None"])
+
+
+def cmd_import(args):
+    from models.bill import RecurringBill
+    from models.pay_period import RecurringPayPeriod
+    from storage.data_manager import append_jsonl, is_database, iter_bills, iter_pay_periods
+    from storage.journal import JournalStore
+    from storage.sqlite_backend import SqliteStore
+
+    if args.kind == "bills":
+        item_class, target, read_jsonl = RecurringBill, args.bills, iter_bills
+    else:
+        item_class, target, read_jsonl = RecurringPayPeriod, args.pay_periods, iter_pay_periods
+
+    if args.source.endswith('.jsonl'):
+        items = read_jsonl(args.source)
+    else:
+        with open(args.source, 'r') as source_file:
+            items = [item_class.from_dict(record) for record in json.load(source_file)]
+
+    # Each imported item is one append (a line for JSON Lines, a row for a database, a journal
+    # record otherwise), the existing file isn't rewritten
+    if target.endswith('.jsonl'):
+        count = append_jsonl(items, target)
+    else:
+        store = SqliteStore(target, item_class) if is_database(target) else JournalStore(target, item_class)
+        count = 0
+        for item in items:
+            store.add(item)
+            count += 1
+    _emit(args, {"imported": count, "target": target}, [f"Imported {count} {args.kind} into {target}"])
+
+
+def cmd_reconcile(args):
+    from storage.data_manager import load_bills
+    from storage.ledger import PaymentLedger
+    from utils.bank_import import iter_transactions, match_transactions
+    from utils.money import format_cents
+
+    ledger = None if args.dry_run else PaymentLedger(args.ledger)
+    report = match_transactions(load_bills(args.bills), iter_transactions(args.statement), ledger,
+                                window_days=args.window)
+    data = {
+        "matched": [{"date": t.date, "amount": -t.amount, "bill": bill.name, "due": d} for t, bill, d in report.matched],
+        "unmatched": [{"date": t.date, "amount": t.amount, "description": t.description} for t in report.unmatched],
+        "missing": [{"bill": bill.name, "amount": bill.amount, "due": d} for bill, d in report.missing],
+        "credits": report.credits,
+    }
+    lines = [f"Matched {len(report.matched)} payments, {len(report.unmatched)} unmatched debits, "
+             f"{len(report.missing)} expected bills not found, {report.credits} credits ignored"]
+    lines.extend(f"  unmatched {t.date.isoformat()}  {t.description}  {format_cents(-t.amount_cents)}"
+                 for t in report.unmatched)
+    lines.extend(f"  missing   {d.isoformat()}  {bill.name}  {format_cents(bill.amount_cents)}"
+                 for bill, d in report.missing)
+    _emit(args, data, lines)
+
+
+def cmd_batch(args):
+    from utils.batch_runner import run_batch
+
+    report = run_batch(args.root, args.date, workers=args.workers, chunksize=args.chunksize,
+                       forecast_years=args.forecast_years)
+    totals = report["totals"]
+    lines = [f"{report['tenant_count']} tenants, {len(report['errors'])} errors",
+             f"Bills: {totals['bills']}  Overdue: {totals['overdue']}",
+             f"Total income: {_money(totals['total_income'])}  Total bills: {_money(totals['total_bills'])}"]
+    lines.extend(f"  {error['tenant']}: {error['error']}" for error in report["errors"])
+    _emit(args, report, lines)
+
+
+def cmd_migrate(args):
+    from storage.sqlite_backend import migrate_from_json
+
+    bills, paychecks = migrate_from_json(args.bills, args.pay_periods, args.database)
+    _emit(args, {"bills": bills, "pay_periods": paychecks, "database": args.database},
+          [f"Copied {bills} bills and {paychecks} pay periods into {args.database}",
+           f"Use --db {args.database} to work with it"])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="billtracker", description="Bill Tracker command line tools")
+    parser.add_argument("--bills", default=BILLS_FILE, help="bills file (.json, .jsonl or .db)")
+    parser.add_argument("--pay-periods", default=PAY_PERIODS_FILE, help="pay periods file (.json, .jsonl or .db)")
+    parser.add_argument("--db", metavar="FILE",
+                        help="keep bills and pay periods in this SQLite database instead of --bills/--pay-periods")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of text")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="record timings and counters to FILE (.json, otherwise a pstats file)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="bills and pay for the week containing a date")
+    snapshot.add_argument("--date", type=_date, default=date.today())
+    snapshot.add_argument("--ledger", default=LEDGER_FILE, help="payment ledger database")
+    snapshot.set_defaults(handler=cmd_snapshot)
+
+    forecast = commands.add_parser("forecast", help="project income, bills and balance")
+    forecast.add_argument("--start", type=_date, default=date.today())
+    forecast.add_argument("--years", type=int, default=5)
+    forecast.add_argument("--granularity", choices=["week", "month"], default="month")
+    forecast.add_argument("--opening-balance", type=float, default=0.0)
+    forecast.add_argument("--csv", help="write the forecast to this CSV file instead of printing it")
+    forecast.set_defaults(handler=cmd_forecast)
+
+    due = commands.add_parser("due-between", help="bills due between two dates, inclusive")
+    due.add_argument("start", type=_date)
+    due.add_argument("end", type=_date)
+    due.set_defaults(handler=cmd_due_between)
+
+    allocation = commands.add_parser("allocate", help="show which paycheck funds each bill between two dates")
+    allocation.add_argument("start", type=_date)
+    allocation.add_argument("end", type=_date)
+    allocation.set_defaults(handler=cmd_allocate)
+
+    importer = commands.add_parser("import", help="append bills or pay periods from a .json/.jsonl file")
+    importer.add_argument("source")
+    importer.add_argument("--kind", choices=["bills", "pay-periods"], default="bills")
+    importer.set_defaults(handler=cmd_import)
+
+    reconcile = commands.add_parser("reconcile", help="match a bank CSV/OFX statement to bills and mark them paid")
+    reconcile.add_argument("statement")
+    reconcile.add_argument("--ledger", default=LEDGER_FILE, help="payment ledger database")
+    reconcile.add_argument("--window", type=int, default=3, help="days a payment may land from its due date")
+    reconcile.add_argument("--dry-run", action="store_true", help="report matches without recording them")
+    reconcile.set_defaults(handler=cmd_reconcile)
+
+    batch = commands.add_parser("batch", help="snapshot every tenant directory under a root in parallel")
+    batch.add_argument("root")
+    batch.add_argument("--date", type=_date, default=date.today())
+    batch.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    batch.add_argument("--chunksize", type=int, help="tenants sent to a worker at a time")
+    batch.add_argument("--forecast-years", type=int, default=0)
+    batch.set_defaults(handler=cmd_batch)
+
+    migrate = commands.add_parser("migrate", help="copy the --bills/--pay-periods JSON files into a SQLite database")
+    migrate.add_argument("database")
+    migrate.set_defaults(handler=cmd_migrate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.db:
+        args.bills = args.pay_periods = args.db
+    if not args.profile:
+        args.handler(args)
+        return 0
+
+    from utils import instrumentation
+
+    with instrumentation.recording():
+        args.handler(args)
+    instrumentation.dump(args.profile)
+    return 0
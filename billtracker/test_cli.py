@@ -0,0 +1,115 @@
+import json
+import subprocess
+import sys
+from datetime import date
+from billtracker.cli import main
+from models.bill import RecurringBill
+from storage.data_manager import load_bills, save_bills, save_bills_jsonl
+
+
+def test_snapshot_and_due_between_json(tmp_path, capsys):
+    bills_file = str(tmp_path / "bills.json")
+    save_bills([RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)),
+                RecurringBill("Gym", 15.0, "weekly", "Tuesday", date(2025, 1, 7))], bills_file)
+    common = ["--bills", bills_file, "--pay-periods", str(tmp_path / "none.json"), "--json"]
+
+    main(common + ["snapshot", "--date", "2025-05-28"])
+    snapshot = json.loads(capsys.readouterr().out)
+    assert [(e["name"], e["date"]) for e in snapshot["overdue"]] == [("Gym", "2025-05-27")]
+    assert [(e["name"], e["date"]) for e in snapshot["bills_due"]] == [("Rent", "2025-06-01")]
+    assert snapshot["total_bills"] == 915.0
+
+    main(common[:-1] + ["snapshot", "--date", "2025-05-28"])
+    assert "Disposable income: -$915.00" in capsys.readouterr().out.splitlines()
+
+    main(common + ["due-between", "2025-05-26", "2025-06-02"])
+    due = json.loads(capsys.readouterr().out)
+    assert [e["name"] for e in due] == ["Gym", "Rent"]
+
+    main(common + ["allocate", "2025-05-26", "2025-06-02"])
+    allocation = json.loads(capsys.readouterr().out)
+    assert allocation["allocations"] == []
+    assert [e["name"] for e in allocation["unfunded"]] == ["Gym", "Rent"]
+
+
+def test_import_appends_to_journal(tmp_path, capsys):
+    bills_file, source = str(tmp_path / "bills.json"), str(tmp_path / "new.jsonl")
+    save_bills([RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1))], bills_file)
+    save_bills_jsonl([RecurringBill("Water", 30.0, "monthly", "10", date(2025, 1, 10))], source)
+
+    main(["--bills", bills_file, "import", source])
+    assert "Imported 1 bills" in capsys.readouterr().out
+    assert [bill.name for bill in load_bills(bills_file)] == ["Rent", "Water"]
+
+    # A JSON Lines target gets the new lines appended, whatever its length
+    for existing in (["Rent"], ["Rent", "Phone"]):
+        jsonl_file = str(tmp_path / f"{len(existing)}.jsonl")
+        save_bills_jsonl([RecurringBill(name, 900.0, "monthly", "1", date(2024, 6, 1)) for name in existing],
+                         jsonl_file)
+        main(["--bills", jsonl_file, "import", source])
+        assert [bill.name for bill in load_bills(jsonl_file)] == existing + ["Water"]
+
+
+def test_migrate_and_use_database(tmp_path, capsys):
+    bills_file, db_file = str(tmp_path / "bills.json"), str(tmp_path / "bills.db")
+    save_bills([RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1))], bills_file)
+    main(["--bills", bills_file, "--pay-periods", str(tmp_path / "none.json"), "migrate", db_file])
+    assert "Copied 1 bills and 0 pay periods" in capsys.readouterr().out
+
+    main(["--db", db_file, "--json", "due-between", "2025-06-01", "2025-06-01"])
+    assert [e["name"] for e in json.loads(capsys.readouterr().out)] == ["Rent"]
+
+
+def test_reconcile_marks_matches_paid(tmp_path, capsys):
+    from storage.ledger import PaymentLedger
+
+    bills_file, statement, ledger_file = (str(tmp_path / name) for name in ("bills.json", "bank.csv", "ledger.db"))
+    rent = RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1))
+    save_bills([rent], bills_file)
+    with open(statement, "w") as statement_file:
+        statement_file.write("Date,Description,Amount\n2025-06-02,LANDLORD,-900.00\n2025-06-03,COFFEE,-4.50\n")
+
+    main(["--bills", bills_file, "--json", "reconcile", statement, "--ledger", ledger_file])
+    report = json.loads(capsys.readouterr().out)
+    assert [(e["bill"], e["due"]) for e in report["matched"]] == [("Rent", "2025-06-01")]
+    assert [e["description"] for e in report["unmatched"]] == ["COFFEE"]
+    assert PaymentLedger(ledger_file).status(rent, date(2025, 6, 1)) == "paid"
+
+
+def test_snapshot_reads_payments_recorded_by_reconcile(tmp_path, capsys):
+    bills_file, statement, ledger_file = (str(tmp_path / name) for name in ("bills.json", "bank.csv", "ledger.db"))
+    save_bills([RecurringBill("Rent", 900.0, "monthly", "2", date(2024, 6, 2)),
+                RecurringBill("Gym", 15.0, "weekly", "Monday", date(2025, 1, 6))], bills_file)
+    with open(statement, "w") as statement_file:
+        statement_file.write("Date,Description,Amount\n2025-06-02,LANDLORD,-900.00\n")
+    common = ["--bills", bills_file, "--pay-periods", str(tmp_path / "none.json"), "--json"]
+    snapshot = common + ["snapshot", "--date", "2025-06-04", "--ledger", ledger_file]
+
+    main(snapshot)
+    assert [e["name"] for e in json.loads(capsys.readouterr().out)["overdue"]] == ["Rent", "Gym"]
+
+    main(common + ["reconcile", statement, "--ledger", ledger_file])
+    capsys.readouterr()
+    main(snapshot)
+    data = json.loads(capsys.readouterr().out)
+    assert [e["name"] for e in data["overdue"]] == ["Gym"]
+    assert data["total_bills"] == 15.0
+
+
+def test_profile_option_dumps_stats(tmp_path, capsys):
+    bills_file, profile = str(tmp_path / "bills.json"), str(tmp_path / "profile.json")
+    save_bills([RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1))], bills_file)
+
+    main(["--bills", bills_file, "--profile", profile, "snapshot", "--date", "2025-05-28"])
+    capsys.readouterr()
+    with open(profile) as profile_file:
+        stats = json.load(profile_file)
+    assert stats["functions"]["utils.weekly_snapshot.weekly_summary"]["calls"] == 1
+    assert stats["counters"]["bytes_read"] > 0
+
+
+def test_cli_does_not_import_gui_or_models_up_front():
+    code = "import sys, billtracker.cli; print(sorted(m for m in ('customtkinter', 'tkcalendar', " \
+           "'models.bill', 'utils.weekly_snapshot') if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
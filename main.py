@@ -1,11 +1,13 @@
+import argparse
 import customtkinter as ctk
 from tkinter import messagebox
-#from dashboard import DashboardPage
+from models.occurrence_cache import occurrence_cache
+from models.repository import Repository
 from ui.bills import BillPage
-#from income import IncomePage
+from ui.month_calendar import CalendarPage
 
 class MultiPageApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, database=None):
         super().__init__()  # Initialize the CTk root window
         self.title("Bill Tracker")  # Set the title of the application window
         self.geometry("1000x700")  # Set the initial size of the window
@@ -17,48 +19,49 @@ class MultiPageApp(ctk.CTk):
         # Navigation header label
         ctk.CTkLabel(nav_frame, text="Navigation", font=("Arial", 16, "bold")).pack(pady=20)
 
-        # Button to switch to the Dashboard page
-        dashboard_btn = ctk.CTkButton(nav_frame, text="Dashboard", command=self.show_dashboard)
-        dashboard_btn.pack(pady=10)
-
         # Button to switch to the Bills page
         bills_btn = ctk.CTkButton(nav_frame, text="Bills", command=self.show_bills)
         bills_btn.pack(pady=10)
 
-        # Button to switch to the Income page
-        income_btn = ctk.CTkButton(nav_frame, text="Income", command=self.show_income)
-        income_btn.pack(pady=10)
+        # Button to switch to the Calendar page
+        calendar_btn = ctk.CTkButton(nav_frame, text="Calendar", command=self.show_calendar)
+        calendar_btn.pack(pady=10)
 
         # Main container to hold the active page content
         self.container = ctk.CTkFrame(self)  # This is where different page frames will be placed
         self.container.pack(side="right", fill="both", expand=True)  # Take remaining space
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
 
-        # Dictionary to hold instances of the page classes
-        self.pages = {}
-
-        # Instantiate and grid each page class (Dashboard, Bills, Income)
-        for Page in BillPage:
-            page_name = Page.__name__  # Get class name as string
-            frame = Page(self.container, self)  # Instantiate the page frame
-            self.pages[page_name] = frame  # Store in dictionary
-            frame.grid(row=0, column=0, sticky="nsew")  # Position it in the container frame
+        # One repository of bills and pay periods shared by every page; pages and the occurrence
+        # cache subscribe to its change events and update just what changed
+        self.repository = Repository()
+        self.repository.subscribe(occurrence_cache.on_change)
 
-        # Show the dashboard page first by default
-        self.show_dashboard()
+        # Dictionary to hold each page's frame and the page object drawn in it
+        self.pages = {}
+        # With a database, bills and pay periods are loaded from and saved to its tables instead of the JSON files
+        files = {"bills_file": database, "pay_periods_file": database} if database else {}
+        for name, Page, options in (("BillPage", BillPage, files), ("CalendarPage", CalendarPage, {})):
+            frame = ctk.CTkFrame(self.container)  # Each page packs its widgets into its own frame
+            frame.grid(row=0, column=0, sticky="nsew")  # Stack the frames in the same cell
+            self.pages[name] = (frame, Page(frame, self.repository, **options))
 
-    # Method to raise the DashboardPage frame
-    def show_dashboard(self):
-        self.pages["DashboardPage"].tkraise()
+        # Show the bills page first by default
+        self.show_bills()
 
-    # Method to raise the BillsPage frame
+    # Method to raise the BillPage frame
     def show_bills(self):
-        self.pages["BillsPage"].tkraise()
+        self.pages["BillPage"][0].tkraise()
 
-    # Method to raise the IncomePage frame
-    def show_income(self):
-        self.pages["IncomePage"].tkraise()
+    # Method to raise the CalendarPage frame
+    def show_calendar(self):
+        self.pages["CalendarPage"][0].tkraise()
 
 
 if __name__ == "__main__":
-    app = MultiPageApp()  # Create an instance of the app
+    parser = argparse.ArgumentParser(description="Bill Tracker")
+    parser.add_argument("--db", metavar="FILE",
+                        help="use this SQLite database (see `python -m billtracker migrate`) instead of the JSON files")
+    app = MultiPageApp(parser.parse_args().db)  # Create an instance of the app
     app.mainloop()  # Start the Tkinter main event loop
@@ -1,5 +1,9 @@
-from datetime import date, timedelta
+from datetime import date
 from typing import Optional, List
+from models.occurrence_cache import occurrence_cache
+from models.recurrence import RecurrenceRule, clamp_to_28
+from utils import instrumentation
+from utils.money import format_cents, from_cents, to_cents
 
 
 class RecurringBill:
@@ -8,18 +12,35 @@ class RecurringBill:
     weekly, biweekly, or monthly. Optionally ends after a fixed date, with calculation for remaining payments.
     """
 
+    # Fixed attribute layout keeps large bill lists small (no per-instance __dict__)
+    __slots__ = ("name", "amount_cents", "frequency", "day_of_week", "start_date", "end_date", "_rule", "_rule_key")
+
     def __init__(self, name: str, amount: float, frequency: str, day_of_week: str, start_date: Optional[date],
                  end_date: Optional[date] = None):
         self.name = name
-        self.amount = amount
+        self.amount_cents = to_cents(amount)  # Stored exactly; `amount` reads it back as dollars
         self.frequency = frequency.lower()
         self.day_of_week = day_of_week.capitalize()
         self.start_date = start_date
         self.end_date = end_date
+        self._rule = None
+        self._rule_key = None
 
     def __repr__(self):
-        return f"<RecurringBill {self.name} - ${self.amount:.2f} {self.frequency} on {self.day_of_week}>"
+        return f"<RecurringBill {self.name} - {format_cents(self.amount_cents)} {self.frequency} on {self.day_of_week}>"
+
+    @property
+    def amount(self) -> float:
+        """
+        The amount in dollars. Setting it stores the value rounded to whole cents.
+        """
+        return from_cents(self.amount_cents)
 
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = to_cents(value)
+
+    @instrumentation.instrumented()
     def to_dict(self):
         """
         Converts the RecurringBill object into a dictionary format for JSON serialization.
@@ -33,7 +54,15 @@ class RecurringBill:
             'end_date': self.end_date.isoformat() if self.end_date else None
         }
 
+    def fingerprint(self) -> tuple:
+        """
+        Returns a hashable snapshot of every field, used as the cache key for this bill's contents.
+        """
+        return (type(self).__name__, self.name, self.amount_cents, self.frequency, self.day_of_week,
+                self.start_date, self.end_date)
+
     @classmethod
+    @instrumentation.instrumented()
     def from_dict(cls, data):
         """
         Creates a RecurringBill object from a dictionary format.
@@ -49,67 +78,35 @@ class RecurringBill:
             end_date=end_date
         )
 
+    @property
+    def rule(self) -> RecurrenceRule:
+        """
+        The compiled recurrence for this bill. It is rebuilt only when the fields it depends on change.
+        """
+        key = (self.frequency, self.day_of_week, self.start_date)
+        if self._rule_key != key:
+            self._rule = RecurrenceRule.compile(self.frequency, self.day_of_week, self.start_date,
+                                                month_step=clamp_to_28)
+            self._rule_key = key
+        return self._rule
+
+    @instrumentation.instrumented()
     def get_occurrences_between(self, start: date, end: date) -> List[date]:
         """
         Return all dates this bill occurs between `start` and `end`, inclusive.
         """
-        occurrences = []
-        if end < start:
-            return occurrences
-
-        # Determine numeric weekday
-        target_weekday = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"].index(
-            self.day_of_week)
-
-        # Find the first possible due date >= start
-        current = self.start_date
-        while current < start:
-            current = self._advance(current)
-
-        # Add all valid due dates until end (or end_date)
-        while current <= end:
-            if self.end_date and current > self.end_date:
-                break
-            if current.weekday() == target_weekday:
-                occurrences.append(current)
-            current = self._advance(current)
-
-        return occurrences
-
-    def _advance(self, current: date) -> date:
-        """
-        Advance to the next due date based on frequency.
-        """
-        if self.frequency == "weekly":
-            return current + timedelta(weeks=1)
-        elif self.frequency == "biweekly":
-            return current + timedelta(weeks=2)
-        elif self.frequency == "monthly":
-            # Monthly: add one month while preserving the day as best as possible
-            month = current.month + 1
-            year = current.year + (month - 1) // 12
-            month = (month - 1) % 12 + 1
-            day = min(current.day, 28)  # Use 28 to avoid invalid dates like Feb 30
-            return date(year, month, day)
-        else:
-            raise ValueError(f"Unsupported frequency: {self.frequency}")
+        if end < start or self.start_date is None:
+            return []
+        return self.rule.occurrences_between(start, end, self.end_date)
 
+    @instrumentation.instrumented()
     def payments_made_by(self, as_of: date) -> int:
         """
         Returns how many times this bill would have occurred on or before a specific date.
         """
-        count = 0
-        current = self.start_date
-
-        while current <= as_of:
-            if self.end_date and current > self.end_date:
-                break
-            if current.weekday() == ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday",
-                                     "Sunday"].index(self.day_of_week):
-                count += 1
-            current = self._advance(current)
-
-        return count
+        if self.start_date is None:
+            return 0
+        return self.rule.count_through(as_of, self.end_date)
 
     def total_payments(self) -> Optional[int]:
         """
@@ -118,7 +115,7 @@ class RecurringBill:
         """
         if not self.end_date:
             return None
-        return self.payments_made_by(self.end_date)
+        return occurrence_cache.payments_made_by(self, self.end_date)
 
     def remaining_payments(self, as_of: date) -> Optional[int]:
         """
@@ -127,14 +124,14 @@ class RecurringBill:
         if not self.end_date:
             return None
         total = self.total_payments()
-        payments_made = self.payments_made_by(as_of)
+        payments_made = occurrence_cache.payments_made_by(self, as_of)
         return total - payments_made if total is not None else None
 
     def payment_status(self, as_of: date) -> str:
         """
         Return a string like 'Payment 3 of 12' or 'Payment 5 of ?' depending on whether end_date is known.
         """
-        current_count = self.payments_made_by(as_of)
+        current_count = occurrence_cache.payments_made_by(self, as_of)
         total = self.total_payments()
         if total is not None:
             return f"Payment {current_count} of {total}"
@@ -0,0 +1,177 @@
+import sys
+from array import array
+from datetime import date
+from typing import Iterable, Iterator, List
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import RecurrenceRule, clamp_to_28, clamp_to_month_end
+
+
+class BillTable:
+    """
+    Columnar container for many bills (or pay periods with `item_class=RecurringPayPeriod`).
+
+    Each field is one compact array: amounts as int cents, dates as day ordinals (0 for none),
+    and frequency, day and name as indexes into interned string lists. Indexing or iterating
+    yields lightweight row views with the same API as the model, so code written against a
+    list of RecurringBill objects (e.g. utils.weekly_snapshot) works unchanged.
+    """
+
+    def __init__(self, item_class=RecurringBill):
+        self.item_class = item_class
+        self.cents = array('q')
+        self.start = array('i')
+        self.end = array('i')
+        self.frequency = array('I')
+        self.day = array('I')
+        self.name = array('I')
+        self._strings = {}  # Interned string -> index, shared by the frequency, day and name columns
+        self.strings = []
+        self._rules = {}  # Rows with the same schedule share one compiled rule
+
+    @classmethod
+    def from_items(cls, items: Iterable, item_class=RecurringBill) -> "BillTable":
+        table = cls(item_class)
+        for item in items:
+            table.append(item)
+        return table
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[dict], item_class=RecurringBill) -> "BillTable":
+        return cls.from_items((item_class.from_dict(record) for record in records), item_class)
+
+    def _intern(self, text: str) -> int:
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self.strings)
+            self.strings.append(sys.intern(text))
+        return index
+
+    def append(self, item):
+        end_date = getattr(item, "end_date", None)
+        values = (item.amount_cents, item.start_date.toordinal() if item.start_date else 0,
+                  end_date.toordinal() if end_date else 0, self._intern(item.frequency),
+                  self._intern(item.day_of_week), self._intern(item.name))
+        columns = (self.cents, self.start, self.end, self.frequency, self.day, self.name)
+        count = len(self)
+        try:
+            for column, value in zip(columns, values):
+                column.append(value)
+        except (OverflowError, TypeError):
+            # A value that doesn't fit its column must not leave the columns different lengths
+            for column in columns:
+                del column[count:]
+            raise
+
+    def __len__(self):
+        return len(self.cents)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BillTable index out of range")
+        return (BillRow if self.item_class is RecurringBill else PayPeriodRow)(self, index)
+
+    def __iter__(self) -> Iterator:
+        row_class = BillRow if self.item_class is RecurringBill else PayPeriodRow
+        return (row_class(self, index) for index in range(len(self)))
+
+    def rule_for(self, index: int) -> RecurrenceRule:
+        key = (self.frequency[index], self.day[index], self.start[index])
+        rule = self._rules.get(key)
+        if rule is None:
+            frequency, day_of_week = self.strings[key[0]], self.strings[key[1]]
+            start_date = date.fromordinal(key[2])
+            if self.item_class is RecurringBill:
+                rule = RecurrenceRule.compile(frequency, day_of_week, start_date, month_step=clamp_to_28)
+            else:
+                try:
+                    rule = RecurrenceRule.compile(frequency, day_of_week, start_date,
+                                                  month_step=clamp_to_month_end, filter_weekday=False)
+                except ValueError:
+                    rule = RecurrenceRule.once(start_date)
+            self._rules[key] = rule
+        return rule
+
+    def to_items(self) -> List:
+        """
+        Builds full model objects for every row.
+        """
+        return [self.item_class.from_dict(row.to_dict()) for row in self]
+
+    def to_dicts(self) -> List[dict]:
+        return [row.to_dict() for row in self]
+
+
+class BillRow:
+    """
+    Read-only view of one row of a BillTable that behaves like a RecurringBill.
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: BillTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.table.strings[self.table.name[self.index]]
+
+    @property
+    def amount_cents(self) -> int:
+        return self.table.cents[self.index]
+
+    @property
+    def amount(self) -> float:
+        return self.table.cents[self.index] / 100
+
+    @property
+    def frequency(self) -> str:
+        return self.table.strings[self.table.frequency[self.index]]
+
+    @property
+    def day_of_week(self) -> str:
+        return self.table.strings[self.table.day[self.index]]
+
+    @property
+    def start_date(self):
+        ordinal = self.table.start[self.index]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    @property
+    def end_date(self):
+        ordinal = self.table.end[self.index]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    @property
+    def rule(self) -> RecurrenceRule:
+        return self.table.rule_for(self.index)
+
+    # The query methods only read the fields above, so the model's implementations are reused as-is
+    __repr__ = RecurringBill.__repr__
+    to_dict = RecurringBill.to_dict
+    fingerprint = RecurringBill.fingerprint
+    get_occurrences_between = RecurringBill.get_occurrences_between
+    payments_made_by = RecurringBill.payments_made_by
+    total_payments = RecurringBill.total_payments
+    remaining_payments = RecurringBill.remaining_payments
+    payment_status = RecurringBill.payment_status
+
+
+class PayPeriodRow(BillRow):
+    """
+    Read-only view of one row of a BillTable that behaves like a RecurringPayPeriod.
+    """
+
+    __slots__ = ()
+
+    end_date = None
+
+    __repr__ = RecurringPayPeriod.__repr__
+    to_dict = RecurringPayPeriod.to_dict
+    fingerprint = RecurringPayPeriod.fingerprint
+    get_occurrences_between = RecurringPayPeriod.get_occurrences_between
+    get_weekday_index = RecurringPayPeriod.get_weekday_index
+    get_pay_date_this_week = RecurringPayPeriod.get_pay_date_this_week
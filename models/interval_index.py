@@ -0,0 +1,165 @@
+import random
+from datetime import date
+from typing import Iterable, Iterator, List
+
+# Items without an end date stay active forever
+OPEN_END = date.max.toordinal()
+
+
+class _Node:
+    __slots__ = ("start", "seq", "end", "item", "priority", "max_end", "left", "right")
+
+    def __init__(self, start, seq, end, item, priority):
+        self.start = start
+        self.seq = seq
+        self.end = end
+        self.item = item
+        self.priority = priority
+        self.max_end = end
+        self.left = None
+        self.right = None
+
+    def update(self):
+        self.max_end = self.end
+        if self.left is not None and self.left.max_end > self.max_end:
+            self.max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > self.max_end:
+            self.max_end = self.right.max_end
+
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left, pivot.right = pivot.right, node
+    node.update()
+    pivot.update()
+    return pivot
+
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right, pivot.left = pivot.left, node
+    node.update()
+    pivot.update()
+    return pivot
+
+
+class IntervalIndex:
+    """
+    Index of bills or pay periods by their active range [start_date, end_date].
+
+    A treap ordered by start date where every node also knows the latest end date in its
+    subtree. A window query skips any subtree that ends before the window and stops walking
+    right once start dates pass the window, so it only visits candidate items instead of
+    every item. Adding and removing items is O(log n) expected.
+
+    The range is read when an item is added: call `update(item)` after changing its dates.
+    """
+
+    def __init__(self, items: Iterable = ()):
+        self._root = None
+        self._keys = {}  # id(item) -> (start, seq) it was indexed under
+        self._seq = 0
+        self._random = random.Random(0x5EED)
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, item):
+        return id(item) in self._keys
+
+    def __iter__(self) -> Iterator:
+        # In-order walk, i.e. by start date
+        stack, node = [], self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.item
+            node = node.right
+
+    @staticmethod
+    def _range(item):
+        # Items with no start date never occur, so they sort after every window
+        start = item.start_date.toordinal() if item.start_date else OPEN_END
+        end_date = getattr(item, "end_date", None)
+        return start, end_date.toordinal() if end_date else OPEN_END
+
+    def add(self, item):
+        if id(item) in self._keys:
+            raise ValueError(f"{item!r} is already indexed")
+        start, end = self._range(item)
+        self._seq += 1
+        node = _Node(start, self._seq, end, item, self._random.random())
+        self._keys[id(item)] = (start, self._seq)
+        self._root = self._insert(self._root, node)
+
+    def _insert(self, root, node):
+        if root is None:
+            return node
+        if (node.start, node.seq) < (root.start, root.seq):
+            root.left = self._insert(root.left, node)
+            if root.left.priority > root.priority:
+                return _rotate_right(root)
+        else:
+            root.right = self._insert(root.right, node)
+            if root.right.priority > root.priority:
+                return _rotate_left(root)
+        root.update()
+        return root
+
+    def remove(self, item):
+        key = self._keys.pop(id(item))
+        self._root = self._delete(self._root, key)
+
+    def _delete(self, root, key):
+        if root is None:
+            return None
+        root_key = (root.start, root.seq)
+        if key < root_key:
+            root.left = self._delete(root.left, key)
+        elif key > root_key:
+            root.right = self._delete(root.right, key)
+        else:
+            # Rotate the node down until it has at most one child, then splice it out
+            if root.left is None:
+                return root.right
+            if root.right is None:
+                return root.left
+            if root.left.priority > root.right.priority:
+                root = _rotate_right(root)
+                root.right = self._delete(root.right, key)
+            else:
+                root = _rotate_left(root)
+                root.left = self._delete(root.left, key)
+        root.update()
+        return root
+
+    def update(self, item):
+        """
+        Re-indexes an item whose start or end date changed.
+        """
+        self.remove(item)
+        self.add(item)
+
+    def overlapping(self, start: date, end: date) -> List:
+        """
+        Returns the items whose active range overlaps [start, end], ordered by start date.
+        """
+        if end < start:
+            return []
+        found = []
+        self._collect(self._root, start.toordinal(), end.toordinal(), found)
+        return found
+
+    def _collect(self, node, low, high, found):
+        # Skip subtrees where everything has ended before the window
+        while node is not None and node.max_end >= low:
+            self._collect(node.left, low, high, found)
+            if node.start > high:
+                return  # This node and everything to its right start after the window
+            if node.end >= low:
+                found.append(node.item)
+            node = node.right
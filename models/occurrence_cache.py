@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from datetime import date
+from typing import Iterable, List
+
+
+class OccurrenceCache:
+    """
+    Bounded LRU cache of occurrence queries for bills and pay periods.
+
+    Entries are keyed on the item's content fingerprint plus the query, so editing a bill
+    in place simply stops matching its old entries. `prune` drops the entries of items
+    that are no longer saved, and is called whenever bills or pay periods are saved.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._keys_by_fingerprint = {}
+
+    def _lookup(self, fingerprint, query, compute):
+        key = (fingerprint, query)
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = compute()
+            self._entries[key] = value
+            self._keys_by_fingerprint.setdefault(fingerprint, set()).add(key)
+            if len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+            return value
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def _discard(self, key):
+        del self._entries[key]
+        keys = self._keys_by_fingerprint[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_fingerprint[key[0]]
+
+    def occurrences(self, item, start: date, end: date) -> List[date]:
+        """
+        Cached `item.get_occurrences_between(start, end)`.
+        """
+        dates = self._lookup(item.fingerprint(), ("between", start, end),
+                             lambda: tuple(item.get_occurrences_between(start, end)))
+        return list(dates)
+
+    def payments_made_by(self, item, as_of: date) -> int:
+        """
+        Cached `item.payments_made_by(as_of)`.
+        """
+        return self._lookup(item.fingerprint(), ("made_by", as_of), lambda: item.payments_made_by(as_of))
+
+    def invalidate(self, item):
+        """
+        Drop every entry computed for the item's current contents.
+        """
+        for key in list(self._keys_by_fingerprint.get(item.fingerprint(), ())):
+            self._discard(key)
+
+    def on_change(self, event):
+        """
+        Repository subscriber: drops the entries of an item as soon as it is edited or removed.
+        """
+        if event.previous is not None:
+            self.invalidate(event.previous)
+
+    def prune(self, live_items: Iterable, kind: type):
+        """
+        Drop entries for items of class `kind` that are not among `live_items`,
+        e.g. bills that were edited or removed before a save.
+
+        Rows of a BillTable fingerprint under their own class name (BillRow, PayPeriodRow),
+        so every tag found among the live fingerprints is pruned along with `kind`.
+        """
+        live = {item.fingerprint() for item in live_items}
+        kinds = {kind.__name__} | {fingerprint[0] for fingerprint in live}
+        for fingerprint in list(self._keys_by_fingerprint):
+            if fingerprint[0] in kinds and fingerprint not in live:
+                for key in list(self._keys_by_fingerprint[fingerprint]):
+                    self._discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_fingerprint.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+# Shared cache used by the models and utils.weekly_snapshot
+occurrence_cache = OccurrenceCache()
@@ -1,68 +1,91 @@
 from datetime import date, timedelta
 from typing import List, Optional
+from models.recurrence import RecurrenceRule, clamp_to_month_end
+from utils import instrumentation
+from utils.money import from_cents, to_cents
 
 
 class RecurringPayPeriod:
+    # Fixed attribute layout keeps large pay period lists small (no per-instance __dict__)
+    __slots__ = ("name", "amount_cents", "frequency", "day_of_week", "start_date", "_rule", "_rule_key")
+
     def __init__(self, name: str, amount: float, frequency: str, day_of_week: str, start_date: date):
         self.name = name
-        self.amount = amount
+        self.amount_cents = to_cents(amount)  # Stored exactly; `amount` reads it back as dollars
         self.frequency = frequency.lower()
         self.day_of_week = day_of_week.capitalize()
         self.start_date = start_date  # No alignment needed at this point
+        self._rule = None
+        self._rule_key = None
+
+    @property
+    def amount(self) -> float:
+        """
+        The amount in dollars. Setting it stores the value rounded to whole cents.
+        """
+        return from_cents(self.amount_cents)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_cents = to_cents(value)
+
+    @instrumentation.instrumented()
+    def to_dict(self):
+        """
+        Converts the RecurringPayPeriod object into a dictionary format for JSON serialization.
+        """
+        return {
+            'name': self.name,
+            'amount': self.amount,
+            'frequency': self.frequency,
+            'day_of_week': self.day_of_week,
+            'start_date': self.start_date.isoformat() if self.start_date else None
+        }
+
+    @classmethod
+    @instrumentation.instrumented()
+    def from_dict(cls, data):
+        """
+        Creates a RecurringPayPeriod object from a dictionary format.
+        """
+        start_date = date.fromisoformat(data['start_date']) if data['start_date'] else None
+        return cls(
+            name=data['name'],
+            amount=data['amount'],
+            frequency=data['frequency'],
+            day_of_week=data['day_of_week'],
+            start_date=start_date
+        )
+
+    def fingerprint(self) -> tuple:
+        """
+        Returns a hashable snapshot of every field, used as the cache key for this pay period's contents.
+        """
+        return (type(self).__name__, self.name, self.amount_cents, self.frequency, self.day_of_week, self.start_date)
 
     def get_weekday_index(self) -> int:
         weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
         return weekdays.index(self.day_of_week)
 
-    def _align_to_weekday(self, d: date) -> date:
+    @property
+    def rule(self) -> RecurrenceRule:
         """
-        Adjust the given date to the next occurrence of the target weekday.
+        The compiled recurrence for this pay period. It is rebuilt only when the fields it depends on change.
         """
-        target_weekday = self.get_weekday_index()
-        days_ahead = (target_weekday - d.weekday()) % 7
-        return d + timedelta(days=days_ahead)
-
-    def _add_month(self, d: date) -> date:
-        month = d.month + 1
-        year = d.year
-        if month > 12:
-            month = 1
-            year += 1
-
-        day = min(d.day, [31,
-                          29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28,
-                          31, 30, 31, 30, 31, 31, 30, 31, 30, 31][month - 1])
-        return date(year, month, day)
-
+        key = (self.frequency, self.day_of_week, self.start_date)
+        if self._rule_key != key:
+            try:
+                self._rule = RecurrenceRule.compile(self.frequency, self.day_of_week, self.start_date,
+                                                    month_step=clamp_to_month_end, filter_weekday=False)
+            except ValueError:
+                # Unknown frequencies only ever produced the start date itself
+                self._rule = RecurrenceRule.once(self.start_date)
+            self._rule_key = key
+        return self._rule
+
+    @instrumentation.instrumented()
     def get_occurrences_between(self, start_date: date, end_date: date) -> List[date]:
-        occurrences = []
-        current = self.start_date
-
-        # Fast forward to first occurrence >= start_date
-        while current < start_date:
-            if self.frequency == "weekly":
-                current += timedelta(weeks=1)
-            elif self.frequency == "biweekly":
-                current += timedelta(weeks=2)
-            elif self.frequency == "monthly":
-                current = self._add_month(current)
-            else:
-                return []
-
-        # Collect occurrences in range
-        while current <= end_date:
-            occurrences.append(current)
-
-            if self.frequency == "weekly":
-                current += timedelta(weeks=1)
-            elif self.frequency == "biweekly":
-                current += timedelta(weeks=2)
-            elif self.frequency == "monthly":
-                current = self._add_month(current)
-            else:
-                break
-
-        return occurrences
+        return self.rule.occurrences_between(start_date, end_date)
 
     def get_pay_date_this_week(self, reference_date: date) -> Optional[date]:
         start_of_week = reference_date - timedelta(days=reference_date.weekday())  # Monday
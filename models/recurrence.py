@@ -0,0 +1,245 @@
+import re
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+from utils import instrumentation
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Fixed number of days between due dates for frequencies that don't depend on the calendar
+STRIDE_DAYS = {"weekly": 7, "biweekly": 14}
+
+# Days of the month used by the semi-monthly rule
+SEMIMONTHLY_DAYS = (1, 15)
+
+EVERY_N_DAYS = re.compile(r"^every[ _-]?(\d+)[ _-]?days?$")
+
+
+def days_in_month(year: int, month: int) -> int:
+    if month == 2:
+        return 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28
+    return 30 if month in (4, 6, 9, 11) else 31
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _date_in_month(month_index: int, day: int) -> date:
+    year, month = month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day, days_in_month(year, month)))
+
+
+def clamp_to_28(anchor: date, k: int) -> date:
+    """
+    Monthly step used by bills: every date after the first falls on min(day, 28).
+    """
+    return _date_in_month(_month_index(anchor) + k, min(anchor.day, 28))
+
+
+def clamp_to_month_end(anchor: date, k: int) -> date:
+    """
+    Monthly step used by pay periods: the day is clamped to each month's length and the
+    clamp sticks (Jan 31 -> Feb 28 -> Mar 28), exactly like adding one month at a time.
+    """
+    month_index = _month_index(anchor)
+    day = anchor.day
+    # Once two Februaries have been crossed the day can't shrink any further
+    for j in range(1, min(k, 24) + 1):
+        if day <= 28:
+            break
+        day = min(day, days_in_month((month_index + j) // 12, (month_index + j) % 12 + 1))
+    return _date_in_month(month_index + k, day)
+
+
+class RecurrenceRule:
+    """
+    A recurrence compiled once from a frequency string and day: holds the stride, weekday
+    index and month-step function so occurrence queries don't re-parse anything.
+    Dates are addressed by index k (0 is the first date on or after the anchor).
+    """
+
+    STRIDE = "stride"
+    MONTHLY = "monthly"
+    DAY_OF_MONTH = "day_of_month"
+    SEMIMONTHLY = "semimonthly"
+    ONCE = "once"
+
+    def __init__(self, kind: str, anchor: date, stride: int = 0, weekday: Optional[int] = None,
+                 day_of_month: Optional[int] = None, month_step=clamp_to_28):
+        self.kind = kind
+        self.anchor = anchor
+        self.stride = stride
+        self.weekday = weekday  # Only dates on this weekday count, None means no filter
+        self.day_of_month = day_of_month
+        self.month_step = month_step
+
+        # Month/slot of the first date for the calendar-based rules
+        self._base = 0
+        if kind == self.DAY_OF_MONTH:
+            self._base = _month_index(anchor)
+            if _date_in_month(self._base, day_of_month) < anchor:
+                self._base += 1
+        elif kind == self.SEMIMONTHLY:
+            self._base = 2 * _month_index(anchor) + self._slot_in_month(anchor)
+
+    def __repr__(self):
+        return f"<RecurrenceRule {self.kind} from {self.anchor}>"
+
+    @classmethod
+    def compile(cls, frequency: str, day_of_week: Optional[str], anchor: date, month_step=clamp_to_28,
+                filter_weekday: bool = True) -> "RecurrenceRule":
+        """
+        Build a rule from the frequency/day strings stored on bills and pay periods.
+
+        Supported frequencies are weekly, biweekly, monthly, semimonthly (1st & 15th) and
+        "every N days". A numeric day (e.g. "18") with a monthly frequency means that day
+        of the month. Raises ValueError for anything else.
+        """
+        frequency = (frequency or "").strip().lower()
+        day = (day_of_week or "").strip().capitalize()
+
+        weekday = None
+        if filter_weekday and day and not day.isdigit():
+            if day not in WEEKDAYS:
+                raise ValueError(f"Unsupported day of week: {day_of_week}")
+            weekday = WEEKDAYS.index(day)
+
+        if frequency in STRIDE_DAYS:
+            return cls(cls.STRIDE, anchor, stride=STRIDE_DAYS[frequency], weekday=weekday)
+        if frequency == "monthly":
+            if day.isdigit():
+                day_of_month = int(day)
+                if not 1 <= day_of_month <= 31:
+                    raise ValueError(f"Unsupported day of month: {day_of_week}")
+                return cls(cls.DAY_OF_MONTH, anchor, day_of_month=day_of_month)
+            return cls(cls.MONTHLY, anchor, weekday=weekday, month_step=month_step)
+        if frequency in ("semimonthly", "semi-monthly"):
+            return cls(cls.SEMIMONTHLY, anchor)
+
+        match = EVERY_N_DAYS.match(frequency)
+        if match and int(match.group(1)) > 0:
+            return cls(cls.STRIDE, anchor, stride=int(match.group(1)))
+
+        raise ValueError(f"Unsupported frequency: {frequency}")
+
+    @classmethod
+    def once(cls, anchor: date) -> "RecurrenceRule":
+        return cls(cls.ONCE, anchor)
+
+    @staticmethod
+    def _slot_in_month(d: date) -> int:
+        # Index of the first semi-monthly slot on or after d, counted from the start of d's month
+        for slot, day in enumerate(SEMIMONTHLY_DAYS):
+            if d.day <= day:
+                return slot
+        return len(SEMIMONTHLY_DAYS)
+
+    def nth(self, k: int) -> date:
+        """
+        Return the k-th date of the rule without walking the earlier ones.
+        """
+        if k == 0 and self.kind in (self.STRIDE, self.MONTHLY, self.ONCE):
+            return self.anchor
+        if self.kind == self.STRIDE:
+            return self.anchor + timedelta(days=k * self.stride)
+        if self.kind == self.MONTHLY:
+            return self.month_step(self.anchor, k)
+        if self.kind == self.DAY_OF_MONTH:
+            return _date_in_month(self._base + k, self.day_of_month)
+        if self.kind == self.SEMIMONTHLY:
+            slot = self._base + k
+            return _date_in_month(slot // 2, SEMIMONTHLY_DAYS[slot % 2])
+        raise IndexError("A one-off rule only has a single date")
+
+    def index_on_or_after(self, d: date) -> int:
+        """
+        Return the index of the first date on or after `d`.
+        """
+        if d <= self.nth(0):
+            return 0
+        if self.kind == self.ONCE:
+            return 1
+        if self.kind == self.STRIDE:
+            return -(-(d - self.anchor).days // self.stride)  # Ceiling division
+        if self.kind == self.SEMIMONTHLY:
+            return 2 * _month_index(d) + self._slot_in_month(d) - self._base
+
+        # Monthly rules: date k lands in the k-th month after the first one
+        if self.kind == self.MONTHLY:
+            k = max(1, _month_index(d) - _month_index(self.anchor))
+        else:
+            k = _month_index(d) - self._base
+        return k if self.nth(k) >= d else k + 1
+
+    def _index_range(self, start: date, end: date, until: Optional[date]):
+        last = min(end, until) if until else end
+        first_index = self.index_on_or_after(start)
+        stop_index = self.index_on_or_after(last + timedelta(days=1))
+        return first_index, stop_index
+
+    def occurrences_between(self, start: date, end: date, until: Optional[date] = None) -> List[date]:
+        """
+        Return every date of the rule between `start` and `end` inclusive, stopping after `until`.
+        """
+        if end < start:
+            return []
+        first_index, stop_index = self._index_range(start, end, until)
+        if first_index >= stop_index:
+            return []
+        if instrumentation.enabled:
+            instrumentation.count("recurrence_steps", stop_index - first_index)
+
+        # Stride dates all fall on the anchor's weekday, so they either all match or none do
+        if self.weekday is not None and self.kind == self.STRIDE:
+            if self.anchor.weekday() != self.weekday:
+                return []
+        elif self.weekday is not None:
+            return [d for d in map(self.nth, range(first_index, stop_index)) if d.weekday() == self.weekday]
+        return [self.nth(k) for k in range(first_index, stop_index)]
+
+    def iter_between(self, start: date, end: date, until: Optional[date] = None) -> Iterator[date]:
+        """
+        Lazily yield the same dates as `occurrences_between`, one at a time.
+        """
+        if end < start:
+            return
+        first_index, stop_index = self._index_range(start, end, until)
+        if self.weekday is not None and self.kind == self.STRIDE and self.anchor.weekday() != self.weekday:
+            return
+        if instrumentation.enabled and stop_index > first_index:
+            instrumentation.count("recurrence_steps", stop_index - first_index)
+        for k in range(first_index, stop_index):
+            current = self.nth(k)
+            if self.weekday is None or current.weekday() == self.weekday:
+                yield current
+
+    def count_through(self, as_of: date, until: Optional[date] = None) -> int:
+        """
+        Return how many dates of the rule fall on or before `as_of` (and `until`, if given).
+        """
+        _, stop_index = self._index_range(self.anchor, as_of, until)
+        if stop_index <= 0 or self.weekday is None:
+            return max(stop_index, 0)
+        if self.kind == self.STRIDE:
+            return stop_index if self.anchor.weekday() == self.weekday else 0
+
+        # Monthly with a weekday filter. Both month steps keep a fixed day once two Februaries
+        # have passed, so after that the weekday is advanced with plain ordinal arithmetic.
+        settled = min(stop_index, 25)
+        if instrumentation.enabled:
+            instrumentation.count("recurrence_steps", stop_index)
+        count = sum(1 for k in range(settled) if self.nth(k).weekday() == self.weekday)
+        if stop_index > settled:
+            current = self.nth(settled)
+            year, month = current.year, current.month
+            ordinal = current.toordinal()
+            for _ in range(settled, stop_index):
+                # date.weekday() is (ordinal + 6) % 7
+                if (ordinal + 6) % 7 == self.weekday:
+                    count += 1
+                ordinal += days_in_month(year, month)
+                month += 1
+                if month > 12:
+                    month = 1
+                    year += 1
+        return count
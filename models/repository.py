@@ -0,0 +1,106 @@
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+from models.interval_index import IntervalIndex
+
+BILLS = "bills"
+PAY_PERIODS = "pay_periods"
+
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+RELOADED = "reloaded"  # The whole collection was replaced, e.g. after loading from disk
+
+
+class ChangeEvent(NamedTuple):
+    kind: str  # ADDED, UPDATED, REMOVED or RELOADED
+    collection: str  # BILLS or PAY_PERIODS
+    index: int  # Position of the item in its collection (-1 for RELOADED)
+    item: object  # The new item, None when removed or reloaded
+    previous: object  # The item it replaced or removed, None when added or reloaded
+
+
+class Repository:
+    """
+    In-memory home of the bills and pay periods shared by every page.
+
+    Edits go through add/update/remove/replace_all, and each one is announced to subscribers
+    as a ChangeEvent carrying the index and the old and new item. Pages redraw just that row,
+    caches drop just that item's entries, and the weekly summary recomputes just that item,
+    instead of everything reloading and recomputing from scratch.
+
+    The lists returned by `bills`/`pay_periods` are the live collections: read them, but
+    change them only through the repository so subscribers hear about it.
+
+    `index(collection)` gives an IntervalIndex of a collection by active range. It is kept
+    current from the same change events, before any subscriber hears of the change, so window
+    queries from a subscriber already see the edit.
+    """
+
+    def __init__(self, bills: Iterable = (), pay_periods: Iterable = ()):
+        self._collections: Dict[str, List] = {BILLS: list(bills), PAY_PERIODS: list(pay_periods)}
+        self._subscribers = []  # (callback, collection or None for all)
+        self._indexes: Dict[str, IntervalIndex] = {}  # Built on first use
+
+    @property
+    def bills(self) -> List:
+        return self._collections[BILLS]
+
+    @property
+    def pay_periods(self) -> List:
+        return self._collections[PAY_PERIODS]
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None], collection: Optional[str] = None) -> Callable:
+        """
+        Calls callback(event) after every change, or only after changes to `collection`.
+        Returns a function that unsubscribes it.
+        """
+        entry = (callback, collection)
+        self._subscribers.append(entry)
+        return lambda: self._subscribers.remove(entry) if entry in self._subscribers else None
+
+    def index(self, collection: str) -> IntervalIndex:
+        """
+        Returns the IntervalIndex of a collection, for queries like
+        `repository.index(BILLS).overlapping(start, end)`.
+        """
+        index = self._indexes.get(collection)
+        if index is None:
+            index = self._indexes[collection] = IntervalIndex(self._collections[collection])
+        return index
+
+    def _reindex(self, event: ChangeEvent):
+        index = self._indexes.get(event.collection)
+        if index is None:
+            return
+        if event.kind == RELOADED:
+            self._indexes[event.collection] = IntervalIndex(self._collections[event.collection])
+            return
+        if event.previous is not None:
+            index.remove(event.previous)
+        if event.item is not None:
+            index.add(event.item)
+
+    def _emit(self, event: ChangeEvent):
+        self._reindex(event)
+        for callback, collection in list(self._subscribers):
+            if collection is None or collection == event.collection:
+                callback(event)
+
+    def add(self, collection: str, item) -> int:
+        items = self._collections[collection]
+        items.append(item)
+        self._emit(ChangeEvent(ADDED, collection, len(items) - 1, item, None))
+        return len(items) - 1
+
+    def update(self, collection: str, index: int, item):
+        items = self._collections[collection]
+        previous = items[index]
+        items[index] = item
+        self._emit(ChangeEvent(UPDATED, collection, index, item, previous))
+
+    def remove(self, collection: str, index: int):
+        previous = self._collections[collection].pop(index)
+        self._emit(ChangeEvent(REMOVED, collection, index, None, previous))
+
+    def replace_all(self, collection: str, items: Iterable):
+        self._collections[collection] = list(items)
+        self._emit(ChangeEvent(RELOADED, collection, -1, None, None))
@@ -0,0 +1,52 @@
+from datetime import date
+from models.bill import RecurringBill
+from models.bill_table import BillTable
+from models.pay_period import RecurringPayPeriod
+from utils.weekly_snapshot import calculate_balance_and_income, get_bills_this_week
+
+BILLS = [
+    RecurringBill("Phone Bill", 60.0, "monthly", "Wednesday", date(2024, 1, 15)),
+    RecurringBill("Gym", 15.5, "weekly", "Tuesday", date(2025, 1, 7), end_date=date(2025, 12, 30)),
+    RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)),
+]
+PAYS = [RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10))]
+
+
+def test_rows_behave_like_models():
+    table = BillTable.from_items(BILLS)
+    assert len(table) == 3
+    assert table.to_dicts() == [bill.to_dict() for bill in BILLS]
+    assert table[1].remaining_payments(date(2025, 5, 9)) == BILLS[1].remaining_payments(date(2025, 5, 9))
+    assert [bill.to_dict() for bill in table.to_items()] == [bill.to_dict() for bill in BILLS]
+
+    pays = BillTable.from_items(PAYS, RecurringPayPeriod)
+    assert pays[0].get_pay_date_this_week(date(2025, 5, 7)) == PAYS[0].get_pay_date_this_week(date(2025, 5, 7))
+
+
+def test_weekly_snapshot_accepts_tables():
+    table = BillTable.from_items(BILLS)
+    pays = BillTable.from_items(PAYS, RecurringPayPeriod)
+    for today in (date(2025, 5, 2), date(2025, 5, 7), date(2025, 6, 3)):
+        due, overdue = get_bills_this_week(table, today)
+        expected_due, expected_overdue = get_bills_this_week(BILLS, today)
+        assert [(b.name, d) for b, d in due] == [(b.name, d) for b, d in expected_due]
+        assert [(b.name, d) for b, d in overdue] == [(b.name, d) for b, d in expected_overdue]
+        assert calculate_balance_and_income(pays, table, today) == calculate_balance_and_income(PAYS, BILLS, today)
+
+
+def test_many_strings_and_failed_append():
+    table = BillTable()
+    for i in range(70000):
+        table._intern(f"Bill {i}")
+    table.append(RecurringBill("Water", 30.0, "monthly", "Tuesday", date(2025, 1, 7)))
+    assert (table[0].name, table[0].frequency, table[0].day_of_week) == ("Water", "monthly", "Tuesday")
+
+    # A row that can't be stored leaves every column at the same length
+    huge = RecurringBill("Huge", 1.0, "monthly", "Tuesday", date(2025, 1, 7))
+    huge.amount_cents = 2 ** 63
+    try:
+        table.append(huge)
+    except OverflowError:
+        pass
+    assert [len(column) for column in (table.cents, table.start, table.end, table.frequency, table.day,
+                                       table.name)] == [1] * 6
@@ -0,0 +1,49 @@
+import random
+from datetime import date, timedelta
+from models.bill import RecurringBill
+from models.interval_index import IntervalIndex
+from utils.weekly_snapshot import get_bills_this_week
+
+
+def random_bill(rng, i):
+    start_date = date(2010, 1, 1) + timedelta(days=rng.randrange(365 * 15))
+    end_date = start_date + timedelta(days=rng.randrange(0, 365 * 3)) if rng.random() < 0.6 else None
+    return RecurringBill(f"Bill {i}", 10.0, "weekly", "Monday", start_date, end_date)
+
+
+def active(bill, start, end):
+    return bill.start_date <= end and (bill.end_date is None or bill.end_date >= start)
+
+
+def test_overlapping_matches_brute_force_under_edits():
+    rng = random.Random(5)
+    bills = [random_bill(rng, i) for i in range(500)]
+    index = IntervalIndex(bills)
+
+    for step in range(300):
+        if step % 3 == 0:
+            removed = bills.pop(rng.randrange(len(bills)))
+            index.remove(removed)
+        elif step % 3 == 1:
+            bills.append(random_bill(rng, 1000 + step))
+            index.add(bills[-1])
+        else:
+            bill = rng.choice(bills)
+            bill.end_date = bill.start_date + timedelta(days=rng.randrange(400))
+            index.update(bill)
+
+        start = date(2010, 1, 1) + timedelta(days=rng.randrange(365 * 18))
+        end = start + timedelta(days=rng.randrange(0, 60))
+        expected = {id(bill) for bill in bills if active(bill, start, end)}
+        assert {id(bill) for bill in index.overlapping(start, end)} == expected
+
+    assert len(index) == len(bills)
+    assert [bill.start_date for bill in index] == sorted(bill.start_date for bill in bills)
+
+
+def test_weekly_snapshot_uses_index():
+    bills = [RecurringBill("Old", 5.0, "weekly", "Monday", date(2020, 1, 6), date(2021, 1, 1)),
+             RecurringBill("Gym", 15.0, "weekly", "Monday", date(2025, 1, 6))]
+    due, overdue = get_bills_this_week(IntervalIndex(bills), date(2025, 5, 5))
+    assert [(bill.name, d) for bill, d in due] == [("Gym", date(2025, 5, 5))]
+    assert overdue == []
@@ -0,0 +1,50 @@
+from datetime import date
+from models.bill import RecurringBill
+from models.bill_table import BillTable
+from models.occurrence_cache import OccurrenceCache
+
+
+def test_hits_misses_and_mutation():
+    cache = OccurrenceCache()
+    bill = RecurringBill("Gym", 20.0, "weekly", "Monday", date(2025, 1, 6))
+    week = (date(2025, 5, 5), date(2025, 5, 11))
+
+    assert cache.occurrences(bill, *week) == [date(2025, 5, 5)]
+    assert cache.occurrences(bill, *week) == [date(2025, 5, 5)]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Editing the bill changes its fingerprint, so the old answer is never returned
+    bill.day_of_week = "Tuesday"
+    assert cache.occurrences(bill, *week) == []
+    assert cache.misses == 2
+
+    cache.prune([bill], RecurringBill)
+    assert cache.stats()["size"] == 1
+
+
+def test_lru_eviction_and_invalidate():
+    cache = OccurrenceCache(maxsize=2)
+    bill = RecurringBill("Loan", 100.0, "monthly", "Monday", date(2025, 1, 6), date(2025, 12, 31))
+    for month in (1, 2, 3):
+        cache.payments_made_by(bill, date(2025, month, 28))
+    assert cache.stats()["size"] == 2
+
+    cache.payments_made_by(bill, date(2025, 1, 28))  # Evicted, so it's recomputed
+    assert cache.misses == 4
+
+    cache.invalidate(bill)
+    assert cache.stats()["size"] == 0
+
+
+def test_prune_drops_stale_table_rows():
+    cache = OccurrenceCache()
+    table = BillTable.from_dicts([RecurringBill(name, 20.0, "weekly", "Monday", date(2025, 1, 6)).to_dict()
+                                  for name in ("Gym", "Pool")])
+    gym, pool = list(table)
+    week = (date(2025, 5, 5), date(2025, 5, 11))
+    cache.occurrences(gym, *week)
+    cache.occurrences(pool, *week)
+
+    # Pool was removed before the save, the rows still held by the page must not pin its entries
+    cache.prune([gym], RecurringBill)
+    assert cache.stats()["size"] == 1
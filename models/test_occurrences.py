@@ -0,0 +1,141 @@
+import random
+from datetime import date, timedelta
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import WEEKDAYS, days_in_month
+
+
+def advance(frequency, current):
+    # The original one-step advance of RecurringBill: monthly dates are clamped to the 28th
+    if frequency == "weekly":
+        return current + timedelta(weeks=1)
+    if frequency == "biweekly":
+        return current + timedelta(weeks=2)
+    month = current.month + 1
+    year = current.year + (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return date(year, month, min(current.day, 28))
+
+
+def add_month(d):
+    # The original pay period month step: clamped to the length of the next month
+    year, month = (d.year + 1, 1) if d.month == 12 else (d.year, d.month + 1)
+    return date(year, month, min(d.day, days_in_month(year, month)))
+
+
+def walk_occurrences(bill, start, end):
+    # Reference implementation: step one period at a time from start_date
+    occurrences = []
+    if end < start:
+        return occurrences
+    current = bill.start_date
+    while current < start:
+        current = advance(bill.frequency, current)
+    while current <= end:
+        if bill.end_date and current > bill.end_date:
+            break
+        if current.weekday() == WEEKDAYS.index(bill.day_of_week):
+            occurrences.append(current)
+        current = advance(bill.frequency, current)
+    return occurrences
+
+
+def walk_payments_made_by(bill, as_of):
+    count = 0
+    current = bill.start_date
+    while current <= as_of:
+        if bill.end_date and current > bill.end_date:
+            break
+        if current.weekday() == WEEKDAYS.index(bill.day_of_week):
+            count += 1
+        current = advance(bill.frequency, current)
+    return count
+
+
+def random_bill(rng):
+    start_date = date(2000, 1, 1) + timedelta(days=rng.randrange(365 * 25))
+    end_date = None
+    if rng.random() < 0.5:
+        end_date = start_date + timedelta(days=rng.randrange(-30, 365 * 5))
+    return RecurringBill(
+        name="Bill",
+        amount=10.0,
+        frequency=rng.choice(["weekly", "biweekly", "monthly"]),
+        day_of_week=rng.choice(WEEKDAYS),
+        start_date=start_date,
+        end_date=end_date
+    )
+
+
+def test_closed_form_matches_walk():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        bill = random_bill(rng)
+        # Force a weekday match for stride bills half of the time so both branches are exercised
+        if bill.frequency != "monthly" and rng.random() < 0.5:
+            bill.day_of_week = WEEKDAYS[bill.start_date.weekday()]
+
+        start = bill.start_date + timedelta(days=rng.randrange(-400, 365 * 6))
+        end = start + timedelta(days=rng.randrange(-3, 120))
+        assert bill.get_occurrences_between(start, end) == walk_occurrences(bill, start, end)
+
+        as_of = bill.start_date + timedelta(days=rng.randrange(-30, 365 * 8))
+        assert bill.payments_made_by(as_of) == walk_payments_made_by(bill, as_of)
+
+
+def test_monthly_clamps_to_28th():
+    # Start on the 31st: later dates use the 28th, exactly like stepping with advance
+    bill = RecurringBill("Rent", 900.0, "monthly", "Wednesday", date(2025, 1, 31))
+    assert bill.get_occurrences_between(date(2025, 5, 1), date(2025, 5, 31)) == [date(2025, 5, 28)]
+    assert bill.payments_made_by(date(2025, 12, 31)) == walk_payments_made_by(bill, date(2025, 12, 31))
+
+
+def walk_pay_dates(period, start, end):
+    step = {"weekly": lambda d: d + timedelta(weeks=1),
+            "biweekly": lambda d: d + timedelta(weeks=2),
+            "monthly": add_month}[period.frequency]
+    occurrences = []
+    current = period.start_date
+    while current < start:
+        current = step(current)
+    while current <= end:
+        occurrences.append(current)
+        current = step(current)
+    return occurrences
+
+
+def test_pay_period_matches_walk():
+    rng = random.Random(99)
+    for _ in range(1000):
+        # Bias towards month ends so the sticky clamp (Jan 31 -> Feb 28 -> Mar 28) is covered
+        start_date = date(2000, 1, 1) + timedelta(days=rng.randrange(365 * 25))
+        if rng.random() < 0.5:
+            start_date = start_date.replace(day=28) + timedelta(days=rng.randrange(4))
+        period = RecurringPayPeriod("Pay", 100.0, rng.choice(["weekly", "biweekly", "monthly"]),
+                                    rng.choice(WEEKDAYS), start_date)
+        start = start_date + timedelta(days=rng.randrange(-60, 365 * 4))
+        end = start + timedelta(days=rng.randrange(0, 90))
+        assert period.get_occurrences_between(start, end) == walk_pay_dates(period, start, end)
+
+
+def test_day_of_month_bill():
+    # A numeric day, as saved in data/bills.json, means that day of every month
+    bill = RecurringBill("Phone Bill", 60.0, "monthly", "18", date(2025, 5, 18))
+    assert bill.get_occurrences_between(date(2025, 5, 1), date(2025, 7, 31)) == [
+        date(2025, 5, 18), date(2025, 6, 18), date(2025, 7, 18)]
+    assert bill.payments_made_by(date(2025, 12, 31)) == 8
+
+    late = RecurringBill("Rent", 900.0, "monthly", "31", date(2025, 1, 15))
+    assert late.get_occurrences_between(date(2025, 2, 1), date(2025, 4, 30)) == [
+        date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)]
+
+
+def test_semimonthly_and_every_n_days():
+    bill = RecurringBill("Card", 25.0, "semimonthly", "", date(2025, 1, 10))
+    assert bill.get_occurrences_between(date(2025, 1, 1), date(2025, 2, 20)) == [
+        date(2025, 1, 15), date(2025, 2, 1), date(2025, 2, 15)]
+    assert bill.payments_made_by(date(2025, 3, 1)) == 4
+
+    bill = RecurringBill("Water", 5.0, "every 10 days", "", date(2025, 1, 1), end_date=date(2025, 1, 25))
+    assert bill.get_occurrences_between(date(2025, 1, 5), date(2025, 3, 1)) == [date(2025, 1, 11), date(2025, 1, 21)]
+    assert bill.payments_made_by(date(2025, 6, 1)) == 3
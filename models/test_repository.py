@@ -0,0 +1,56 @@
+from datetime import date
+from models.bill import RecurringBill
+from models.occurrence_cache import OccurrenceCache
+from models.repository import ADDED, BILLS, PAY_PERIODS, RELOADED, REMOVED, UPDATED, ChangeEvent, Repository
+
+
+def test_changes_are_announced_with_index_and_items():
+    gym = RecurringBill("Gym", 20.0, "weekly", "Monday", date(2025, 1, 6))
+    rent = RecurringBill("Rent", 900.0, "monthly", "1", date(2025, 1, 1))
+    repository = Repository()
+    events, bill_events = [], []
+    repository.subscribe(events.append)
+    unsubscribe = repository.subscribe(bill_events.append, BILLS)
+
+    assert repository.add(BILLS, gym) == 0
+    repository.update(BILLS, 0, rent)
+    repository.replace_all(PAY_PERIODS, [])
+    repository.remove(BILLS, 0)
+
+    assert events == [ChangeEvent(ADDED, BILLS, 0, gym, None), ChangeEvent(UPDATED, BILLS, 0, rent, gym),
+                      ChangeEvent(RELOADED, PAY_PERIODS, -1, None, None),
+                      ChangeEvent(REMOVED, BILLS, 0, None, rent)]
+    assert [event.collection for event in bill_events] == [BILLS, BILLS, BILLS]
+    assert repository.bills == []
+
+    unsubscribe()
+    repository.add(BILLS, gym)
+    assert len(bill_events) == 3 and len(events) == 5
+
+
+def test_occurrence_cache_drops_edited_items():
+    cache = OccurrenceCache()
+    repository = Repository([RecurringBill("Gym", 20.0, "weekly", "Monday", date(2025, 1, 6))])
+    repository.subscribe(cache.on_change)
+    cache.occurrences(repository.bills[0], date(2025, 5, 5), date(2025, 5, 11))
+    assert cache.stats()["size"] == 1
+
+    repository.update(BILLS, 0, RecurringBill("Gym", 25.0, "weekly", "Monday", date(2025, 1, 6)))
+    assert cache.stats()["size"] == 0
+
+
+def test_index_follows_edits_before_subscribers_run():
+    repository = Repository([RecurringBill("Gym", 20.0, "weekly", "Monday", date(2025, 1, 6), date(2025, 3, 31))])
+    index = repository.index(BILLS)
+    seen = []
+    repository.subscribe(lambda event: seen.append(repository.index(BILLS).overlapping(date(2025, 5, 1),
+                                                                                        date(2025, 5, 31))))
+    rent = RecurringBill("Rent", 900.0, "monthly", "1", date(2025, 1, 1))
+    repository.add(BILLS, rent)
+    repository.update(BILLS, 0, RecurringBill("Gym", 20.0, "weekly", "Monday", date(2025, 4, 7)))
+    repository.remove(BILLS, 1)
+    assert [[bill.name for bill in found] for found in seen] == [["Rent"], ["Rent", "Gym"], ["Gym"]]
+    assert len(index) == 1
+
+    repository.replace_all(BILLS, [rent])
+    assert repository.index(BILLS).overlapping(date(2025, 5, 1), date(2025, 5, 31)) == [rent]
@@ -1,66 +1,511 @@
+import atexit
+import hashlib
 import os
 import json
+import threading
+import time
+import weakref
+from typing import Callable, Iterable, Iterator, Optional
 from models.bill import RecurringBill
+from models.bill_table import BillTable
+from models.occurrence_cache import occurrence_cache
 from models.pay_period import RecurringPayPeriod
+from models.repository import ADDED, REMOVED, UPDATED
+from storage.journal import JournalStore, atomic_open, write_atomic
+from storage.snapshot_cache import open_cache, write_cache
+from utils import instrumentation
 
 # Default file paths
 BILLS_FILE = '../data/bills.json'
 PAY_PERIODS_FILE = '../data/pay_periods.json'
 
+# Paths with these extensions are SQLite databases (storage.sqlite_backend) rather than JSON files
+DATABASE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
 
+
+def is_database(file_path) -> bool:
+    return file_path.endswith(DATABASE_EXTENSIONS)
+
+
+def _sqlite_backend():
+    # Imported on use: sqlite_backend imports this module for its migration defaults
+    from storage import sqlite_backend
+    return sqlite_backend
+
+
+def _remove_journal(file_path):
+    # The snapshot just written already reflects every journaled edit
+    if os.path.exists(file_path + '.journal'):
+        os.remove(file_path + '.journal')
+
+
+@instrumentation.instrumented()
+def _read_json(file_path):
+    # Kept separate so profiles show JSON parsing apart from from_dict
+    with open(file_path, 'r') as json_file:
+        data = json.load(json_file)
+    if instrumentation.enabled:
+        instrumentation.count("bytes_read", os.path.getsize(file_path))
+    return data
+
+
+def _write_json(items, file_path):
+    if file_path.endswith('.jsonl'):
+        _write_jsonl(items, file_path)  # Same format dispatch as load_bills/load_pay_periods
+        return
+    data = json.dumps([item.to_dict() for item in items], indent=4).encode()
+    write_atomic(file_path, data)
+    if instrumentation.enabled:
+        instrumentation.count("bytes_written", len(data))
+
+
+@instrumentation.instrumented()
 def save_bills(bills, file_path=BILLS_FILE):
     """
-    Saves a list of RecurringBill objects to a JSON file.
+    Saves a list of RecurringBill objects to a JSON file, or a JSON Lines file for a .jsonl path,
+    or the SQLite database for a .db path. A file is replaced atomically and any journal next
+    to it is folded in and removed.
 
     :param bills: List of RecurringBill instances
     :param file_path: Path to save the JSON file
     """
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if is_database(file_path):
+        _sqlite_backend().save_bills(bills, file_path)
+        return
+    _write_json(bills, file_path)
+    _remove_journal(file_path)
 
-    with open(file_path, 'w') as bill_file:
-        bills_data = [bill.to_dict() for bill in bills]
-        json.dump(bills_data, bill_file, indent=4)
+    # Entries for bills that were edited or removed since the last save can't be hit again
+    occurrence_cache.prune(bills, RecurringBill)
 
 
+@instrumentation.instrumented()
 def load_bills(file_path=BILLS_FILE):
     """
-    Loads RecurringBill objects from a JSON file.
+    Loads RecurringBill objects from a JSON file (or a .jsonl file or .db database).
 
     :param file_path: Path to the JSON file
     :return: List of RecurringBill instances
     """
+    if is_database(file_path):
+        return _sqlite_backend().load_bills(file_path)
+    if file_path.endswith('.jsonl'):
+        return list(iter_bills(file_path))
+    if os.path.exists(file_path + '.journal'):
+        return JournalStore(file_path, RecurringBill).items()
     try:
-        with open(file_path, 'r') as bill_file:
-            bills_data = json.load(bill_file)
-            return [RecurringBill.from_dict(bill) for bill in bills_data]
+        bills_data = _read_json(file_path)
+        return [RecurringBill.from_dict(bill) for bill in bills_data]
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 
+@instrumentation.instrumented()
 def save_pay_periods(paychecks, file_path=PAY_PERIODS_FILE):
     """
-    Saves a list of RecurringPayPeriod objects to a JSON file.
+    Saves a list of RecurringPayPeriod objects to a JSON file, or a JSON Lines file for a .jsonl
+    path, or the SQLite database for a .db path. A file is replaced atomically and any journal
+    next to it is folded in and removed.
 
     :param paychecks: List of RecurringPayPeriod instances
     :param file_path: Path to save the JSON file
     """
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    if is_database(file_path):
+        _sqlite_backend().save_pay_periods(paychecks, file_path)
+        return
+    _write_json(paychecks, file_path)
+    _remove_journal(file_path)
 
-    with open(file_path, 'w') as pay_file:
-        paychecks_data = [paycheck.to_dict() for paycheck in paychecks]
-        json.dump(paychecks_data, pay_file, indent=4)
+    occurrence_cache.prune(paychecks, RecurringPayPeriod)
 
 
+@instrumentation.instrumented()
 def load_pay_periods(file_path=PAY_PERIODS_FILE):
     """
-    Loads RecurringPayPeriod objects from a JSON file.
+    Loads RecurringPayPeriod objects from a JSON file (or a .jsonl file or .db database).
 
     :param file_path: Path to the JSON file
     :return: List of RecurringPayPeriod instances
     """
+    if is_database(file_path):
+        return _sqlite_backend().load_pay_periods(file_path)
+    if file_path.endswith('.jsonl'):
+        return list(iter_pay_periods(file_path))
+    if os.path.exists(file_path + '.journal'):
+        return JournalStore(file_path, RecurringPayPeriod).items()
     try:
-        with open(file_path, 'r') as pay_file:
-            paychecks_data = json.load(pay_file)
-            return [RecurringPayPeriod.from_dict(paycheck) for paycheck in paychecks_data]
+        paychecks_data = _read_json(file_path)
+        return [RecurringPayPeriod.from_dict(paycheck) for paycheck in paychecks_data]
     except (FileNotFoundError, json.JSONDecodeError):
         return []
+
+
+def _load_table(file_path, item_class, load):
+    # The cache mirrors the plain JSON file only; journaled, JSON Lines or database data goes the slow way
+    if file_path.endswith('.jsonl') or is_database(file_path) or os.path.exists(file_path + '.journal'):
+        return BillTable.from_items(load(file_path), item_class)
+    table = open_cache(file_path, item_class)
+    if table is not None:
+        return table
+
+    try:
+        source_stat = os.stat(file_path)
+        with open(file_path, 'rb') as json_file:
+            raw = json_file.read()
+        records = json.loads(raw)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return BillTable(item_class)
+    if instrumentation.enabled:
+        instrumentation.count("bytes_read", len(raw))
+
+    table = BillTable.from_dicts(records, item_class)
+    try:
+        write_cache(table, file_path, source_stat, hashlib.sha1(raw).digest())
+    except OSError:
+        pass  # The JSON file stays the source of truth, the next load just parses it again
+    return table
+
+
+@instrumentation.instrumented()
+def load_bills_table(file_path=BILLS_FILE) -> BillTable:
+    """
+    Loads bills as a read-only columnar BillTable. When the binary cache next to the JSON file
+    still matches it, the table is memory-mapped from the cache without parsing anything;
+    otherwise the JSON is parsed and the cache rewritten. Rows behave like RecurringBill;
+    use `to_items()` for full objects.
+
+    :param file_path: Path to the JSON file
+    :return: BillTable (a MappedBillTable when served from the cache)
+    """
+    return _load_table(file_path, RecurringBill, load_bills)
+
+
+@instrumentation.instrumented()
+def load_pay_periods_table(file_path=PAY_PERIODS_FILE) -> BillTable:
+    """
+    Loads pay periods as a read-only columnar table, through the same binary cache as load_bills_table.
+
+    :param file_path: Path to the JSON file
+    :return: BillTable of pay period rows
+    """
+    return _load_table(file_path, RecurringPayPeriod, load_pay_periods)
+
+
+def _iter_jsonl(file_path, item_class, predicate):
+    # Like a JSON file that fails to parse, a final line torn by a crash mid-write is read as
+    # nothing; an unreadable line with records after it is real corruption and still raises
+    torn = None
+    try:
+        with open(file_path, 'r') as jsonl_file:
+            for line in jsonl_file:
+                if instrumentation.enabled:
+                    instrumentation.count("bytes_read", len(line))
+                if not line.strip():
+                    continue
+                if torn is not None:
+                    raise torn
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as error:
+                    torn = error
+                    continue
+                item = item_class.from_dict(record)
+                if predicate is None or predicate(item):
+                    yield item
+    except FileNotFoundError:
+        return
+    if torn is not None and instrumentation.enabled:
+        instrumentation.count("skipped_lines")
+
+
+def iter_bills(file_path, predicate: Optional[Callable[[RecurringBill], bool]] = None) -> Iterator[RecurringBill]:
+    """
+    Lazily yields RecurringBill objects from a JSON Lines file, one line at a time.
+    Stop iterating early to skip the rest of the file.
+
+    :param file_path: Path to the .jsonl file
+    :param predicate: Optional filter, only bills for which it returns True are yielded
+    :return: Generator of RecurringBill instances
+    """
+    return _iter_jsonl(file_path, RecurringBill, predicate)
+
+
+def iter_pay_periods(file_path, predicate: Optional[Callable[[RecurringPayPeriod], bool]] = None
+                     ) -> Iterator[RecurringPayPeriod]:
+    """
+    Lazily yields RecurringPayPeriod objects from a JSON Lines file, one line at a time.
+
+    :param file_path: Path to the .jsonl file
+    :param predicate: Optional filter, only pay periods for which it returns True are yielded
+    :return: Generator of RecurringPayPeriod instances
+    """
+    return _iter_jsonl(file_path, RecurringPayPeriod, predicate)
+
+
+def _write_jsonl(items, file_path):
+    count = 0
+    with atomic_open(file_path, 'w') as jsonl_file:
+        for item in items:
+            line = json.dumps(item.to_dict()) + '\n'
+            jsonl_file.write(line)
+            if instrumentation.enabled:
+                instrumentation.count("bytes_written", len(line))
+            count += 1
+    return count
+
+
+def _drop_torn_tail(file_path):
+    # Cuts an unfinished last line off a JSON Lines file, as JournalStore.load does for its journal
+    try:
+        jsonl_file = open(file_path, 'r+b')
+    except FileNotFoundError:
+        return
+    with jsonl_file:
+        end = jsonl_file.seek(0, os.SEEK_END)
+        tail = b''
+        while end > 0:
+            start = max(end - 4096, 0)
+            jsonl_file.seek(start)
+            tail = jsonl_file.read(end - start) + tail
+            end = start
+            if b'\n' in tail:
+                break
+        if not tail or tail.endswith(b'\n'):
+            return
+        torn = tail[tail.rfind(b'\n') + 1:]
+        try:
+            json.loads(torn)
+            jsonl_file.write(b'\n')  # A complete record that only lost its newline is kept
+        except json.JSONDecodeError:
+            jsonl_file.truncate(jsonl_file.seek(0, os.SEEK_END) - len(torn))
+        jsonl_file.flush()
+        os.fsync(jsonl_file.fileno())
+
+
+def append_jsonl(items: Iterable, file_path) -> int:
+    """
+    Streams bills or pay periods onto the end of a JSON Lines file, one line each, without
+    reading or rewriting what is already there. A last line left unfinished by a crash is
+    cut off first, so the file stays readable.
+
+    :param items: Iterable of RecurringBill or RecurringPayPeriod instances
+    :param file_path: Path to the .jsonl file, created if missing
+    :return: Number of items appended
+    """
+    _drop_torn_tail(file_path)
+    count = 0
+    with open(file_path, 'a') as jsonl_file:
+        for item in items:
+            line = json.dumps(item.to_dict()) + '\n'
+            jsonl_file.write(line)
+            if instrumentation.enabled:
+                instrumentation.count("bytes_written", len(line))
+            count += 1
+        jsonl_file.flush()
+        os.fsync(jsonl_file.fileno())
+    return count
+
+
+def save_bills_jsonl(bills: Iterable[RecurringBill], file_path) -> int:
+    """
+    Streams bills to a JSON Lines file without building the full list first.
+    Accepts any iterable, including the generator from iter_bills.
+
+    :param bills: Iterable of RecurringBill instances
+    :param file_path: Path to the .jsonl file
+    :return: Number of bills written
+    """
+    return _write_jsonl(bills, file_path)
+
+
+def save_pay_periods_jsonl(paychecks: Iterable[RecurringPayPeriod], file_path) -> int:
+    """
+    Streams pay periods to a JSON Lines file without building the full list first.
+
+    :param paychecks: Iterable of RecurringPayPeriod instances
+    :param file_path: Path to the .jsonl file
+    :return: Number of pay periods written
+    """
+    return _write_jsonl(paychecks, file_path)
+
+
+# Schedulers with writes that may still be pending, flushed by one exit hook
+_schedulers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_schedulers():
+    for scheduler in list(_schedulers):
+        try:
+            scheduler.flush()
+        except Exception:
+            pass  # Nothing can report it at exit; the other schedulers still get their chance
+
+
+class SaveScheduler:
+    """
+    Debounces saves: marking data dirty schedules one write `delay` seconds after the last
+    edit, so a burst of edits costs a single write. A steady stream of edits is still written
+    at least every `max_delay` seconds. Writes run on a timer thread in the order they were
+    scheduled, and anything still pending is written at exit.
+
+    Edits are queued either as the whole new list (`mark_dirty`, written through the given
+    save function, which replaces the file atomically) or as repository change events
+    (`mark_changed`, appended to the file's JournalStore, or applied as single statements to
+    a database, so each edit costs constant I/O however many items there are). Repeated updates of one item in a burst are coalesced
+    into a single journal record. The store is checked for writes by other processes before
+    each flush (see JournalStore.refresh), so its cached snapshot hash never goes stale.
+    """
+
+    def __init__(self, save: Callable, file_path, delay: float = 1.0, max_delay: float = 10.0,
+                 on_error: Optional[Callable[[Exception], None]] = None, item_class=RecurringBill,
+                 clock: Callable[[], float] = time.monotonic, timer=threading.Timer):
+        """
+        :param save: Function called as save(items, file_path), e.g. save_bills
+        :param file_path: Path passed to the save function
+        :param delay: Seconds without edits before the write happens
+        :param max_delay: Longest a pending edit waits, even while edits keep arriving
+        :param on_error: Called with the exception if a write on the timer thread fails
+        :param item_class: RecurringBill or RecurringPayPeriod, for journaling `mark_changed` edits
+        :param clock: Monotonic clock in seconds, used for the debounce deadlines
+        :param timer: Called like threading.Timer(wait, fn, args) to schedule a write
+        """
+        self.save = save
+        self.file_path = file_path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.on_error = on_error
+        self.item_class = item_class
+        self.clock = clock
+        self.timer = timer
+        self.writes = 0
+        self._lock = threading.Lock()  # Guards the pending state below
+        self._write_lock = threading.Lock()  # Keeps writes in order, and guards the journal store
+        self._pending = None  # Copy of the items waiting to be written
+        self._changes = []  # (kind, index, item) edits waiting to be journaled, after _pending
+        self._store = None  # JournalStore (or SqliteStore) of file_path, opened by the first journaled write
+        self._first_dirty = None
+        self._deadline = None
+        self._timer = None
+        self._timer_token = 0  # Identifies the current timer, so a superseded one does nothing
+        _schedulers.add(self)
+
+    @property
+    def dirty(self):
+        return self._pending is not None or bool(self._changes)
+
+    def mark_dirty(self, items: Iterable):
+        """
+        Records the latest items to save and (re)starts the debounce window.
+        The items are copied, so the caller can keep editing its list.
+        """
+        with self._lock:
+            self._pending = list(items)
+            self._changes = []  # The full list already includes them
+            self._schedule()
+
+    def mark_changed(self, event):
+        """
+        Queues one repository ChangeEvent (added, updated or removed item) to be appended to
+        the journal and (re)starts the debounce window. Indexes are resolved by the timer
+        thread when the write happens, in the order the edits were made.
+        """
+        if self.file_path.endswith('.jsonl'):
+            raise ValueError(f"{self.file_path}: JSON Lines files can't be journaled, use mark_dirty")
+        if event.kind not in (ADDED, UPDATED, REMOVED):
+            return
+        with self._lock:
+            last = self._changes[-1] if self._changes else None
+            if event.kind == UPDATED and last is not None and last[0] != REMOVED and last[1] == event.index:
+                self._changes[-1] = (last[0], event.index, event.item)  # Only the final contents matter
+            else:
+                self._changes.append((event.kind, event.index, event.item))
+            self._schedule()
+
+    def _schedule(self):
+        now = self.clock()
+        if self._first_dirty is None:
+            self._first_dirty = now
+        self._deadline = min(now + self.delay, self._first_dirty + self.max_delay)
+        # One timer per burst: when it fires early it sleeps again until the deadline
+        if self._timer is None:
+            self._start_timer(self._deadline - now)
+
+    def _start_timer(self, wait):
+        self._timer_token += 1
+        self._timer = self.timer(max(wait, 0), self._fire, args=(self._timer_token,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self, token):
+        with self._lock:
+            if token != self._timer_token or self._timer is None:
+                return  # Superseded: a flush cancelled this timer, and maybe a newer one was started
+            remaining = self._deadline - self.clock() if self._deadline is not None else 0
+            if remaining > 0:
+                self._start_timer(remaining)
+                return
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as error:
+            if self.on_error is None:
+                raise
+            self.on_error(error)
+
+    def flush(self) -> bool:
+        """
+        Writes pending items now. Returns True if anything was written.
+        """
+        with self._write_lock:
+            with self._lock:
+                items, self._pending = self._pending, None
+                changes, self._changes = self._changes, []
+                self._first_dirty = self._deadline = None
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if items is None and not changes:
+                return False
+
+            if items is not None:
+                try:
+                    self.save(items, self.file_path)
+                except Exception:
+                    with self._lock:
+                        if self._pending is None:
+                            self._pending = items  # Retried on the next flush unless newer edits replace it
+                            self._changes = changes + self._changes
+                    raise
+                self._store = None  # The file was rewritten, the journal restarts from it
+
+            applied = 0
+            try:
+                if changes and self._store is None:
+                    # A database takes the same positional edits as a statement each
+                    store_class = _sqlite_backend().SqliteStore if is_database(self.file_path) else JournalStore
+                    self._store = store_class(self.file_path, self.item_class)
+                elif changes:
+                    self._store.refresh()  # Another writer may have appended or compacted since
+                for kind, index, item in changes:
+                    if kind == ADDED:
+                        self._store.add(item)
+                    elif kind == UPDATED:
+                        self._store.update_at(index, item)
+                    else:
+                        self._store.delete_at(index)
+                    applied += 1
+            except Exception:
+                with self._lock:
+                    if self._pending is None:
+                        self._changes = changes[applied:] + self._changes  # The rest are retried in order
+                raise
+            self.writes += 1
+            return True
+
+    def close(self):
+        """
+        Writes anything pending and stops flushing at exit.
+        """
+        self.flush()
+        _schedulers.discard(self)
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from models.bill import RecurringBill
+
+
+@contextmanager
+def atomic_open(file_path, mode='wb'):
+    """
+    Opens a temp file next to `file_path` for writing and moves it over `file_path` with
+    os.replace once the block finishes, so readers see either the old file or the new one,
+    never a truncated one. Nothing is replaced if the block raises.
+
+    :param file_path: Path of the file to replace
+    :param mode: Write mode for the temp file
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = file_path + '.tmp'
+    try:
+        with open(temp_path, mode) as temp_file:
+            yield temp_file
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, file_path)
+
+
+def write_atomic(file_path, data):
+    """
+    Writes bytes to a file through atomic_open.
+
+    :param file_path: Path of the file to replace
+    :param data: Bytes to write
+    """
+    with atomic_open(file_path) as out_file:
+        out_file.write(data)
+
+
+class JournalStore:
+    """
+    Keeps bills (or pay periods) as a snapshot file plus an append-only journal next to it.
+
+    The snapshot has the same format as bills.json. Adding, updating or deleting an item
+    appends one JSON line to `<file>.journal`, so each edit costs constant I/O. Once the
+    journal holds `compact_every` records it is folded into a new snapshot written with an
+    atomic rename. The journal starts with the hash of the snapshot it applies to, so a
+    journal left over from a compaction interrupted by a crash is ignored on load.
+
+    A store that is kept open should call `refresh()` before writing: if another writer
+    appended or compacted in the meantime, it reloads instead of appending under a stale
+    snapshot hash.
+    """
+
+    def __init__(self, file_path, item_class=RecurringBill, compact_every=500):
+        if file_path.endswith('.jsonl'):
+            raise ValueError(f"{file_path}: JSON Lines files are appended to directly, not journaled")
+        self.file_path = file_path
+        self.journal_path = file_path + '.journal'
+        self.item_class = item_class
+        self.compact_every = compact_every
+        self._items = {}  # Record id -> item, in insertion order
+        self._next_id = 0
+        self._journal_records = 0
+        self._snapshot_hash = None
+        self._seen = None  # File stats after this store last read or wrote the files
+        self.load()
+
+    def load(self):
+        """
+        Rebuilds the in-memory items by reading the snapshot and replaying the journal on top.
+        """
+        try:
+            with open(self.file_path, 'rb') as snapshot_file:
+                raw = snapshot_file.read()
+        except FileNotFoundError:
+            raw = b''
+        self._snapshot_hash = hashlib.sha1(raw).hexdigest()
+
+        # A snapshot that can't be read is an error, not an empty list: compacting would overwrite it
+        records = json.loads(raw) if raw.strip() else []
+        if not isinstance(records, list):
+            raise ValueError(f"{self.file_path}: expected a JSON array of records")
+        self._items = {record_id: self.item_class.from_dict(data) for record_id, data in enumerate(records)}
+        self._next_id = len(self._items)
+        self._journal_records = 0
+
+        try:
+            with open(self.journal_path, 'rb') as journal_file:
+                journal = journal_file.read()
+        except FileNotFoundError:
+            self._seen = self._stats()
+            return
+
+        lines = journal.split(b'\n')
+        if len(lines) < 2 or self._parse(lines[0]).get('base') != self._snapshot_hash:
+            self._seen = self._stats()
+            return  # Stale journal from before the current snapshot
+
+        # Every complete record ends with a newline, so the last element is '' unless a crash tore it
+        good_end = len(lines[0]) + 1
+        for line in lines[1:-1]:
+            record = self._parse(line)
+            if not record:
+                break
+            self._apply(record)
+            self._journal_records += 1
+            good_end += len(line) + 1
+
+        if good_end < len(journal):
+            # Cut the torn tail off, or the next append would be glued onto it and lost on reload
+            with open(self.journal_path, 'r+b') as journal_file:
+                journal_file.truncate(good_end)
+                os.fsync(journal_file.fileno())
+        self._seen = self._stats()
+
+    def _stats(self):
+        # Enough to notice another writer appending, compacting (a new inode) or deleting
+        stats = []
+        for path in (self.file_path, self.journal_path):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stats.append(None)
+            else:
+                stats.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(stats)
+
+    def refresh(self) -> bool:
+        """
+        Reloads if the snapshot or journal changed since this store last read or wrote them.
+        Costs two stat calls when nothing changed. Returns whether it reloaded.
+        """
+        if self._stats() == self._seen:
+            return False
+        self.load()
+        return True
+
+    @staticmethod
+    def _parse(line):
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return {}
+
+    def _apply(self, record, item=None):
+        record_id = record['id']
+        if record['op'] == 'delete':
+            self._items.pop(record_id, None)
+        else:
+            self._items[record_id] = item if item is not None else self.item_class.from_dict(record['data'])
+        self._next_id = max(self._next_id, record_id + 1)
+
+    def _append(self, record, item=None):
+        if self._journal_records == 0:
+            # Start a fresh journal tied to the current snapshot
+            write_atomic(self.journal_path, (json.dumps({'base': self._snapshot_hash}) + '\n').encode())
+
+        with open(self.journal_path, 'a') as journal_file:
+            journal_file.write(json.dumps(record) + '\n')
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        self._seen = self._stats()
+
+        self._apply(record, item)
+        self._journal_records += 1
+        if self._journal_records >= self.compact_every:
+            self.compact()
+
+    def add(self, item):
+        """
+        Appends an add record and returns the new item's id.
+        """
+        record_id = self._next_id
+        self._append({'op': 'add', 'id': record_id, 'data': item.to_dict()}, item)
+        return record_id
+
+    def update(self, record_id, item):
+        if record_id not in self._items:
+            raise KeyError(record_id)
+        self._append({'op': 'update', 'id': record_id, 'data': item.to_dict()}, item)
+
+    def delete(self, record_id):
+        if record_id not in self._items:
+            raise KeyError(record_id)
+        self._append({'op': 'delete', 'id': record_id})
+
+    def update_at(self, position: int, item):
+        """
+        Updates the item at `position` in items() order. The id is looked up by the thread doing
+        the write, so a caller on another thread never acts on a stale ids() snapshot.
+        """
+        self.update(self._id_at(position), item)
+
+    def delete_at(self, position: int):
+        """
+        Deletes the item at `position` in items() order.
+        """
+        self.delete(self._id_at(position))
+
+    def _id_at(self, position: int) -> int:
+        if not 0 <= position < len(self._items):
+            raise IndexError(position)
+        if position == len(self._items) - 1:
+            return next(reversed(self._items))
+        return list(self._items)[position]
+
+    def ids(self):
+        return list(self._items)
+
+    def items(self):
+        """
+        Returns the current items in insertion order.
+        """
+        return list(self._items.values())
+
+    def compact(self):
+        """
+        Writes every item into a new snapshot with an atomic rename and starts an empty journal.
+        Ids are renumbered to match the snapshot positions.
+        """
+        items = self.items()
+        raw = json.dumps([item.to_dict() for item in items], indent=4).encode()
+        write_atomic(self.file_path, raw)
+        self._snapshot_hash = hashlib.sha1(raw).hexdigest()
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+        self._items = dict(enumerate(items))
+        self._next_id = len(items)
+        self._journal_records = 0
+        self._seen = self._stats()
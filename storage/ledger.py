@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Lives in the same database file as the SQLite backend's tables
+LEDGER_FILE = '../data/bill_tracker.db'
+
+PAID = "paid"
+UNPAID = "unpaid"
+SKIPPED = "skipped"
+STATUSES = (PAID, UNPAID, SKIPPED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    bill_key TEXT NOT NULL,
+    occurrence TEXT NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('paid', 'unpaid', 'skipped')),
+    amount_cents INTEGER,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (bill_key, occurrence)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_payments_status_occurrence ON payments (status, occurrence);
+"""
+
+
+def _upgrade_amounts(connection):
+    # Ledgers written before amounts were stored as cents have a REAL `amount` column instead
+    existing = {row[1] for row in connection.execute("PRAGMA table_info(payments)")}
+    if "amount_cents" in existing:
+        return
+    with connection:
+        connection.execute("ALTER TABLE payments RENAME TO payments_legacy")
+        connection.executescript(SCHEMA)
+        connection.execute("INSERT INTO payments (bill_key, occurrence, status, amount_cents, recorded_at) "
+                           "SELECT bill_key, occurrence, status, CAST(ROUND(amount * 100) AS INTEGER), recorded_at "
+                           "FROM payments_legacy")
+        connection.execute("DROP TABLE payments_legacy")
+    connection.executescript(SCHEMA)  # The index went with the legacy table
+
+
+class PaymentLedger:
+    """
+    Records whether each occurrence of a bill was paid, left unpaid or skipped.
+
+    Entries are keyed by (bill key, occurrence date), so answering the same question twice
+    just overwrites the first answer. The (status, occurrence) index serves both the weekly
+    "which of these are settled" lookup and "unpaid occurrences before a date" without
+    scanning the whole history.
+    """
+
+    def __init__(self, db_path=LEDGER_FILE):
+        self.db_path = db_path
+
+    @staticmethod
+    def key_for(bill) -> str:
+        """
+        Ledger key of a bill: its name, frequency, day and start date as a JSON array. Bills
+        sharing a name and start date but due on different days are kept apart, and editing
+        only the amount or end date keeps the bill's history.
+        """
+        return json.dumps([bill.name, bill.frequency, bill.day_of_week,
+                           bill.start_date.isoformat() if bill.start_date else None])
+
+    def _connect(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.executescript(SCHEMA)
+        _upgrade_amounts(connection)
+        return connection
+
+    def record(self, bill, occurrence: date, status: str, amount_cents: Optional[int] = None):
+        """
+        Records the status of one occurrence of a bill, replacing any earlier answer.
+
+        :param bill: The RecurringBill the occurrence belongs to
+        :param occurrence: Date the bill was due
+        :param status: One of PAID, UNPAID or SKIPPED
+        :param amount_cents: Amount actually paid in cents, defaults to the bill's amount when paid
+        """
+        self.record_many([(bill, occurrence, status, amount_cents)])
+
+    def record_many(self, entries: Iterable[Tuple]):
+        """
+        Records several (bill, occurrence, status, amount in cents) entries in one transaction.
+        """
+        recorded_at = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for bill, occurrence, status, amount_cents in entries:
+            if status not in STATUSES:
+                raise ValueError(f"Unknown payment status: {status}")
+            if amount_cents is None and status == PAID:
+                amount_cents = bill.amount_cents
+            rows.append((self.key_for(bill), occurrence.isoformat(), status, amount_cents, recorded_at))
+
+        with closing(self._connect()) as connection, connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO payments (bill_key, occurrence, status, amount_cents, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def status(self, bill, occurrence: date) -> Optional[str]:
+        """
+        Returns the recorded status of an occurrence, or None if nothing was recorded.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT status FROM payments WHERE bill_key = ? AND occurrence = ?",
+                                     (self.key_for(bill), occurrence.isoformat())).fetchone()
+        return row[0] if row else None
+
+    def settled_between(self, start: date, end: date) -> Set[Tuple[str, date]]:
+        """
+        Returns the (bill key, occurrence) pairs paid or skipped between `start` and `end`, inclusive.
+        One index range scan per status, however many bills there are.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT bill_key, occurrence FROM payments "
+                "WHERE status IN (?, ?) AND occurrence BETWEEN ? AND ?",
+                (PAID, SKIPPED, start.isoformat(), end.isoformat()))
+            return {(bill_key, date.fromisoformat(occurrence)) for bill_key, occurrence in rows}
+
+    def unpaid_before(self, before: date) -> List[Tuple[str, date]]:
+        """
+        Returns the (bill key, occurrence) pairs recorded as unpaid before a date, oldest first.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT bill_key, occurrence FROM payments WHERE status = ? AND occurrence < ? "
+                "ORDER BY occurrence", (UNPAID, before.isoformat()))
+            return [(bill_key, date.fromisoformat(occurrence)) for bill_key, occurrence in rows]
+
+    def history(self, bill) -> Dict[date, str]:
+        """
+        Returns every recorded occurrence of a bill and its status, oldest first.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT occurrence, status FROM payments WHERE bill_key = ? ORDER BY occurrence",
+                (self.key_for(bill),))
+            return {date.fromisoformat(occurrence): status for occurrence, status in rows}
@@ -0,0 +1,154 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Optional
+from models.bill import RecurringBill
+from models.bill_table import BillTable
+from storage.journal import atomic_open
+
+MAGIC = b"BTC1"
+
+# Column name and array typecode, in file order. The same typecodes BillTable uses, so its
+# arrays are written as they are and read back as zero-copy memoryviews of the mapping.
+COLUMNS = (("cents", "q"), ("start", "i"), ("end", "i"), ("frequency", "I"), ("day", "I"), ("name", "I"))
+
+# Byte order, typecodes and item sizes; a cache written with another layout is ignored
+LAYOUT = (sys.byteorder[0] + "".join(f"{code}{array(code).itemsize}" for _, code in COLUMNS)).encode()
+
+# magic, layout, item kind, source size, source mtime (ns), source sha1, rows, strings, string blob bytes
+HEADER = struct.Struct("<4s16s16sQq20sIII")
+
+ITEM_KINDS = {"RecurringBill": b"bill", "RecurringPayPeriod": b"pay_period"}
+
+
+def cache_path_for(file_path) -> str:
+    return file_path + '.cache'
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringBlob:
+    """
+    The interned strings of a mapped table, decoded only when a row asks for one.
+    """
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self.blob = blob
+        self.offsets = offsets
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        text = self._decoded.get(index)
+        if text is None:
+            text = self._decoded[index] = str(self.blob[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+        return text
+
+
+class MappedBillTable(BillTable):
+    """
+    A read-only BillTable whose columns are memoryviews over a memory-mapped cache file.
+
+    Opening it costs a header read: no JSON parsing, no date parsing and no objects. Rows are
+    BillRow/PayPeriodRow views built as they are indexed or iterated, and `to_items()` builds
+    full model objects when they are needed.
+    """
+
+    def __init__(self, mapping: mmap.mmap, item_class=RecurringBill):
+        super().__init__(item_class)
+        self._mapping = mapping
+        (_, _, _, _, _, _, count, string_count, blob_size) = HEADER.unpack_from(mapping, 0)
+        view = memoryview(mapping)
+        offset = _align(HEADER.size)
+        for column, code in COLUMNS:
+            size = count * array(code).itemsize
+            setattr(self, column, view[offset:offset + size].cast(code))
+            offset = _align(offset + size)
+        offsets_size = (string_count + 1) * array('I').itemsize
+        if offset + offsets_size > len(mapping):
+            raise ValueError("Cache file is truncated")
+        offsets = view[offset:offset + offsets_size].cast('I')
+        offset = _align(offset + offsets_size)
+        if offset + blob_size > len(mapping):
+            raise ValueError("Cache file is truncated")
+        self.strings = _StringBlob(view[offset:offset + blob_size], offsets)
+
+    def append(self, item):
+        raise TypeError("A MappedBillTable is read-only, build a BillTable to add rows")
+
+
+def write_cache(table: BillTable, file_path, source_stat: os.stat_result, source_hash: bytes):
+    """
+    Writes a table as a binary cache of `file_path`, tagged with the source file's size,
+    mtime and SHA-1 so a later load can tell whether the JSON has changed since.
+
+    :param table: The BillTable built from the source file
+    :param file_path: Path of the source JSON file; the cache goes next to it
+    :param source_stat: os.stat of the source taken before it was read
+    :param source_hash: SHA-1 digest of the bytes that were read
+    """
+    blob = bytearray()
+    offsets = array('I', [0])
+    for text in table.strings:
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+
+    header = HEADER.pack(MAGIC, LAYOUT, ITEM_KINDS[table.item_class.__name__], source_stat.st_size,
+                         source_stat.st_mtime_ns, source_hash, len(table), len(table.strings), len(blob))
+    parts = [header]
+    parts += [getattr(table, column).tobytes() for column, _ in COLUMNS]
+    parts += [offsets.tobytes(), bytes(blob)]
+    with atomic_open(cache_path_for(file_path)) as cache_file:
+        written = 0
+        for part in parts:
+            cache_file.write(part)
+            written += len(part)
+            cache_file.write(b"\0" * (_align(written) - written))
+            written = _align(written)
+
+
+def open_cache(file_path, item_class=RecurringBill, verify_hash=False) -> Optional[MappedBillTable]:
+    """
+    Maps the cache of `file_path` if it still matches the source file, otherwise returns None.
+
+    The cache is trusted when the source's size and mtime are unchanged. If only the mtime
+    differs (the file was touched or copied) the source is hashed and compared instead; with
+    `verify_hash` it is always hashed.
+
+    :param file_path: Path of the source JSON file
+    :param item_class: RecurringBill or RecurringPayPeriod
+    :param verify_hash: Always compare the source's SHA-1, not just its size and mtime
+    :return: MappedBillTable or None
+    """
+    try:
+        source_stat = os.stat(file_path)
+        with open(cache_path_for(file_path), 'rb') as cache_file:
+            mapping = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, layout, kind, size, mtime_ns, source_hash, *_ = HEADER.unpack_from(mapping, 0)
+    except struct.error:
+        mapping.close()
+        return None
+    if (magic, layout, kind.rstrip(b"\0")) != (MAGIC, LAYOUT.ljust(16, b"\0"), ITEM_KINDS[item_class.__name__]) \
+            or size != source_stat.st_size:
+        mapping.close()
+        return None
+    if verify_hash or mtime_ns != source_stat.st_mtime_ns:
+        with open(file_path, 'rb') as source_file:
+            if hashlib.sha1(source_file.read()).digest() != source_hash:
+                mapping.close()
+                return None
+    try:
+        return MappedBillTable(mapping, item_class)
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,242 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date
+from models.bill import RecurringBill
+from models.occurrence_cache import occurrence_cache
+from models.pay_period import RecurringPayPeriod
+from storage import data_manager
+
+# Default database path, next to the JSON files
+DB_FILE = '../data/bill_tracker.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    frequency TEXT NOT NULL,
+    day_of_week TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bills_start_date ON bills (start_date);
+CREATE INDEX IF NOT EXISTS idx_bills_end_date ON bills (end_date);
+CREATE INDEX IF NOT EXISTS idx_bills_frequency ON bills (frequency);
+
+CREATE TABLE IF NOT EXISTS pay_periods (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    frequency TEXT NOT NULL,
+    day_of_week TEXT NOT NULL,
+    start_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_pay_periods_start_date ON pay_periods (start_date);
+CREATE INDEX IF NOT EXISTS idx_pay_periods_frequency ON pay_periods (frequency);
+"""
+
+BILL_COLUMNS = "name, amount_cents, frequency, day_of_week, start_date, end_date"
+PAY_PERIOD_COLUMNS = "name, amount_cents, frequency, day_of_week, start_date"
+
+# Table and columns each item class is stored in
+TABLES = {RecurringBill: ("bills", BILL_COLUMNS), RecurringPayPeriod: ("pay_periods", PAY_PERIOD_COLUMNS)}
+
+
+def _connect(db_path):
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(SCHEMA)
+    for table, columns in TABLES.values():
+        _upgrade_amounts(connection, table, columns)
+    return connection
+
+
+def _upgrade_amounts(connection, table, columns):
+    # Databases written before amounts were stored as cents have a REAL `amount` column instead
+    existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+    if "amount_cents" in existing:
+        return
+    with connection:
+        connection.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        connection.executescript(SCHEMA)
+        legacy_columns = columns.replace("amount_cents", "CAST(ROUND(amount * 100) AS INTEGER)")
+        connection.execute(f"INSERT INTO {table} (id, {columns}) SELECT id, {legacy_columns} FROM {table}_legacy")
+        connection.execute(f"DROP TABLE {table}_legacy")
+    connection.executescript(SCHEMA)  # The indexes went with the legacy table
+
+
+def _row(item, columns):
+    data = item.to_dict()
+    data["amount_cents"] = item.amount_cents
+    return tuple(data[column] for column in columns.split(", "))
+
+
+def _item(item_class, columns, row):
+    data = dict(zip(columns.split(", "), row))
+    item = item_class.from_dict(dict(data, amount=0))
+    item.amount_cents = data["amount_cents"]
+    return item
+
+
+def _bill_row(bill):
+    return _row(bill, BILL_COLUMNS)
+
+
+def _pay_period_row(paycheck):
+    return _row(paycheck, PAY_PERIOD_COLUMNS)
+
+
+def save_bills(bills, db_path=DB_FILE):
+    """
+    Saves a list of RecurringBill objects to the SQLite database, replacing what was there.
+
+    :param bills: List of RecurringBill instances
+    :param db_path: Path to the database file
+    """
+    with closing(_connect(db_path)) as connection, connection:
+        connection.execute("DELETE FROM bills")
+        connection.executemany(f"INSERT INTO bills ({BILL_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+                               (_bill_row(bill) for bill in bills))
+
+    occurrence_cache.prune(bills, RecurringBill)
+
+
+def load_bills(db_path=DB_FILE):
+    """
+    Loads every RecurringBill from the SQLite database.
+
+    :param db_path: Path to the database file
+    :return: List of RecurringBill instances
+    """
+    return _query_bills(db_path, "", ())
+
+
+def load_bills_active_between(start: date, end: date, db_path=DB_FILE, frequency=None):
+    """
+    Loads only the bills whose active range overlaps [start, end]. The filtering runs in the
+    database against the start/end date indexes, so other bills are never built.
+
+    :param start: First day of the window
+    :param end: Last day of the window
+    :param db_path: Path to the database file
+    :param frequency: Optionally only return bills with this frequency
+    :return: List of RecurringBill instances
+    """
+    where = "WHERE start_date <= ? AND (end_date IS NULL OR end_date >= ?)"
+    params = [end.isoformat(), start.isoformat()]
+    if frequency:
+        where += " AND frequency = ?"
+        params.append(frequency.lower())
+    return _query_bills(db_path, where, params)
+
+
+def _query_bills(db_path, where, params):
+    with closing(_connect(db_path)) as connection:
+        rows = connection.execute(f"SELECT {BILL_COLUMNS} FROM bills {where} ORDER BY id", params)
+        return [_item(RecurringBill, BILL_COLUMNS, row) for row in rows]
+
+
+def save_pay_periods(paychecks, db_path=DB_FILE):
+    """
+    Saves a list of RecurringPayPeriod objects to the SQLite database, replacing what was there.
+
+    :param paychecks: List of RecurringPayPeriod instances
+    :param db_path: Path to the database file
+    """
+    with closing(_connect(db_path)) as connection, connection:
+        connection.execute("DELETE FROM pay_periods")
+        connection.executemany(f"INSERT INTO pay_periods ({PAY_PERIOD_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                               (_pay_period_row(paycheck) for paycheck in paychecks))
+
+    occurrence_cache.prune(paychecks, RecurringPayPeriod)
+
+
+def load_pay_periods(db_path=DB_FILE):
+    """
+    Loads every RecurringPayPeriod from the SQLite database.
+
+    :param db_path: Path to the database file
+    :return: List of RecurringPayPeriod instances
+    """
+    return _query_pay_periods(db_path, "", ())
+
+
+def load_pay_periods_active_between(start: date, end: date, db_path=DB_FILE):
+    """
+    Loads only the pay periods that have started by the end of the window.
+
+    :param start: First day of the window
+    :param end: Last day of the window
+    :param db_path: Path to the database file
+    :return: List of RecurringPayPeriod instances
+    """
+    return _query_pay_periods(db_path, "WHERE start_date <= ?", (end.isoformat(),))
+
+
+def _query_pay_periods(db_path, where, params):
+    with closing(_connect(db_path)) as connection:
+        rows = connection.execute(f"SELECT {PAY_PERIOD_COLUMNS} FROM pay_periods {where} ORDER BY id", params)
+        return [_item(RecurringPayPeriod, PAY_PERIOD_COLUMNS, row) for row in rows]
+
+
+class SqliteStore:
+    """
+    Row-at-a-time edits of the bills or pay periods table, addressed by position in load order.
+
+    The database counterpart of JournalStore's add/update_at/delete_at: each edit is one
+    indexed statement in its own transaction, so SaveScheduler can save single edits to a
+    database without rewriting the table.
+    """
+
+    def __init__(self, db_path=DB_FILE, item_class=RecurringBill):
+        self.db_path = db_path
+        self.table, self.columns = TABLES[item_class]
+
+    def refresh(self) -> bool:
+        """
+        Nothing is cached between statements, so there is never anything to reload.
+        """
+        return False
+
+    def _id_at(self, connection, position: int) -> int:
+        row = connection.execute(f"SELECT id FROM {self.table} ORDER BY id LIMIT 1 OFFSET ?",
+                                 (position,)).fetchone() if position >= 0 else None
+        if row is None:
+            raise IndexError(position)
+        return row[0]
+
+    def add(self, item):
+        placeholders = ", ".join("?" * len(self.columns.split(", ")))
+        with closing(_connect(self.db_path)) as connection, connection:
+            connection.execute(f"INSERT INTO {self.table} ({self.columns}) VALUES ({placeholders})",
+                               _row(item, self.columns))
+
+    def update_at(self, position: int, item):
+        assignments = ", ".join(f"{column} = ?" for column in self.columns.split(", "))
+        with closing(_connect(self.db_path)) as connection, connection:
+            connection.execute(f"UPDATE {self.table} SET {assignments} WHERE id = ?",
+                               _row(item, self.columns) + (self._id_at(connection, position),))
+
+    def delete_at(self, position: int):
+        with closing(_connect(self.db_path)) as connection, connection:
+            connection.execute(f"DELETE FROM {self.table} WHERE id = ?", (self._id_at(connection, position),))
+
+
+def migrate_from_json(bills_file=data_manager.BILLS_FILE, pay_periods_file=data_manager.PAY_PERIODS_FILE,
+                      db_path=DB_FILE):
+    """
+    One-shot copy of the JSON bills and pay periods (including any journaled edits) into the database.
+
+    :param bills_file: Path to the bills JSON file
+    :param pay_periods_file: Path to the pay periods JSON file
+    :param db_path: Path to the database file
+    :return: Tuple of (bills migrated, pay periods migrated)
+    """
+    bills = data_manager.load_bills(bills_file)
+    paychecks = data_manager.load_pay_periods(pay_periods_file)
+    save_bills(bills, db_path)
+    save_pay_periods(paychecks, db_path)
+    return len(bills), len(paychecks)
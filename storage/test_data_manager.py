@@ -0,0 +1,188 @@
+import itertools
+import json
+import os
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from models.bill import RecurringBill
+from models.repository import BILLS, Repository
+from storage.data_manager import SaveScheduler, append_jsonl, iter_bills, load_bills, save_bills, save_bills_jsonl
+from storage.journal import JournalStore
+
+
+def bills(count):
+    for i in range(count):
+        yield RecurringBill(f"Bill {i}", 10.0 + i, "weekly" if i % 2 else "monthly", "Monday", date(2025, 1, 6))
+
+
+def test_jsonl_streams_lazily(tmp_path):
+    path = str(tmp_path / "bills.jsonl")
+    assert save_bills_jsonl(bills(1000), path) == 1000
+
+    first = list(itertools.islice(iter_bills(path), 3))
+    assert [bill.name for bill in first] == ["Bill 0", "Bill 1", "Bill 2"]
+
+    weekly = list(iter_bills(path, predicate=lambda bill: bill.frequency == "weekly"))
+    assert len(weekly) == 500
+    assert [bill.to_dict() for bill in load_bills(path)] == [bill.to_dict() for bill in bills(1000)]
+
+
+def test_missing_jsonl_file(tmp_path):
+    assert list(iter_bills(str(tmp_path / "missing.jsonl"))) == []
+
+
+def test_torn_final_jsonl_line_is_skipped(tmp_path):
+    path = str(tmp_path / "bills.jsonl")
+    save_bills_jsonl(bills(2), path)
+    with open(path, "a") as jsonl_file:
+        jsonl_file.write('{"name": "Bill 2", "amo')
+    assert [bill.name for bill in load_bills(path)] == ["Bill 0", "Bill 1"]
+
+    # A bad line followed by more records is corruption, not a torn write
+    with open(path, "a") as jsonl_file:
+        jsonl_file.write('\n' + json.dumps(next(bills(1)).to_dict()) + '\n')
+    with pytest.raises(json.JSONDecodeError):
+        load_bills(path)
+
+
+def test_append_after_torn_jsonl_line(tmp_path):
+    path = str(tmp_path / "bills.jsonl")
+    save_bills_jsonl(bills(2), path)
+    with open(path, "a") as jsonl_file:
+        jsonl_file.write('{"name": "Bill 2", "amo')
+    append_jsonl(list(bills(4))[2:], path)
+    assert [bill.name for bill in load_bills(path)] == ["Bill 0", "Bill 1", "Bill 2", "Bill 3"]
+
+    # A whole record that only lost its newline is kept
+    with open(path, "a") as jsonl_file:
+        jsonl_file.write(json.dumps(list(bills(5))[4].to_dict()))
+    append_jsonl(list(bills(6))[5:], path)
+    assert [bill.name for bill in load_bills(path)][-2:] == ["Bill 4", "Bill 5"]
+
+
+def test_save_matches_load_format(tmp_path):
+    saved = list(bills(3))
+    for name in ("bills.json", "bills.jsonl"):
+        path = str(tmp_path / name)
+        save_bills(saved, path)
+        assert [bill.name for bill in load_bills(path)] == [bill.name for bill in saved]
+
+
+class ManualTimers:
+    """
+    Clock and timer factory for SaveScheduler that the tests advance by hand instead of sleeping.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = []  # [due time, fn, args, cancelled]
+
+    def clock(self):
+        return self.now
+
+    def timer(self, wait, fn, args=()):
+        entry = [self.now + wait, fn, args, False]
+        self.pending.append(entry)
+        return SimpleNamespace(daemon=False, start=lambda: None, cancel=lambda: entry.__setitem__(3, True))
+
+    def advance(self, seconds):
+        self.now += seconds
+        while True:
+            due = [entry for entry in self.pending if entry[0] <= self.now]
+            if not due:
+                return
+            entry = min(due, key=lambda e: e[0])
+            self.pending.remove(entry)
+            if not entry[3]:
+                entry[1](*entry[2])
+
+
+def test_save_scheduler_coalesces_bursts(tmp_path):
+    path = str(tmp_path / "bills.json")
+    writes = []
+
+    def save(items, file_path):
+        writes.append(len(items))
+        save_bills(items, file_path)
+
+    timers = ManualTimers()
+    scheduler = SaveScheduler(save, path, delay=0.05, clock=timers.clock, timer=timers.timer)
+    edited = []
+    for bill in bills(50):
+        edited.append(bill)
+        scheduler.mark_dirty(edited)
+        timers.advance(0.001)
+    assert scheduler.dirty and writes == []
+
+    timers.advance(0.05)
+    assert writes == [50] and not scheduler.dirty
+    assert len(load_bills(path)) == 50
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    scheduler.mark_dirty(edited[:10])
+    assert scheduler.flush() and not scheduler.flush()
+    timers.advance(1)  # The cancelled timer does nothing
+    assert writes == [50, 10]
+    scheduler.close()
+
+
+def test_save_scheduler_max_delay_bounds_a_steady_stream(tmp_path):
+    writes = []
+    timers = ManualTimers()
+    scheduler = SaveScheduler(lambda items, file_path: writes.append(len(items)), str(tmp_path / "bills.json"),
+                              delay=0.05, max_delay=0.15, clock=timers.clock, timer=timers.timer)
+    for _ in range(40):
+        scheduler.mark_dirty([1])
+        timers.advance(0.01)
+    assert len(writes) == 2  # At 0.15 and 0.30 seconds, though edits never paused for `delay`
+    scheduler.close()
+    assert len(writes) == 3
+
+
+def test_save_scheduler_journals_repository_edits(tmp_path):
+    path = str(tmp_path / "bills.json")
+    save_bills(list(bills(3)), path)
+    repository = Repository(load_bills(path))
+    scheduler = SaveScheduler(save_bills, path, delay=10)
+    repository.subscribe(scheduler.mark_changed)
+
+    new = list(bills(6))[3:]
+    repository.add(BILLS, new[0])
+    for amount in (1.0, 2.0, 3.0):
+        repository.update(BILLS, 3, RecurringBill("Edited", amount, "weekly", "Monday", date(2025, 1, 6)))
+    repository.remove(BILLS, 0)
+    repository.add(BILLS, new[1])
+    assert scheduler.flush()
+
+    # The snapshot is untouched: one add (carrying the last update), a delete and an add were journaled
+    with open(path) as bill_file:
+        assert len(json.load(bill_file)) == 3
+    with open(path + ".journal") as journal_file:
+        assert len(journal_file.read().splitlines()) == 1 + 3
+    assert [(bill.name, bill.amount) for bill in load_bills(path)] == \
+        [(bill.name, bill.amount) for bill in repository.bills]
+    scheduler.close()
+
+
+def test_save_scheduler_reloads_a_journal_compacted_by_another_writer(tmp_path):
+    path = str(tmp_path / "bills.json")
+    save_bills(list(bills(2)), path)
+    repository = Repository(load_bills(path))
+    scheduler = SaveScheduler(save_bills, path, delay=10)
+    repository.subscribe(scheduler.mark_changed)
+    extra = list(bills(4))[2:]
+
+    repository.add(BILLS, extra[0])
+    assert scheduler.flush()
+
+    # Another process appends and compacts, which rewrites the snapshot and drops the journal
+    other = JournalStore(path)
+    other.add(extra[1])
+    other.compact()
+
+    repository.update(BILLS, 0, RecurringBill("Edited", 1.0, "weekly", "Monday", date(2025, 1, 6)))
+    assert scheduler.flush()
+    assert [bill.name for bill in load_bills(path)] == ["Edited", "Bill 1", "Bill 2", "Bill 3"]
+    scheduler.close()
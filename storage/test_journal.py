@@ -0,0 +1,66 @@
+import json
+import pytest
+from datetime import date
+from models.bill import RecurringBill
+from storage.data_manager import load_bills, save_bills
+from storage.journal import JournalStore
+
+
+def make_bill(name):
+    return RecurringBill(name, 10.0, "monthly", "Monday", date(2025, 1, 6))
+
+
+def test_journal_replays_edits(tmp_path):
+    path = str(tmp_path / "bills.json")
+    save_bills([make_bill("Rent")], path)
+
+    store = JournalStore(path)
+    phone = store.add(make_bill("Phone"))
+    gym = store.add(make_bill("Gym"))
+    store.update(phone, make_bill("Mobile"))
+    store.delete(gym)
+    store.add(make_bill("Water"))
+    store.update_at(2, make_bill("Gas"))
+    store.delete_at(2)
+
+    # The snapshot is untouched, the edits live in the journal
+    with open(path) as bill_file:
+        assert len(json.load(bill_file)) == 1
+    assert [bill.name for bill in load_bills(path)] == ["Rent", "Mobile"]
+
+    store.compact()
+    assert not (tmp_path / "bills.json.journal").exists()
+    assert [bill.name for bill in JournalStore(path).items()] == ["Rent", "Mobile"]
+
+
+def test_stale_and_torn_journal(tmp_path):
+    path = str(tmp_path / "bills.json")
+    store = JournalStore(path, compact_every=3)
+    store.add(make_bill("Rent"))
+    store.add(make_bill("Phone"))
+
+    # A crash in the middle of an append leaves a partial last line
+    with open(path + ".journal", "a") as journal_file:
+        journal_file.write('{"op": "add", "id": 2, "da')
+    assert [bill.name for bill in load_bills(path)] == ["Rent", "Phone"]
+
+    # The torn bytes are cut off, so edits made after the crash survive the next reload
+    store = JournalStore(path, compact_every=10)
+    store.add(make_bill("Water"))
+    store.add(make_bill("Gas"))
+    assert [bill.name for bill in JournalStore(path).items()] == ["Rent", "Phone", "Water", "Gas"]
+
+    # A journal written against an older snapshot is ignored
+    save_bills([make_bill("Water")], path)
+    with open(path + ".journal", "w") as journal_file:
+        journal_file.write('{"base": "old"}\n{"op": "add", "id": 1, "data": %s}\n' % json.dumps(make_bill("X").to_dict()))
+    assert [bill.name for bill in load_bills(path)] == ["Water"]
+
+
+def test_unreadable_snapshot_is_not_treated_as_empty(tmp_path):
+    path = tmp_path / "bills.json"
+    path.write_text('[{"name": "Rent", ')
+    with pytest.raises(json.JSONDecodeError):
+        JournalStore(str(path))
+    with pytest.raises(ValueError):
+        JournalStore(str(tmp_path / "bills.jsonl"))
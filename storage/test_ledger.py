@@ -0,0 +1,91 @@
+import builtins
+import sqlite3
+from contextlib import closing
+from datetime import date
+
+import pytest
+
+from models.bill import RecurringBill
+from storage.ledger import PAID, SKIPPED, UNPAID, PaymentLedger
+from utils.weekly_snapshot import confirm_bill_payment, get_bills_this_week
+
+GYM = RecurringBill("Gym", 15.0, "weekly", "Monday", date(2025, 1, 6))
+PHONE = RecurringBill("Phone", 60.0, "monthly", "5", date(2025, 1, 5))
+
+
+def test_record_overwrites_and_queries(tmp_path):
+    ledger = PaymentLedger(str(tmp_path / "ledger.db"))
+    ledger.record(GYM, date(2025, 4, 28), UNPAID)
+    ledger.record(GYM, date(2025, 5, 5), UNPAID)
+    ledger.record(GYM, date(2025, 5, 5), PAID)
+    ledger.record(PHONE, date(2025, 5, 5), SKIPPED)
+
+    assert ledger.status(GYM, date(2025, 5, 5)) == PAID
+    assert ledger.status(GYM, date(2025, 5, 12)) is None
+    assert ledger.history(GYM) == {date(2025, 4, 28): UNPAID, date(2025, 5, 5): PAID}
+    assert ledger.unpaid_before(date(2025, 5, 5)) == [(PaymentLedger.key_for(GYM), date(2025, 4, 28))]
+    assert ledger.settled_between(date(2025, 5, 5), date(2025, 5, 11)) == {
+        (PaymentLedger.key_for(GYM), date(2025, 5, 5)), (PaymentLedger.key_for(PHONE), date(2025, 5, 5))}
+
+    with pytest.raises(ValueError):
+        ledger.record(GYM, date(2025, 5, 5), "maybe")
+
+
+def test_bills_sharing_name_and_start_are_kept_apart(tmp_path):
+    # As in data/bills.json: two "Phone" bills starting the same day, due on different days
+    first = RecurringBill("Phone", 50.0, "monthly", "18", date(2025, 5, 18))
+    second = RecurringBill("Phone", 50.0, "monthly", "12", date(2025, 5, 18))
+    ledger = PaymentLedger(str(tmp_path / "ledger.db"))
+    ledger.record(first, date(2025, 6, 18), UNPAID)
+
+    assert ledger.history(second) == {}
+    _, overdue = get_bills_this_week([first, second], date(2025, 7, 2), ledger)
+    assert overdue == [(first, date(2025, 6, 18))]
+
+
+def test_overdue_respects_ledger(tmp_path):
+    ledger = PaymentLedger(str(tmp_path / "ledger.db"))
+    today = date(2025, 5, 7)  # Wednesday, Gym and Phone were both due Monday
+    _, overdue = get_bills_this_week([GYM, PHONE], today, ledger)
+    assert overdue == [(GYM, date(2025, 5, 5)), (PHONE, date(2025, 5, 5))]
+
+    ledger.record(GYM, date(2025, 4, 28), UNPAID)
+    ledger.record(GYM, date(2025, 5, 5), PAID)
+    _, overdue = get_bills_this_week([GYM, PHONE], today, ledger)
+    assert overdue == [(GYM, date(2025, 4, 28)), (PHONE, date(2025, 5, 5))]
+
+    # Without a ledger nothing changes
+    assert get_bills_this_week([GYM, PHONE], today)[1] == [(GYM, date(2025, 5, 5)), (PHONE, date(2025, 5, 5))]
+
+
+def test_confirm_bill_payment_records_answers(tmp_path, monkeypatch, capsys):
+    ledger = PaymentLedger(str(tmp_path / "ledger.db"))
+    answers = iter(["y", "s"])
+    monkeypatch.setattr(builtins, "input", lambda prompt: next(answers))
+    confirm_bill_payment([GYM, PHONE], date(2025, 5, 7), ledger)
+    capsys.readouterr()
+
+    assert ledger.history(GYM) == {date(2025, 5, 5): PAID}
+    assert ledger.history(PHONE) == {date(2025, 5, 5): SKIPPED}
+    # Answered occurrences aren't asked about again
+    monkeypatch.setattr(builtins, "input", lambda prompt: pytest.fail("asked again"))
+    confirm_bill_payment([GYM, PHONE], date(2025, 5, 7), ledger)
+
+
+def test_legacy_real_amounts_are_upgraded_to_cents(tmp_path):
+    path = str(tmp_path / "ledger.db")
+    with closing(sqlite3.connect(path)) as connection, connection:
+        connection.execute("CREATE TABLE payments (bill_key TEXT NOT NULL, occurrence TEXT NOT NULL, "
+                           "status TEXT NOT NULL, amount REAL, recorded_at TEXT NOT NULL, "
+                           "PRIMARY KEY (bill_key, occurrence)) WITHOUT ROWID")
+        connection.execute("INSERT INTO payments VALUES (?, '2025-05-05', 'paid', 15.29, '2025-05-05T09:00:00')",
+                           (PaymentLedger.key_for(GYM),))
+
+    ledger = PaymentLedger(path)
+    assert ledger.history(GYM) == {date(2025, 5, 5): PAID}
+    ledger.record(PHONE, date(2025, 5, 5), PAID)
+    with closing(sqlite3.connect(path)) as connection:
+        assert connection.execute("SELECT amount_cents FROM payments ORDER BY amount_cents").fetchall() == \
+            [(1529,), (6000,)]
+        assert connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'").fetchall() == \
+            [("idx_payments_status_occurrence",)]
@@ -0,0 +1,70 @@
+import os
+from datetime import date
+
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from storage.data_manager import load_bills_table, load_pay_periods_table, save_bills, save_pay_periods
+from storage.journal import JournalStore
+from storage.snapshot_cache import MappedBillTable, cache_path_for
+
+BILLS = [
+    RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)),
+    RecurringBill("Gym", 15.5, "weekly", "Tuesday", date(2025, 1, 7), date(2025, 6, 30)),
+    RecurringBill("Café", 4.25, "biweekly", "Friday", date(2025, 1, 3)),
+]
+
+
+def test_cache_is_written_then_mapped(tmp_path):
+    path = str(tmp_path / "bills.json")
+    save_bills(BILLS, path)
+
+    first = load_bills_table(path)
+    assert not isinstance(first, MappedBillTable) and os.path.exists(cache_path_for(path))
+    cached = load_bills_table(path)
+    assert isinstance(cached, MappedBillTable)
+    assert cached.to_dicts() == [bill.to_dict() for bill in BILLS]
+    assert cached[1].get_occurrences_between(date(2025, 5, 5), date(2025, 5, 11)) == [date(2025, 5, 6)]
+    assert [type(item) for item in cached.to_items()] == [RecurringBill] * 3
+
+
+def test_stale_cache_falls_back_to_json(tmp_path):
+    path = str(tmp_path / "bills.json")
+    save_bills(BILLS, path)
+    load_bills_table(path)
+
+    # Same size, different content and mtime: caught by the hash
+    edited = [RecurringBill("Rent", 800.0, "monthly", "1", date(2024, 6, 1))] + BILLS[1:]
+    save_bills(edited, path)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    table = load_bills_table(path)
+    assert not isinstance(table, MappedBillTable) and table[0].amount == 800.0
+    assert isinstance(load_bills_table(path), MappedBillTable)
+
+    # Touched but unchanged: the hash still matches
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10 ** 9))
+    assert isinstance(load_bills_table(path), MappedBillTable)
+
+    # A truncated cache is ignored
+    with open(cache_path_for(path), "r+b") as cache_file:
+        cache_file.truncate(120)
+    assert load_bills_table(path).to_dicts() == [bill.to_dict() for bill in edited]
+
+
+def test_journal_and_pay_periods(tmp_path):
+    path = str(tmp_path / "bills.json")
+    save_bills(BILLS, path)
+    JournalStore(path).add(RecurringBill("Water", 30.0, "monthly", "10", date(2025, 1, 10)))
+    table = load_bills_table(path)
+    assert [row.name for row in table] == ["Rent", "Gym", "Café", "Water"]
+    assert not os.path.exists(cache_path_for(path))
+
+    pays_path = str(tmp_path / "pay_periods.json")
+    save_pay_periods([RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10))], pays_path)
+    load_pay_periods_table(pays_path)
+    pays = load_pay_periods_table(pays_path)
+    assert isinstance(pays, MappedBillTable)
+    assert pays[0].get_occurrences_between(date(2025, 1, 1), date(2025, 1, 31)) == [date(2025, 1, 10), date(2025, 1, 24)]
+    # A pay period cache is never served as bills
+    os.rename(cache_path_for(pays_path), cache_path_for(path))
+    os.remove(path + ".journal")
+    assert not isinstance(load_bills_table(path), MappedBillTable)
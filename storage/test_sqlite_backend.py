@@ -0,0 +1,66 @@
+import sqlite3
+from datetime import date
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.repository import BILLS, Repository
+from storage import data_manager, sqlite_backend
+
+
+def test_round_trip_and_window_query(tmp_path):
+    db_path = str(tmp_path / "bills.db")
+    bills = [
+        RecurringBill("Old Loan", 100.0, "monthly", "Monday", date(2020, 1, 6), date(2022, 1, 1)),
+        RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)),
+        RecurringBill("Gym", 15.0, "weekly", "Tuesday", date(2025, 1, 7), date(2025, 6, 30)),
+        RecurringBill("Future", 5.0, "weekly", "Friday", date(2026, 1, 2)),
+    ]
+    sqlite_backend.save_bills(bills, db_path)
+    assert [b.to_dict() for b in sqlite_backend.load_bills(db_path)] == [b.to_dict() for b in bills]
+
+    active = sqlite_backend.load_bills_active_between(date(2025, 5, 5), date(2025, 5, 11), db_path)
+    assert [b.name for b in active] == ["Rent", "Gym"]
+    weekly = sqlite_backend.load_bills_active_between(date(2025, 5, 5), date(2025, 5, 11), db_path, "weekly")
+    assert [b.name for b in weekly] == ["Gym"]
+
+
+def test_migrate_from_json(tmp_path):
+    bills_file, pays_file = str(tmp_path / "bills.json"), str(tmp_path / "pay_periods.json")
+    data_manager.save_bills([RecurringBill("Phone", 50.0, "monthly", "18", date(2025, 5, 18))], bills_file)
+    data_manager.save_pay_periods([RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10))],
+                                  pays_file)
+
+    db_path = str(tmp_path / "bills.db")
+    assert sqlite_backend.migrate_from_json(bills_file, pays_file, db_path) == (1, 1)
+    assert sqlite_backend.load_pay_periods(db_path)[0].to_dict() == data_manager.load_pay_periods(pays_file)[0].to_dict()
+    assert [b.name for b in sqlite_backend.load_bills(db_path)] == ["Phone"]
+
+
+def test_amounts_are_integer_cents_and_legacy_tables_upgrade(tmp_path):
+    db_path = str(tmp_path / "bills.db")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("CREATE TABLE bills (id INTEGER PRIMARY KEY, name TEXT NOT NULL, amount REAL NOT NULL, "
+                           "frequency TEXT NOT NULL, day_of_week TEXT NOT NULL, start_date TEXT, end_date TEXT)")
+        connection.execute("INSERT INTO bills (name, amount, frequency, day_of_week, start_date) "
+                           "VALUES ('Phone', 19.99, 'monthly', '18', '2025-05-18')")
+    connection.close()
+
+    assert [(b.name, b.amount_cents) for b in data_manager.load_bills(db_path)] == [("Phone", 1999)]
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("SELECT typeof(amount_cents) FROM bills").fetchone() == ("integer",)
+    connection.close()
+
+
+def test_database_paths_save_edits_row_by_row(tmp_path):
+    db_path = str(tmp_path / "bills.db")
+    data_manager.save_bills([RecurringBill(name, 10.0, "weekly", "Monday", date(2025, 1, 6))
+                             for name in ("Rent", "Gym", "Water")], db_path)
+    scheduler = data_manager.SaveScheduler(data_manager.save_bills, db_path, delay=10)
+    repository = Repository(data_manager.load_bills(db_path))
+    repository.subscribe(scheduler.mark_changed)
+    repository.remove(BILLS, 1)
+    repository.update(BILLS, 1, RecurringBill("Gas", 0.1, "weekly", "Monday", date(2025, 1, 6)))
+    repository.add(BILLS, RecurringBill("Phone", 50.0, "monthly", "18", date(2025, 5, 18)))
+    scheduler.close()
+
+    assert [(b.name, b.amount_cents) for b in data_manager.load_bills(db_path)] == \
+        [(b.name, b.amount_cents) for b in repository.bills]
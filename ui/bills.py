@@ -1,21 +1,59 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from models.bill import RecurringBill
-from storage.data_manager import load_bills, save_bills
+from models.occurrence_cache import occurrence_cache
+from models.repository import ADDED, BILLS, PAY_PERIODS, RELOADED, REMOVED, UPDATED, Repository
+from storage.data_manager import SaveScheduler, load_bills_table, load_pay_periods_table, save_bills
+from ui.virtual_table import VirtualTable
+from ui.worker import BackgroundWorker
+from utils.money import format_cents, to_cents
+from utils.weekly_snapshot import LiveWeeklySummary
 from ui.widgets import create_entry_label_frame, create_button, show_error, show_info
 from datetime import date
 from tkcalendar import DateEntry  # Import DateEntry from tkcalendar
 
+BILLS_FILE = "data/bills.json"
+PAY_PERIODS_FILE = "data/pay_periods.json"
+
+# Table columns as (header, width in pixels)
+BILL_COLUMNS = [("Bill Name", 160), ("Amount", 90), ("Frequency", 110), ("Day", 110), ("Start Date", 110),
+                ("End Day", 110)]
+
+
 class BillPage:
-    def __init__(self, root):
+    def __init__(self, root, repository=None, bills_file=BILLS_FILE, pay_periods_file=PAY_PERIODS_FILE):
         self.root = root
-        self.root.title("Bill Tracker")
+        self.root.winfo_toplevel().title("Bill Tracker")
 
-        # Load bills from saved file
-        self.bills = load_bills("data/bills.json")  # Load bills from the JSON file
+        # Bills live in a Repository shared with the other pages; its change events tell this page
+        # which row to redraw, so an edit never reloads or redraws the whole table
+        if repository is None:
+            repository = Repository()
+            repository.subscribe(occurrence_cache.on_change)
+        self.repository = repository
+        self.live_summary = LiveWeeklySummary(repository, date.today())
+
+        # Disk I/O and snapshot computations run in the background so the window stays responsive
+        self.worker = BackgroundWorker(self.root, on_busy=self.set_loading)
+        self.loaded = False
+
+        # Edits are written once per burst, not once per click, and flushed when the app exits
+        self.saver = SaveScheduler(save_bills, bills_file, delay=1.0, on_error=self.on_save_error)
 
         # UI Components
         self.create_widgets()
+        self.unsubscribe = repository.subscribe(self.on_change)
+
+        # Load bills from the binary cache when it is current, else from the JSON file plus any journaled edits
+        self.worker.submit("load", load_bills_table, bills_file, on_done=self.on_bills_loaded,
+                           on_error=lambda error: show_error(f"Could not load bills: {error}"), io=True)
+        # Pay periods only feed the weekly summary, so a missing file just leaves them empty
+        self.worker.submit("load_pay_periods", load_pay_periods_table, pay_periods_file,
+                           on_done=lambda table: self.repository.replace_all(PAY_PERIODS, table), io=True)
+
+    @property
+    def bills(self):
+        return self.repository.bills
 
     def create_widgets(self):
         self.bill_name_var = ctk.StringVar()
@@ -44,12 +82,67 @@ class BillPage:
         # Add Bill Button
         add_bill_button = create_button(self.root, "Add Bill", self.add_bill)
 
+        # Loading indicator and this week's summary, both filled in by background jobs
+        self.loading_label = ctk.CTkLabel(self.root, text="")
+        self.loading_label.pack(pady=2)
+        self.summary_label = ctk.CTkLabel(self.root, text="")
+        self.summary_label.pack(pady=2)
+
+        # Bills table, created once and refreshed in place
+        bills_label = ctk.CTkLabel(self.root, text="Bills:")
+        bills_label.pack(pady=10)
+        self.table = VirtualTable(self.root, BILL_COLUMNS)
+        self.table.pack(pady=5, fill="both", expand=True)
+
         # Display existing bills
         self.display_bills()
 
-    from datetime import date
+    def set_loading(self, busy):
+        self.loading_label.configure(text="Loading..." if busy else "")
+
+    def on_bills_loaded(self, table):
+        # Rows are light views over the table; edited or added bills are stored as RecurringBill objects
+        self.repository.replace_all(BILLS, table)
+
+    def on_change(self, event):
+        """
+        Repository subscriber: applies one change to the table and the saved file.
+        """
+        if event.collection == BILLS:
+            if event.kind == RELOADED:
+                self.loaded = True
+                self.display_bills()
+            elif event.kind == ADDED:
+                self.table.append_row(self.format_bill(event.item))
+                self.table.scroll_to(event.index)
+            elif event.kind == UPDATED:
+                self.table.update_row(event.index, self.format_bill(event.item))
+            elif event.kind == REMOVED:
+                self.table.remove_row(event.index)
+            if event.kind != RELOADED:
+                # Journaled: each edit is appended to bills.json.journal instead of rewriting every bill
+                self.saver.mark_changed(event)
+        self.refresh_summary()
+
+    def on_save_error(self, error):
+        # Called on the save timer's thread, so hand the message to the Tk loop
+        self.root.after(0, lambda: show_error(f"Could not save bills: {error}"))
+
+    def refresh_summary(self):
+        # A newer request replaces any summary still being computed
+        self.live_summary.set_today(date.today())
+        self.worker.submit("summary", self.live_summary.summary, on_done=self.show_summary)
+
+    def show_summary(self, summary):
+        self.summary_label.configure(
+            text=f"This week: {len(summary.bills_due)} due, {len(summary.overdue)} overdue, "
+                 f"{format_cents(to_cents(summary.total_bills))} total")
 
     def add_bill(self):
+        if not self.loaded:
+            show_error("Bills are still loading, please try again in a moment.")
+            return
+
         # Retrieve values from input fields
         name = self.bill_name_var.get().strip()
         amount_str = self.bill_amount_var.get().strip()  # Get the amount as a string first
@@ -58,10 +151,10 @@ class BillPage:
         start_date_str = self.bill_start_date_var.get().strip()
         end_date_str = self.bill_end_date_var.get().strip()
 
-        # Validate amount field: check if it's a valid float
+        # Validate amount field: parse it straight to cents so "19.99" is stored exactly
         try:
-            amount = float(amount_str) if amount_str else 0.0  # If empty, set amount to 0.0
-        except ValueError:
+            amount = to_cents(amount_str) / 100 if amount_str else 0.0  # If empty, set amount to 0.0
+        except ArithmeticError:
             show_error("Please enter a valid amount.")
             return
 
@@ -86,71 +179,29 @@ class BillPage:
             show_error("Invalid date format. Use YYYY-MM-DD.")
             return
 
-        # Create new bill and add to list
+        # Create new bill and add it to the repository, which adds its row and schedules the save
         new_bill = RecurringBill(name, amount, frequency, day_of_week, start_date, end_date)
-        self.bills.append(new_bill)
-
-        # Save updated list to file
-        save_bills(self.bills, "data/bills.json")
+        self.repository.add(BILLS, new_bill)
 
-        # Show success message and update UI
         show_info("Bill added successfully!")
-        self.display_bills()
-
-    def display_bills(self):
-        # Clear existing bill labels
-        for widget in self.root.winfo_children():
-            if isinstance(widget, ctk.CTkFrame):
-                widget.destroy()
-
-        bills_label = ctk.CTkLabel(self.root, text="Bills:")
-        bills_label.pack(pady=10)
-
-        # Create a container frame for the table
-        table_frame = ctk.CTkFrame(self.root)
-        table_frame.pack(pady=5, fill="both", expand=True)
-
-        # Header row
-        header_frame = ctk.CTkFrame(table_frame)
-        header_frame.grid(row=0, column=0, sticky="ew")
-
-        # Add column labels with equal width
-        bill_name_header = ctk.CTkLabel(header_frame, text="Bill Name", width=20, anchor="w")
-        bill_name_header.grid(row=0, column=0, padx=10, sticky="w")
-        amount_header = ctk.CTkLabel(header_frame, text="Amount", width=10, anchor="w")
-        amount_header.grid(row=0, column=1, padx=10, sticky="w")
-        frequency_header = ctk.CTkLabel(header_frame, text="Frequency", width=15, anchor="w")
-        frequency_header.grid(row=0, column=2, padx=10, sticky="w")
-        day_header = ctk.CTkLabel(header_frame, text="Day", width=15, anchor="w")
-        day_header.grid(row=0, column=3, padx=10, sticky="w")
-        start_day_header = ctk.CTkLabel(header_frame, text="Start Date", width=15, anchor="w")
-        start_day_header.grid(row=0, column=4, padx=10, sticky="w")
-        end_day_header = ctk.CTkLabel(header_frame, text="End Day", width=15, anchor="w")
-        end_day_header.grid(row=0, column=5, padx=10, sticky="w")
-
-        # Display each bill in a row
-        for i, bill in enumerate(self.bills):
-            bill_frame = ctk.CTkFrame(table_frame)
-            bill_frame.grid(row=i + 1, column=0, sticky="ew", padx=5, pady=5)
-
-            # Add bill details in the same columns as headers
-            bill_name_label = ctk.CTkLabel(bill_frame, text=bill.name, width=20, anchor="w")
-            bill_name_label.grid(row=0, column=0, padx=10, sticky="w")
-            amount_label = ctk.CTkLabel(bill_frame, text=f"${bill.amount:.2f}", width=10, anchor="w")
-            amount_label.grid(row=0, column=1, padx=10, sticky="w")
-            frequency_label = ctk.CTkLabel(bill_frame, text=bill.frequency, width=15, anchor="w")
-            frequency_label.grid(row=0, column=2, padx=10, sticky="w")
-            day_label = ctk.CTkLabel(bill_frame, text=bill.day_of_week, width=15, anchor="w")
-            day_label.grid(row=0, column=3, padx=10, sticky="w")
-
-            # If start_date is the current date, display an empty string
-            start_date_display = "" if bill.start_date == date.today() else bill.start_date
-            start_day_label = ctk.CTkLabel(bill_frame, text=start_date_display, width=15, anchor="w")
-            start_day_label.grid(row=0, column=4, padx=10, sticky="w")
-
-            # If end_date is None, display an empty string
-            end_day_label = ctk.CTkLabel(bill_frame, text=bill.end_date if bill.end_date else "", width=15, anchor="w")
-            end_day_label.grid(row=0, column=5, padx=10, sticky="w")
-
 
+    def format_bill(self, bill):
+        """
+        Returns the cell texts for one bill row.
+        """
+        # If start_date is the current date, display an empty string
+        start_date_display = "" if bill.start_date == date.today() else bill.start_date
+        # If end_date is None, display an empty string
+        end_date_display = bill.end_date if bill.end_date else ""
+        return (bill.name, format_cents(bill.amount_cents), bill.frequency, bill.day_of_week, start_date_display,
+                end_date_display)
 
+    def display_bills(self):
+        # Only the visible rows are drawn, and only cells whose text changed are touched
+        self.table.set_rows(self.format_bill(bill) for bill in self.bills)
+
+    def update_bill(self, index, bill):
+        """
+        Replaces one bill and redraws only its row.
+        """
+        self.repository.update(BILLS, index, bill)
@@ -0,0 +1,119 @@
+import customtkinter as ctk
+from datetime import date
+from models.repository import Repository
+from ui.worker import BackgroundWorker
+from ui.widgets import show_error
+from utils.money import format_cents
+from utils.month_grid import MonthGridCache, build_month_grid, shift_month
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MAX_LINES = 3  # Items listed in a day cell before it shows "+N more"
+PREFETCH_MONTHS = 1  # Months built ahead on each side of the one shown
+
+
+class CalendarPage:
+    """
+    Month view of each day's bills and paychecks.
+
+    Months come from a MonthGridCache over the shared repository: the shown month is built in
+    the background if it isn't cached, and the months next to it are prefetched, so paging
+    is a cache lookup and a redraw of 42 labels. Edits elsewhere patch the cached months
+    through the repository's change events.
+    """
+
+    def __init__(self, root, repository=None):
+        self.root = root
+        self.repository = repository if repository is not None else Repository()
+        self.grids = MonthGridCache(self.repository)
+        self.worker = BackgroundWorker(self.root)
+        today = date.today()
+        self.year, self.month = today.year, today.month
+
+        self.create_widgets()
+        self.unsubscribe = self.repository.subscribe(self.on_change)
+        self.show_month()
+
+    def create_widgets(self):
+        # Month header with paging buttons
+        header = ctk.CTkFrame(self.root)
+        header.pack(pady=10)
+        ctk.CTkButton(header, text="<", width=40, command=lambda: self.page(-1)).pack(side="left", padx=10)
+        self.title_label = ctk.CTkLabel(header, text="", width=200, font=("Arial", 16, "bold"))
+        self.title_label.pack(side="left")
+        ctk.CTkButton(header, text=">", width=40, command=lambda: self.page(1)).pack(side="left", padx=10)
+
+        self.totals_label = ctk.CTkLabel(self.root, text="")
+        self.totals_label.pack(pady=2)
+
+        # Six weeks of day cells, created once and reconfigured for each month
+        grid_frame = ctk.CTkFrame(self.root)
+        grid_frame.pack(pady=5, fill="both", expand=True)
+        for column, name in enumerate(WEEKDAYS):
+            ctk.CTkLabel(grid_frame, text=name).grid(row=0, column=column, sticky="ew")
+            grid_frame.grid_columnconfigure(column, weight=1, uniform="day")
+        self.cells = []
+        for slot in range(42):
+            cell = ctk.CTkLabel(grid_frame, text="", anchor="nw", justify="left", width=120, height=80)
+            cell.grid(row=slot // 7 + 1, column=slot % 7, padx=2, pady=2, sticky="nsew")
+            self.cells.append(cell)
+        for row in range(1, 7):
+            grid_frame.grid_rowconfigure(row, weight=1, uniform="week")
+
+    def page(self, delta):
+        self.year, self.month = shift_month(self.year, self.month, delta)
+        self.show_month()
+
+    def show_month(self):
+        self.title_label.configure(text=date(self.year, self.month, 1).strftime("%B %Y"))
+        grid = self.grids.get(self.year, self.month)
+        if grid is None:
+            self.totals_label.configure(text="Loading...")
+            self.request(self.year, self.month, key="month")
+        else:
+            self.draw(grid)
+
+        # Build the neighbouring months now so the next click finds them cached
+        for delta in range(-PREFETCH_MONTHS, PREFETCH_MONTHS + 1):
+            key = shift_month(self.year, self.month, delta)
+            if delta and key not in self.grids:
+                self.request(*key, key=("prefetch",) + key)
+
+    def request(self, year, month, key):
+        """
+        Builds a month's grid in the background from the items the repository has active in it.
+        """
+        paychecks, bills, generation = self.grids.snapshot(year, month)
+        self.worker.submit(key, build_month_grid, paychecks, bills, year, month,
+                           on_done=lambda grid: self.on_grid_built(grid, generation),
+                           on_error=lambda error: show_error(f"Could not build the calendar: {error}"))
+
+    def on_grid_built(self, grid, generation):
+        if not self.grids.put(grid, generation):
+            # The repository changed while it was built; the shown month is requested again
+            if (grid.year, grid.month) == (self.year, self.month):
+                self.show_month()
+            return
+        if (grid.year, grid.month) == (self.year, self.month):
+            self.draw(grid)
+
+    def draw(self, grid):
+        income, bills = grid.totals()
+        self.totals_label.configure(
+            text=f"Income {format_cents(income)}   Bills {format_cents(bills)}   Net {format_cents(income - bills)}")
+
+        offset = grid.first.weekday()
+        for slot, cell in enumerate(self.cells):
+            day = slot - offset + 1
+            if not 1 <= day <= grid.days:
+                cell.configure(text="")
+                continue
+            paychecks, bills_due = grid.day(day)
+            lines = [f"+ {pay.name} {format_cents(pay.amount_cents)}" for pay in paychecks]
+            lines += [f"{bill.name} {format_cents(bill.amount_cents)}" for bill in bills_due]
+            if len(lines) > MAX_LINES:
+                lines = lines[:MAX_LINES - 1] + [f"+{len(lines) - MAX_LINES + 1} more"]
+            cell.configure(text="\n".join([str(day)] + lines))
+
+    def on_change(self, event):
+        # The cache has already patched its months (it subscribed first), so just redraw
+        self.show_month()
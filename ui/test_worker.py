@@ -0,0 +1,42 @@
+import threading
+import time
+from ui.worker import BackgroundWorker
+
+
+class FakeRoot:
+    # Collects after() callbacks so the test can pump them like the Tk main loop would
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def pump(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def run_until(root, worker, condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        root.pump()
+        time.sleep(0.01)
+
+
+def test_results_arrive_on_poll_and_stale_jobs_are_dropped():
+    root = FakeRoot()
+    busy = []
+    worker = BackgroundWorker(root, on_busy=busy.append)
+    results = []
+    gate = threading.Event()
+
+    worker.submit("snapshot", gate.wait, on_done=lambda _: results.append("stale"))
+    worker.submit("snapshot", lambda: 2, on_done=results.append)
+    worker.submit(None, lambda: 1 / 0, on_error=lambda error: results.append(type(error).__name__), io=True)
+    gate.set()
+
+    run_until(root, worker, lambda: not worker.busy)
+    assert sorted(map(str, results)) == ["2", "ZeroDivisionError"]
+    assert busy[0] is True and busy[-1] is False
+    worker.shutdown()
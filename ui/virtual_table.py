@@ -0,0 +1,142 @@
+import customtkinter as ctk
+
+
+class VirtualTable(ctk.CTkFrame):
+    """
+    A scrollable table that only creates widgets for the rows that fit in the viewport.
+
+    Row widgets are kept in a pool and re-bound to different data rows while scrolling, and a
+    cell's label is only reconfigured when its text actually changes. Redraw cost therefore
+    depends on the viewport height, not on how many rows the table holds.
+    """
+
+    def __init__(self, master, columns, row_height=34, **kwargs):
+        """
+        :param master: The parent widget
+        :param columns: List of (header text, column width in pixels)
+        :param row_height: Height of one row in pixels, used to work out how many rows fit
+        """
+        super().__init__(master, **kwargs)
+        self.columns = columns
+        self.row_height = row_height
+        self.rows = []  # Cell texts for every data row
+        self.first = 0  # Index of the data row shown in the top slot
+        self.pool = []  # (frame, labels) per visible slot
+        self.rendered = []  # Cell texts currently shown by each slot, None when hidden
+
+        # Header row
+        header_frame = ctk.CTkFrame(self)
+        header_frame.grid(row=0, column=0, columnspan=2, sticky="ew")
+        for column, (text, width) in enumerate(columns):
+            ctk.CTkLabel(header_frame, text=text, width=width, anchor="w").grid(row=0, column=column, padx=10,
+                                                                                 sticky="w")
+
+        # Body holding the pooled row frames, with a scrollbar driving `first`
+        self.body = ctk.CTkFrame(self)
+        self.body.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.body.bind("<Configure>", lambda event: self._refresh())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.body.bind(sequence, self._on_mousewheel)
+
+    def set_rows(self, rows):
+        """
+        Replaces all data rows. Only visible cells whose text changed are redrawn.
+        """
+        self.rows = [tuple(str(cell) for cell in row) for row in rows]
+        self._refresh()
+
+    def append_row(self, row):
+        self.rows.append(tuple(str(cell) for cell in row))
+        self._refresh()
+
+    def update_row(self, index, row):
+        """
+        Replaces one data row and redraws it only if it is currently visible.
+        """
+        self.rows[index] = tuple(str(cell) for cell in row)
+        slot = index - self.first
+        if 0 <= slot < len(self.pool):
+            self._render(slot, self.rows[index])
+
+    def remove_row(self, index):
+        del self.rows[index]
+        self._refresh()
+
+    def scroll_to(self, index):
+        """
+        Scrolls so the data row at `index` is visible.
+        """
+        visible = self._visible_count()
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + visible:
+            self.first = index - visible + 1
+        self._refresh()
+
+    def _visible_count(self):
+        height = self.body.winfo_height()
+        # Before the first layout pass the height is 1, so show a screenful by default
+        return max(1, height // self.row_height) if height > 1 else 15
+
+    def _ensure_pool(self, count):
+        while len(self.pool) < count:
+            frame = ctk.CTkFrame(self.body, height=self.row_height)
+            labels = []
+            for column, (_, width) in enumerate(self.columns):
+                label = ctk.CTkLabel(frame, text="", width=width, anchor="w")
+                label.grid(row=0, column=column, padx=10, sticky="w")
+                labels.append(label)
+            for widget in [frame] + labels:
+                for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                    widget.bind(sequence, self._on_mousewheel)
+            self.pool.append((frame, labels))
+            self.rendered.append(None)
+
+    def _render(self, slot, row):
+        frame, labels = self.pool[slot]
+        shown = self.rendered[slot]
+        if row is None:
+            if shown is not None:
+                frame.grid_remove()
+        else:
+            if shown is None:
+                frame.grid(row=slot, column=0, sticky="ew", padx=5, pady=2)
+            for column, text in enumerate(row):
+                if shown is None or shown[column] != text:
+                    labels[column].configure(text=text)
+        self.rendered[slot] = row
+
+    def _refresh(self):
+        visible = self._visible_count()
+        self._ensure_pool(visible)
+        self.first = max(0, min(self.first, len(self.rows) - visible))
+
+        for slot in range(len(self.pool)):
+            index = self.first + slot
+            row = self.rows[index] if slot < visible and index < len(self.rows) else None
+            if row != self.rendered[slot]:
+                self._render(slot, row)
+
+        total = max(len(self.rows), 1)
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        visible = self._visible_count()
+        if action == "moveto":
+            self.first = int(float(amount) * len(self.rows))
+        elif action == "scroll":
+            step = visible if unit == "pages" else 1
+            self.first += int(amount) * step
+        self._refresh()
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.first -= 3
+        else:
+            self.first += 3
+        self._refresh()
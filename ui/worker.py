@@ -0,0 +1,98 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundWorker:
+    """
+    Runs storage and snapshot work off the Tk main loop and hands results back on it.
+
+    Jobs run on a thread pool; results are queued and delivered by a short `root.after`
+    poll, so callbacks always run on the Tk thread. Each job has a key: submitting a new job
+    under the same key makes the older one stale, so it is cancelled if it hasn't started and
+    its result is dropped if it has. Storage writes go through a single-thread lane (`io=True`)
+    so they happen in the order they were submitted.
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=50, on_busy=None):
+        """
+        :param root: The Tk root (anything with an `after` method)
+        :param max_workers: Threads used for computations
+        :param poll_ms: How often finished jobs are checked for, in milliseconds
+        :param on_busy: Called with True/False when jobs start/stop running, e.g. to show a loading indicator
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy = on_busy
+        self.compute = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bill-tracker")
+        self.io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bill-tracker-io")
+        self.results = queue.Queue()
+        self.generations = {}  # Job key -> number of the latest job submitted under it
+        self.futures = {}  # Job key -> future of the latest job
+        self.pending = 0
+        self.closed = False
+        self.root.after(self.poll_ms, self._poll)
+
+    @property
+    def busy(self):
+        return self.pending > 0
+
+    def submit(self, key, fn, *args, on_done=None, on_error=None, io=False, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in the background and calls on_done(result) or
+        on_error(exception) on the Tk thread, unless a newer job with the same key was submitted.
+        Use a unique key (e.g. None) for jobs that must never be superseded.
+        """
+        generation = self.generations.get(key, 0) + 1
+        if key is not None:
+            self.generations[key] = generation
+            stale = self.futures.get(key)
+            if stale is not None and stale.cancel():
+                self._finished()
+
+        future = (self.io if io else self.compute).submit(fn, *args, **kwargs)
+        if key is not None:
+            self.futures[key] = future
+        self._started()
+        future.add_done_callback(
+            lambda done: None if done.cancelled() else self.results.put((key, generation, done, on_done, on_error)))
+        return future
+
+    def _started(self):
+        self.pending += 1
+        if self.pending == 1 and self.on_busy:
+            self.on_busy(True)
+
+    def _finished(self):
+        self.pending -= 1
+        if self.pending == 0 and self.on_busy:
+            self.on_busy(False)
+
+    def _poll(self):
+        while True:
+            try:
+                key, generation, future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self._finished()
+            if key is not None and self.generations.get(key) != generation:
+                continue  # A newer job for the same key has been submitted
+            if self.futures.get(key) is future:
+                del self.futures[key]
+
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(future.result())
+
+        if not self.closed:
+            self.root.after(self.poll_ms, self._poll)
+
+    def shutdown(self, wait=True):
+        """
+        Stops polling and waits for queued storage writes to finish.
+        """
+        self.closed = True
+        self.compute.shutdown(wait=False, cancel_futures=True)
+        self.io.shutdown(wait=wait)
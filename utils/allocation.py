@@ -0,0 +1,78 @@
+import heapq
+from datetime import date, timedelta
+from typing import Iterable, List, NamedTuple, Tuple
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from utils.money import from_cents
+from utils.weekly_snapshot import BILL, PAY, active_between, iter_occurrences
+
+
+class Allocation(NamedTuple):
+    paycheck: RecurringPayPeriod
+    date: date
+    amount: float
+    bills: List[Tuple[RecurringBill, date]]  # Bill occurrences this paycheck has to cover
+    committed: float
+    free: float  # Negative when the bills assigned to it exceed the paycheck
+
+
+class AllocationReport(NamedTuple):
+    allocations: List[Allocation]
+    unfunded: List[Tuple[RecurringBill, date]]  # Bills due before any paycheck in range
+
+
+def allocate(paychecks: Iterable[RecurringPayPeriod], bills: Iterable[RecurringBill], start: date, end: date,
+             lookback_days: int = 31) -> AllocationReport:
+    """
+    Assigns every bill occurrence between `start` and `end` to the latest paycheck on or before
+    it, and totals what each paycheck has committed and what it leaves free.
+
+    All occurrences are merged into one date-ordered stream (paychecks first on a shared day)
+    and swept once, so the cost is O((P + B) log n) for P paychecks and B bill occurrences
+    from n items, however long the range. Paychecks are read from `lookback_days` before
+    `start`, so bills early in the range are funded by the last paycheck before it.
+
+    :param paychecks: Pay periods to allocate from
+    :param bills: Bills to fund
+    :param start: First day of bills to allocate
+    :param end: Last day of bills to allocate
+    :param lookback_days: How far before `start` to look for the paycheck funding the first bills
+    :return: AllocationReport with one Allocation per paycheck, in date order
+    """
+    pay_start = start - timedelta(days=lookback_days)
+
+    def stream(order, index, item, stream_start):
+        for occ in iter_occurrences(item, stream_start, end):
+            yield occ, order, index, item
+
+    streams = [stream(PAY, index, pay, pay_start)
+               for index, pay in enumerate(active_between(paychecks, pay_start, end))]
+    streams += [stream(BILL, index, bill, start) for index, bill in enumerate(active_between(bills, start, end))]
+
+    allocations = []
+    unfunded = []
+    current = None  # [paycheck, date, bills, committed cents] for the paycheck being filled
+
+    def close(entry):
+        paycheck, pay_date, funded, committed = entry
+        allocations.append(Allocation(paycheck, pay_date, paycheck.amount, funded, from_cents(committed),
+                                      from_cents(paycheck.amount_cents - committed)))
+
+    for occ, order, _, item in heapq.merge(*streams, key=lambda event: event[:3]):
+        if order == PAY:
+            if current is not None:
+                close(current)
+            current = [item, occ, [], 0]
+        elif current is None:
+            unfunded.append((item, occ))
+        else:
+            current[2].append((item, occ))
+            current[3] += item.amount_cents
+
+    if current is not None:
+        close(current)
+
+    # Paychecks from the lookback window that fund nothing in range aren't part of the report
+    while allocations and allocations[0].date < start and not allocations[0].bills:
+        allocations.pop(0)
+    return AllocationReport(allocations, unfunded)
@@ -0,0 +1,252 @@
+import csv
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from models.bill import RecurringBill
+from models.recurrence import days_in_month
+from storage.ledger import PAID
+from utils.money import from_cents, to_cents
+
+DATE_COLUMNS = ("date", "posted date", "posting date", "transaction date", "trans. date")
+AMOUNT_COLUMNS = ("amount", "transaction amount")
+DEBIT_COLUMNS = ("debit", "withdrawal", "withdrawals")
+CREDIT_COLUMNS = ("credit", "deposit", "deposits")
+DESCRIPTION_COLUMNS = ("description", "payee", "name", "memo", "details")
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%Y/%m/%d", "%d %b %Y")
+
+# Matches one OFX tag and the text after it, in either SGML (unclosed) or XML form
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+class Transaction(NamedTuple):
+    date: date
+    amount_cents: int  # Negative for money going out
+    description: str
+
+    @property
+    def amount(self) -> float:
+        return from_cents(self.amount_cents)
+
+
+class MatchReport(NamedTuple):
+    matched: List[Tuple[Transaction, RecurringBill, date]]
+    unmatched: List[Transaction]  # Debits that didn't match any expected bill
+    missing: List[Tuple[RecurringBill, date]]  # Expected bills within the statement dates with no debit
+    credits: int  # Incoming transactions, never matched against bills
+
+
+def parse_cents(text: str) -> int:
+    """
+    Parses bank amounts like "-1,234.56", "$60.00" or "(60.00)" (negative) exactly, in cents.
+    """
+    text = text.strip()
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return to_cents(text)
+
+
+def parse_date(text: str) -> date:
+    text = text.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {text}")
+
+
+def _column(header, names):
+    lowered = {column.strip().lower(): column for column in header}
+    return next((lowered[name] for name in names if name in lowered), None)
+
+
+def iter_csv_transactions(file_path) -> Iterator[Transaction]:
+    """
+    Lazily yields the transactions of a bank CSV export, one row at a time.
+    Columns are found by their usual header names; either a signed amount column or separate
+    debit/credit columns are understood.
+
+    :param file_path: Path to the .csv file
+    :return: Generator of Transaction
+    """
+    with open(file_path, 'r', newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.DictReader(csv_file)
+        header = reader.fieldnames or []
+        date_column = _column(header, DATE_COLUMNS)
+        amount_column = _column(header, AMOUNT_COLUMNS)
+        debit_column = _column(header, DEBIT_COLUMNS)
+        credit_column = _column(header, CREDIT_COLUMNS)
+        description_column = _column(header, DESCRIPTION_COLUMNS)
+        if date_column is None or (amount_column is None and debit_column is None):
+            raise ValueError(f"{file_path}: no date or amount column in header {header}")
+
+        for row in reader:
+            if not row.get(date_column):
+                continue
+            if amount_column is not None:
+                cents = parse_cents(row[amount_column])
+            else:
+                cents = -abs(parse_cents(row[debit_column] or ""))
+                if not cents and credit_column is not None:
+                    cents = abs(parse_cents(row[credit_column] or ""))
+            description = row[description_column].strip() if description_column else ""
+            yield Transaction(parse_date(row[date_column]), cents, description)
+
+
+def iter_ofx_transactions(file_path, chunk_size=65536) -> Iterator[Transaction]:
+    """
+    Lazily yields the transactions of an OFX/QFX statement. The file is read in chunks and
+    scanned tag by tag, so SGML (OFX 1.x) and XML (OFX 2.x) files of any size work.
+
+    :param file_path: Path to the .ofx/.qfx file
+    :return: Generator of Transaction
+    """
+    fields = None
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as ofx_file:
+        buffer = ""
+        while True:
+            chunk = ofx_file.read(chunk_size)
+            buffer += chunk
+            # Keep a possibly incomplete last tag for the next chunk
+            cut = max(buffer.rfind("<"), 0) if chunk else len(buffer)
+            text, buffer = buffer[:cut], buffer[cut:]
+            for closing, tag, value in OFX_TAG.findall(text):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if fields is not None and "DTPOSTED" in fields:
+                        yield _ofx_transaction(fields)
+                    fields = None if closing else {}
+                elif fields is not None and not closing and value.strip():
+                    fields[tag] = value.strip()
+            if not chunk:
+                break
+    if fields is not None and "DTPOSTED" in fields:
+        yield _ofx_transaction(fields)
+
+
+def _ofx_transaction(fields):
+    posted = fields["DTPOSTED"][:8]  # YYYYMMDD, followed by an optional time and zone
+    return Transaction(date(int(posted[:4]), int(posted[4:6]), int(posted[6:8])),
+                       parse_cents(fields.get("TRNAMT", "0")),
+                       fields.get("NAME") or fields.get("MEMO", ""))
+
+
+def iter_transactions(file_path) -> Iterator[Transaction]:
+    """
+    Streams transactions from a CSV or OFX/QFX statement, chosen by file extension.
+    """
+    if file_path.lower().endswith((".ofx", ".qfx")):
+        return iter_ofx_transactions(file_path)
+    return iter_csv_transactions(file_path)
+
+
+class ExpectedPayments:
+    """
+    Hash index of the bill occurrences a statement is expected to contain.
+
+    Occurrences are keyed by (amount in cents, date bucket), with buckets `window_days + 1`
+    days wide, so a transaction only has to look in its own bucket and the two next to it to
+    find every occurrence within `window_days` of its date. Months are indexed the first time a
+    transaction needs them, so the index follows the statement as it streams past and doesn't
+    need the statement's date range up front.
+    """
+
+    def __init__(self, bills: Iterable[RecurringBill], window_days: int = 3, ledger=None):
+        self.bills = list(bills)
+        self.window_days = window_days
+        self.width = window_days + 1
+        self.ledger = ledger
+        self.buckets: Dict[Tuple[int, int], List[Tuple[date, RecurringBill]]] = {}
+        self.indexed_months = set()
+
+    def _index_month(self, year, month):
+        if (year, month) in self.indexed_months:
+            return
+        self.indexed_months.add((year, month))
+        start, end = date(year, month, 1), date(year, month, days_in_month(year, month))
+        # Occurrences already paid or skipped can't be paid again
+        settled = self.ledger.settled_between(start, end) if self.ledger is not None else ()
+        for bill in self.bills:
+            for occurrence in bill.get_occurrences_between(start, end):
+                if settled and (self.ledger.key_for(bill), occurrence) in settled:
+                    continue
+                key = (bill.amount_cents, occurrence.toordinal() // self.width)
+                self.buckets.setdefault(key, []).append((occurrence, bill))
+
+    def _cover(self, d: date):
+        for day in (d - timedelta(days=self.window_days), d, d + timedelta(days=self.window_days)):
+            self._index_month(day.year, day.month)
+
+    def match(self, transaction: Transaction) -> Optional[Tuple[RecurringBill, date]]:
+        """
+        Finds and removes the expected occurrence with the transaction's amount that is closest
+        to its date, within `window_days`. Returns (bill, occurrence) or None.
+        """
+        self._cover(transaction.date)
+        cents, ordinal = abs(transaction.amount_cents), transaction.date.toordinal()
+        best = None
+        for bucket in (ordinal // self.width - 1, ordinal // self.width, ordinal // self.width + 1):
+            candidates = self.buckets.get((cents, bucket))
+            for position, (occurrence, bill) in enumerate(candidates or ()):
+                distance = abs(occurrence.toordinal() - ordinal)
+                if distance <= self.window_days and (best is None or distance < best[0]):
+                    best = (distance, bucket, position)
+        if best is None:
+            return None
+        _, bucket, position = best
+        return self.buckets[(cents, bucket)].pop(position)[::-1]
+
+    def remaining_between(self, start: date, end: date) -> List[Tuple[RecurringBill, date]]:
+        """
+        Expected occurrences between `start` and `end` that haven't been matched, by date.
+        """
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            self._index_month(year, month)
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        found = [(bill, occurrence) for entries in self.buckets.values() for occurrence, bill in entries
+                 if start <= occurrence <= end]
+        return sorted(found, key=lambda entry: entry[1])
+
+
+def match_transactions(bills: Iterable[RecurringBill], transactions: Iterable[Transaction], ledger=None,
+                       window_days: int = 3, batch_size: int = 500) -> MatchReport:
+    """
+    Matches debits from a statement to the bills expected around their dates and, with a
+    ledger, marks each matched occurrence as paid. Matches are written to the ledger in
+    batches, so a large statement never holds more than `batch_size` pending writes.
+
+    :param bills: Bills the statement is expected to pay
+    :param transactions: Transactions, e.g. from iter_transactions
+    :param ledger: Optional PaymentLedger to record matches in
+    :param window_days: How many days a payment may land from its due date
+    :param batch_size: Matches written to the ledger per transaction
+    :return: MatchReport
+    """
+    expected = ExpectedPayments(bills, window_days, ledger)
+    matched, unmatched, pending = [], [], []
+    credits = 0
+    first = last = None
+
+    for transaction in transactions:
+        if transaction.amount_cents >= 0:
+            credits += 1
+            continue
+        first = transaction.date if first is None or transaction.date < first else first
+        last = transaction.date if last is None or transaction.date > last else last
+        found = expected.match(transaction)
+        if found is None:
+            unmatched.append(transaction)
+            continue
+        bill, occurrence = found
+        matched.append((transaction, bill, occurrence))
+        if ledger is not None:
+            pending.append((bill, occurrence, PAID, -transaction.amount_cents))
+            if len(pending) >= batch_size:
+                ledger.record_many(pending)
+                pending = []
+
+    if pending:
+        ledger.record_many(pending)
+    missing = expected.remaining_between(first, last) if first is not None else []
+    return MatchReport(matched, unmatched, missing, credits)
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Iterator, List, Optional, Tuple
+from utils.money import from_cents, to_cents
+
+BILLS_FILES = ("bills.jsonl", "bills.json")
+PAY_PERIODS_FILES = ("pay_periods.jsonl", "pay_periods.json", "pay_period.json")
+MONEY_KEYS = ("total_income", "total_bills", "disposable_income")
+
+
+def discover_tenants(root: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Walks a directory tree and yields (tenant id, bills file, pay periods file or None) for
+    every directory holding a bills file. The tenant id is the directory relative to `root`.
+    """
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        bills_file = next((name for name in BILLS_FILES if name in files), None)
+        if bills_file is None:
+            continue
+        pay_file = next((name for name in PAY_PERIODS_FILES if name in files), None)
+        yield (os.path.relpath(directory, root),
+               os.path.join(directory, bills_file),
+               os.path.join(directory, pay_file) if pay_file else None)
+
+
+def run_tenant(task) -> dict:
+    """
+    Loads one tenant's files and computes its weekly snapshot and optional forecast totals.
+    Runs inside a worker process, so it takes and returns plain picklable values.
+    """
+    from storage.data_manager import load_bills, load_pay_periods
+    from utils.forecast import forecast
+    from utils.weekly_snapshot import weekly_summary
+
+    tenant, bills_file, pay_file, today, forecast_years = task
+    try:
+        bills = load_bills(bills_file)
+        paychecks = load_pay_periods(pay_file) if pay_file else []
+        summary = weekly_summary(paychecks, bills, today)
+        result = {
+            "tenant": tenant,
+            "bills": len(bills),
+            "pay_periods": len(paychecks),
+            "overdue": len(summary.overdue),
+            "total_income": summary.total_income,
+            "total_bills": summary.total_bills,
+            "disposable_income": summary.disposable_income,
+        }
+        if forecast_years:
+            # Rows are exact conversions of cents, so they are summed back in cents
+            income = spent = balance = 0
+            for row in forecast(paychecks, bills, today, years=forecast_years, granularity="month"):
+                income += to_cents(row.income)
+                spent += to_cents(row.bills)
+                balance = row.balance
+            result["forecast"] = {"years": forecast_years, "income": from_cents(income), "bills": from_cents(spent),
+                                  "balance": balance}
+        return result
+    except Exception as error:  # One bad tenant shouldn't sink the whole batch
+        return {"tenant": tenant, "error": f"{type(error).__name__}: {error}"}
+
+
+def run_batch(root: str, today: date, workers: Optional[int] = None, chunksize: Optional[int] = None,
+              forecast_years: int = 0) -> dict:
+    """
+    Fans every tenant under `root` out across a process pool and aggregates one report.
+
+    :param root: Directory tree holding one sub-directory of data files per tenant
+    :param today: Date the weekly snapshot is taken for
+    :param workers: Number of worker processes, defaults to the CPU count
+    :param chunksize: Tenants handed to a worker at a time, defaults to about four chunks per worker
+    :param forecast_years: Also total a monthly forecast over this many years when non-zero
+    :return: Report with per-tenant results, errors and totals
+    """
+    tasks = [(tenant, bills_file, pay_file, today, forecast_years)
+             for tenant, bills_file, pay_file in discover_tenants(root)]
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+
+    if workers == 1:
+        results = [run_tenant(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_tenant, tasks, chunksize=chunksize))
+
+    return aggregate(results, today)
+
+
+def aggregate(results: List[dict], today: date) -> dict:
+    tenants = [result for result in results if "error" not in result]
+    totals = {key: sum(result[key] for result in tenants) for key in ("bills", "pay_periods", "overdue")}
+    # Money is totalled in cents, so thousands of tenants add up to the cent
+    totals.update((key, from_cents(sum(to_cents(result[key]) for result in tenants))) for key in MONEY_KEYS)
+    return {
+        "date": today.isoformat(),
+        "tenant_count": len(results),
+        "totals": totals,
+        "tenants": tenants,
+        "errors": [result for result in results if "error" in result],
+    }
@@ -0,0 +1,187 @@
+from datetime import date
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import RecurrenceRule, clamp_to_28
+from utils.money import from_cents
+from utils.weekly_snapshot import get_week_range
+
+# Stands in for "no end date" in the integer day columns
+NO_END = np.iinfo(np.int64).max // 4
+
+
+def _day(d: date) -> int:
+    """
+    Days since 1970-01-01, the integer form of datetime64[D].
+    """
+    return int(np.datetime64(d, "D").astype(np.int64))
+
+
+def _expand(counts: np.ndarray, starts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each row i emit counts[i] consecutive integers starting at starts[i].
+    Returns the row index of every emitted value alongside the values.
+    """
+    rows = np.repeat(np.arange(counts.size), counts)
+    first_of_row = np.repeat(np.cumsum(counts) - counts, counts)
+    return rows, starts[rows] + (np.arange(rows.size) - first_of_row)
+
+
+class ScheduleColumns:
+    """
+    Columnar form of a list of bills or pay periods, used to expand every occurrence in a
+    date window with array operations instead of a Python loop per item.
+
+    Each item is split into one or two segments: a fixed-stride segment (weekly, biweekly,
+    every N days, one-off) or a calendar-month segment on a fixed day. The rare sticky
+    month-end pay period that can't be written that way is expanded with its own rule.
+    """
+
+    def __init__(self, items: Sequence):
+        self.items = list(items)
+        self.cents = np.array([item.amount_cents for item in self.items], dtype=np.int64)
+        stride_rows, month_rows = [], []
+        self.fallback = []  # Indexes of items expanded one at a time
+
+        for owner, item in enumerate(self.items):
+            if item.start_date is None:
+                continue
+            rule = item.rule
+            end_date = getattr(item, "end_date", None)
+            until = _day(end_date) if end_date else NO_END
+            weekday = -1 if rule.weekday is None else rule.weekday
+            anchor = rule.anchor
+
+            if rule.kind == RecurrenceRule.STRIDE:
+                stride_rows.append((owner, _day(anchor), rule.stride, until, weekday))
+            elif rule.kind == RecurrenceRule.ONCE:
+                stride_rows.append((owner, _day(anchor), 1, min(until, _day(anchor)), weekday))
+            elif rule.kind == RecurrenceRule.DAY_OF_MONTH:
+                first = rule.nth(0)
+                month_rows.append((owner, first.year * 12 + first.month - 1 - 1970 * 12,
+                                   rule.day_of_month, until, weekday))
+            elif rule.kind == RecurrenceRule.SEMIMONTHLY:
+                for first in (rule.nth(0), rule.nth(1)):
+                    month_rows.append((owner, first.year * 12 + first.month - 1 - 1970 * 12,
+                                       first.day, until, weekday))
+            elif rule.month_step is clamp_to_28 or anchor.day <= 28:
+                # Every date after the first keeps the same day, so the first may need its own row
+                second = rule.nth(1)
+                if second.day != anchor.day:
+                    stride_rows.append((owner, _day(anchor), 1, min(until, _day(anchor)), weekday))
+                    first = second
+                else:
+                    first = anchor
+                month_rows.append((owner, first.year * 12 + first.month - 1 - 1970 * 12,
+                                   first.day, until, weekday))
+            else:
+                self.fallback.append(owner)
+
+        stride = np.array(stride_rows, dtype=np.int64).reshape(-1, 5)
+        self.stride_owner, self.stride_anchor, self.stride_step, self.stride_until, self.stride_weekday = stride.T
+        month = np.array(month_rows, dtype=np.int64).reshape(-1, 5)
+        self.month_owner, self.month_first, self.month_day, self.month_until, self.month_weekday = month.T
+
+    def expand_between(self, start: date, end: date) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return every occurrence between `start` and `end` inclusive as two parallel arrays:
+        the index of the owning item and the date as datetime64[D]. Rows are ordered by
+        item, then date, matching the order of the per-item loop.
+        """
+        if end < start:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype="datetime64[D]")
+        s, e = _day(start), _day(end)
+        owners, days, weekdays = [], [], []
+
+        # Fixed-stride segments: k runs from ceil((s - anchor) / step) to floor((last - anchor) / step)
+        anchor, step = self.stride_anchor, self.stride_step
+        last = np.minimum(e, self.stride_until)
+        low = np.maximum(0, -((anchor - s) // step))
+        high = np.where(last >= anchor, (last - anchor) // step + 1, 0)
+        rows, k = _expand(np.maximum(high - low, 0), low)
+        owners.append(self.stride_owner[rows])
+        days.append(anchor[rows] + k * step[rows])
+        weekdays.append(self.stride_weekday[rows])
+
+        # Calendar-month segments: expand the months in range, then place the day in each
+        last = np.minimum(e, self.month_until)
+        last_month = last.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        start_month = np.datetime64(start, "M").astype(np.int64)
+        low = np.maximum(self.month_first, start_month)
+        rows, months = _expand(np.maximum(last_month - low + 1, 0), low)
+        month_start = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        month_length = (months + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - month_start
+        month_days = month_start + np.minimum(self.month_day[rows], month_length) - 1
+        in_range = (month_days >= s) & (month_days <= last[rows])
+        owners.append(self.month_owner[rows][in_range])
+        days.append(month_days[in_range])
+        weekdays.append(self.month_weekday[rows][in_range])
+
+        for owner in self.fallback:
+            item = self.items[owner]
+            dates = item.get_occurrences_between(start, end)
+            owners.append(np.full(len(dates), owner, dtype=np.int64))
+            days.append(np.array(dates, dtype="datetime64[D]").astype(np.int64))
+            weekdays.append(np.full(len(dates), -1, dtype=np.int64))
+
+        owners = np.concatenate(owners)
+        days = np.concatenate(days)
+        weekdays = np.concatenate(weekdays)
+
+        # 1970-01-01 was a Thursday (weekday 3)
+        keep = (weekdays < 0) | ((days + 3) % 7 == weekdays)
+        owners, days = owners[keep], days[keep]
+        order = np.lexsort((days, owners))
+        return owners[order], days[order].astype("datetime64[D]")
+
+    def split_between(self, start: date, end: date, today: date):
+        """
+        Array form of the weekly split: returns (owners, dates, before_today) where
+        `before_today` masks occurrences that fall before `today`.
+        """
+        owners, dates = self.expand_between(start, end)
+        return owners, dates, dates < np.datetime64(today, "D")
+
+    def total_cents(self, owners: np.ndarray) -> int:
+        """
+        Sum of the amounts of the given occurrences, as one int64 reduction.
+        """
+        return int(self.cents[owners].sum())
+
+    def _pairs(self, owners: np.ndarray, dates: np.ndarray) -> List[tuple]:
+        return [(self.items[owner], d) for owner, d in zip(owners.tolist(), dates.astype(object))]
+
+
+def get_bills_this_week_batch(bills: List[RecurringBill], today: date):
+    """
+    Batch version of weekly_snapshot.get_bills_this_week with the same (bills_due, overdue) result.
+    """
+    columns = ScheduleColumns(bills)
+    owners, dates, overdue = columns.split_between(*get_week_range(today), today)
+    return columns._pairs(owners[~overdue], dates[~overdue]), columns._pairs(owners[overdue], dates[overdue])
+
+
+def get_paychecks_this_week_batch(pay_periods: List[RecurringPayPeriod], today: date):
+    """
+    Batch version of weekly_snapshot.get_paychecks_this_week with the same (occurred, upcoming) result.
+    """
+    columns = ScheduleColumns(pay_periods)
+    owners, dates, occurred = columns.split_between(*get_week_range(today), today)
+    return columns._pairs(owners[occurred], dates[occurred]), columns._pairs(owners[~occurred], dates[~occurred])
+
+
+def calculate_balance_and_income_batch(paychecks: List[RecurringPayPeriod], bills: List[RecurringBill], today: date):
+    """
+    Batch version of weekly_snapshot.calculate_balance_and_income with the same result. Every
+    occurrence's amount is gathered from the int64 cents column and summed in one reduction.
+    """
+    start, end = get_week_range(today)
+    pay_columns = ScheduleColumns(paychecks)
+    owners, _, occurred = pay_columns.split_between(start, end, today)
+    income = pay_columns.total_cents(owners[occurred])  # Only pay that has already arrived counts as income
+    bill_columns = ScheduleColumns(bills)
+    spent = bill_columns.total_cents(bill_columns.expand_between(start, end)[0])
+    return from_cents(income), from_cents(spent), from_cents(income - spent)
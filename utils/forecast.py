@@ -0,0 +1,129 @@
+import csv
+from datetime import date, timedelta
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import days_in_month
+from utils.money import from_cents, to_cents
+from utils.weekly_snapshot import cash_flow_timeline, get_week_range
+
+FIELDS = ["period_start", "period_end", "income", "bills", "net", "balance"]
+
+
+class ForecastRow(NamedTuple):
+    period_start: date
+    period_end: date
+    income: float
+    bills: float
+    net: float
+    balance: float  # Running balance at the end of the period
+
+
+def get_month_range(today: date) -> Tuple[date, date]:
+    """
+    Returns the first and last day of the month for the given date.
+    """
+    return today.replace(day=1), today.replace(day=days_in_month(today.year, today.month))
+
+
+def _period_range(granularity: str):
+    if granularity == "week":
+        return get_week_range
+    if granularity == "month":
+        return get_month_range
+    raise ValueError(f"Unsupported granularity: {granularity}")
+
+
+def iter_periods(start: date, end: date, granularity: str = "week") -> Iterator[Tuple[date, date]]:
+    """
+    Yields consecutive (first day, last day) periods covering `start` through `end`.
+    Weeks run Monday to Sunday like get_week_range; months run from the 1st.
+    """
+    period_range = _period_range(granularity)
+    period_start, period_end = period_range(start)
+    while period_start <= end:
+        yield period_start, period_end
+        period_start, period_end = period_range(period_end + timedelta(days=1))
+
+
+def add_years(d: date, years: int) -> date:
+    try:
+        return d.replace(year=d.year + years)
+    except ValueError:
+        return d.replace(year=d.year + years, day=28)  # Feb 29 in a non-leap year
+
+
+def forecast(paychecks: List[RecurringPayPeriod], bills: List[RecurringBill], start: date, years: int = 5,
+             granularity: str = "week", opening_balance: float = 0.0) -> Iterator[ForecastRow]:
+    """
+    Lazily yields income, bills and the rolling balance for every week or month from `start`
+    for `years` years. Events come from the merged cash-flow timeline one at a time, so memory
+    stays constant however long the horizon is.
+    """
+    period_range = _period_range(granularity)
+    last_day = add_years(start, years)
+    events = cash_flow_timeline(paychecks, bills, period_range(start)[0], period_range(last_day)[1])
+    pending = next(events, None)
+    balance = to_cents(opening_balance)  # Summed in cents, converted to dollars per row
+
+    for period_start, period_end in iter_periods(start, last_day, granularity):
+        income = 0
+        spent = 0
+        while pending is not None and pending.date <= period_end:
+            if pending.kind == "pay":
+                income += pending.item.amount_cents
+            else:
+                spent += pending.item.amount_cents
+            pending = next(events, None)
+        balance += income - spent
+        yield ForecastRow(period_start, period_end, from_cents(income), from_cents(spent), from_cents(income - spent),
+                          from_cents(balance))
+
+
+def write_forecast_csv(rows: Iterable[ForecastRow], file_path: str) -> int:
+    """
+    Streams forecast rows to a CSV file without building the full list first.
+
+    :param rows: Forecast rows, usually the forecast() generator
+    :param file_path: Path to write the CSV file
+    :return: Number of rows written
+    """
+    count = 0
+    with open(file_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(FIELDS)
+        for row in rows:
+            writer.writerow([row.period_start.isoformat(), row.period_end.isoformat(),
+                             f"{row.income:.2f}", f"{row.bills:.2f}", f"{row.net:.2f}", f"{row.balance:.2f}"])
+            count += 1
+    return count
+
+
+def write_forecast_parquet(rows: Iterable[ForecastRow], file_path: str, batch_size: int = 4096) -> int:
+    """
+    Streams forecast rows to a Parquet file one row group per `batch_size` rows.
+    Requires pyarrow.
+
+    :param rows: Forecast rows, usually the forecast() generator
+    :param file_path: Path to write the Parquet file
+    :param batch_size: Rows held in memory per row group
+    :return: Number of rows written
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([("period_start", pa.date32()), ("period_end", pa.date32()), ("income", pa.float64()),
+                        ("bills", pa.float64()), ("net", pa.float64()), ("balance", pa.float64())])
+    count = 0
+    with pq.ParquetWriter(file_path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                writer.write_table(pa.Table.from_pylist([row._asdict() for row in batch], schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist([row._asdict() for row in batch], schema=schema))
+            count += len(batch)
+    return count
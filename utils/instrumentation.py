@@ -0,0 +1,204 @@
+"""
+Opt-in instrumentation for the storage, model and snapshot hot paths.
+
+Functions decorated with `@instrumented()` record call counts and cumulative/own time, and
+code can bump named counters (loop iterations, bytes read and written) with `count()`.
+Nothing is recorded until `enable()` is called. While disabled a decorated function is the
+plain function: `enable()` swaps timing wrappers into the modules and classes that define them
+and `disable()` swaps the originals back, and `count()` call sites are guarded by
+`if instrumentation.enabled`. A name bound with `from module import fn` before `enable()` keeps
+the plain function, so code that should be profiled after the fact calls through the module or
+imports lazily (as the CLI does).
+
+Results can be dumped as JSON or as a cProfile-compatible stats file that `pstats.Stats`,
+snakeviz and similar tools read. Setting BILLTRACKER_PROFILE=<path> enables recording at
+import and dumps to that path at exit (.json for JSON, anything else for pstats).
+
+Like utils.money, this module only imports the standard library, so models and storage can
+import it without an import cycle through utils.
+"""
+import atexit
+import json
+import marshal
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+enabled = False
+
+_lock = threading.Lock()
+_local = threading.local()
+_functions = {}  # pstats key (file, line, name) -> readable name
+_calls = {}  # pstats key -> [primitive calls, calls, own time, cumulative time]
+_callers = {}  # pstats key -> {caller key -> [primitive calls, calls, own time, cumulative time]}
+_counters = {}
+_registered = []  # (function, wrapper) for every decorated function
+
+
+def enable():
+    global enabled
+    enabled = True
+    for fn, wrapper in _registered:
+        _swap(fn, wrapper)
+
+
+def disable():
+    global enabled
+    enabled = False
+    for fn, wrapper in _registered:
+        _swap(wrapper, fn)
+
+
+def _swap(current, replacement):
+    # Finds the module or class attribute defined as `current` and points it at `replacement`
+    owner = sys.modules.get(current.__module__)
+    *path, attribute = current.__qualname__.split('.')
+    if owner is None or '<locals>' in path:
+        return
+    for part in path:
+        owner = owner.__dict__.get(part)
+        if owner is None:
+            return
+    value = owner.__dict__.get(attribute)
+    if value is current:
+        setattr(owner, attribute, replacement)
+    elif isinstance(value, (classmethod, staticmethod)) and value.__func__ is current:
+        setattr(owner, attribute, type(value)(replacement))
+
+
+def reset():
+    """
+    Drops everything recorded so far.
+    """
+    with _lock:
+        _calls.clear()
+        _callers.clear()
+        _counters.clear()
+
+
+@contextmanager
+def recording():
+    """
+    Enables recording for the duration of a with block, starting from a clean slate.
+    """
+    reset()
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def count(name: str, n: int = 1):
+    """
+    Adds n to a named counter, e.g. count("bytes_read", size).
+    Callers on hot paths should check `enabled` first.
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def instrumented(name: str = None):
+    """
+    Decorator recording calls to and time spent in a function while instrumentation is enabled.
+    Use it on module-level functions and methods, not on generators (only their creation would be
+    timed). The function is returned unchanged unless instrumentation is already enabled.
+    """
+
+    def decorate(fn):
+        code = fn.__code__
+        key = (code.co_filename, code.co_firstlineno, fn.__name__)
+        _functions[key] = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)  # A reference taken while enabled, kept after disable()
+            return _timed(key, fn, args, kwargs)
+
+        _registered.append((fn, wrapper))
+        return wrapper if enabled else fn
+
+    return decorate
+
+
+def _timed(key, fn, args, kwargs):
+    frames = getattr(_local, "frames", None)
+    if frames is None:
+        frames = _local.frames = []
+    caller = frames[-1][0] if frames else None
+    recursive = any(frame[0] == key for frame in frames)
+    frame = [key, 0.0]  # Function key, time spent in instrumented callees
+    frames.append(frame)
+    started = perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        elapsed = perf_counter() - started
+        frames.pop()
+        if frames:
+            frames[-1][1] += elapsed
+        _record(key, caller, elapsed, elapsed - frame[1], recursive)
+
+
+def _record(key, caller, elapsed, own, recursive):
+    with _lock:
+        targets = [_calls.setdefault(key, [0, 0, 0.0, 0.0])]
+        if caller is not None:
+            targets.append(_callers.setdefault(key, {}).setdefault(caller, [0, 0, 0.0, 0.0]))
+        for entry in targets:
+            entry[1] += 1
+            entry[2] += own
+            # Recursive calls are already inside the outer call's cumulative time
+            if not recursive:
+                entry[0] += 1
+                entry[3] += elapsed
+
+
+def snapshot() -> dict:
+    """
+    Returns everything recorded so far as plain JSON-serialisable data.
+    """
+    with _lock:
+        functions = {
+            _functions[key]: {"calls": calls, "cumulative": cumulative, "own": own}
+            for key, (_, calls, own, cumulative) in sorted(_calls.items(), key=lambda entry: -entry[1][3])
+        }
+        return {"functions": functions, "counters": dict(sorted(_counters.items()))}
+
+
+def dump_json(path: str):
+    with open(path, 'w') as output_file:
+        json.dump(snapshot(), output_file, indent=2)
+        output_file.write("\n")
+
+
+def dump_stats(path: str):
+    """
+    Writes the recorded calls in the marshal format cProfile uses, so `pstats.Stats(path)` can read it.
+    """
+    with _lock:
+        stats = {
+            key: (cc, nc, tt, ct, {caller: tuple(entry) for caller, entry in _callers.get(key, {}).items()})
+            for key, (cc, nc, tt, ct) in _calls.items()
+        }
+    with open(path, 'wb') as output_file:
+        marshal.dump(stats, output_file)
+
+
+def dump(path: str):
+    """
+    Dumps as JSON when the path ends in .json, otherwise as a pstats file.
+    """
+    if path.endswith('.json'):
+        dump_json(path)
+    else:
+        dump_stats(path)
+
+
+if os.environ.get("BILLTRACKER_PROFILE"):
+    enable()
+    atexit.register(dump, os.environ["BILLTRACKER_PROFILE"])
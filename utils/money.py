@@ -0,0 +1,39 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Union
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value: Union[int, float, str, Decimal]) -> int:
+    """
+    Converts a dollar amount to integer cents.
+
+    Floats are rounded to the nearest cent, which is exact for any amount written with two
+    decimals. Strings and Decimals (e.g. "1,234.56", "$60") are parsed exactly and rounded
+    half up.
+    """
+    if isinstance(value, bool):
+        raise TypeError("A bool is not an amount")
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, float):
+        return round(value * 100)
+    if isinstance(value, str):
+        value = Decimal(value.strip().replace(",", "").replace("$", "") or "0")
+    return int(value.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def from_cents(cents: int) -> float:
+    """
+    Converts cents back to a float dollar amount, for JSON and existing float APIs.
+    """
+    return cents / 100
+
+
+def format_cents(cents: int) -> str:
+    """
+    Formats cents exactly as "$x.yy" ("-$x.yy" when negative).
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}${dollars}.{remainder:02d}"
@@ -0,0 +1,172 @@
+from bisect import insort
+from collections import OrderedDict
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import days_in_month
+from models.repository import BILLS, PAY_PERIODS, RELOADED
+from utils.weekly_snapshot import active_between, iter_occurrences
+
+
+def shift_month(year: int, month: int, delta: int) -> Tuple[int, int]:
+    """
+    Returns the (year, month) `delta` months away, e.g. shift_month(2025, 1, -1) == (2024, 12).
+    """
+    index = year * 12 + month - 1 + delta
+    return index // 12, index % 12 + 1
+
+
+def _order_key(item):
+    # Items of a day are listed by what they are, so a patched cell and a rebuilt one agree
+    start = item.start_date.toordinal() if item.start_date else 0
+    return item.name, item.amount_cents, item.frequency, item.day_of_week, start
+
+
+class MonthGrid:
+    """
+    Every bill and paycheck date of one month, filed by day.
+
+    Each day holds the items due on it per collection, ordered by name, so a single item can
+    be placed or dropped without rebuilding the month.
+    """
+
+    def __init__(self, year: int, month: int):
+        self.year = year
+        self.month = month
+        self.days = days_in_month(year, month)
+        self.cells = {BILLS: [[] for _ in range(self.days)], PAY_PERIODS: [[] for _ in range(self.days)]}
+
+    @property
+    def first(self) -> date:
+        return date(self.year, self.month, 1)
+
+    @property
+    def last(self) -> date:
+        return date(self.year, self.month, self.days)
+
+    def place(self, collection: str, item):
+        """
+        Files every date `item` occurs on this month under its day.
+        """
+        for occ in iter_occurrences(item, self.first, self.last):
+            insort(self.cells[collection][occ.day - 1], item, key=_order_key)
+
+    def drop(self, collection: str, item):
+        """
+        Removes the entries of `item` (matched by identity).
+        """
+        for cell in self.cells[collection]:
+            if cell:
+                cell[:] = [other for other in cell if other is not item]
+
+    def day(self, day: int) -> Tuple[List[RecurringPayPeriod], List[RecurringBill]]:
+        """
+        Returns the paychecks and bills on a day of the month (1-based).
+        """
+        return list(self.cells[PAY_PERIODS][day - 1]), list(self.cells[BILLS][day - 1])
+
+    def totals(self) -> Tuple[int, int]:
+        """
+        Returns the month's (income, bills) in cents.
+        """
+        return tuple(sum(item.amount_cents for cell in self.cells[collection] for item in cell)
+                     for collection in (PAY_PERIODS, BILLS))
+
+
+def build_month_grid(paychecks: Iterable[RecurringPayPeriod], bills: Iterable[RecurringBill], year: int,
+                     month: int) -> MonthGrid:
+    """
+    Builds the grid of one month in a single pass over the items. Each item's rule jumps
+    straight to its first date in the month, so no item's earlier history is walked.
+
+    :param paychecks: Pay periods, or an IntervalIndex of them
+    :param bills: Bills, or an IntervalIndex of them
+    :param year: Year of the month
+    :param month: Month number (1-12)
+    :return: MonthGrid
+    """
+    grid = MonthGrid(year, month)
+    for collection, items in ((PAY_PERIODS, paychecks), (BILLS, bills)):
+        cells = grid.cells[collection]
+        for item in active_between(items, grid.first, grid.last):
+            for occ in iter_occurrences(item, grid.first, grid.last):
+                cells[occ.day - 1].append(item)
+        for cell in cells:
+            if len(cell) > 1:
+                cell.sort(key=_order_key)
+    return grid
+
+
+class MonthGridCache:
+    """
+    LRU cache of MonthGrids for a Repository, patched from its change events.
+
+    An added, edited or removed item is placed into or dropped from the cached months
+    directly, so paging back to a month after an edit doesn't rebuild it. A reload clears the
+    cache. Grids are built from the repository's interval indexes, so a month only looks at
+    the items active in it. Grids built in the background from a snapshot are only stored if
+    no change arrived in the meantime (see `snapshot` and `put`).
+
+    All methods are meant to be called on one thread (the Tk thread); only `build_month_grid`
+    itself runs in the background.
+    """
+
+    def __init__(self, repository, maxsize: int = 12):
+        self.repository = repository
+        self.maxsize = maxsize
+        self.generation = 0  # Bumped by every change, to spot grids built from an older snapshot
+        self._grids = OrderedDict()
+        self.unsubscribe = repository.subscribe(self.on_change)
+
+    def __contains__(self, key: Tuple[int, int]) -> bool:
+        return key in self._grids
+
+    def get(self, year: int, month: int) -> Optional[MonthGrid]:
+        grid = self._grids.get((year, month))
+        if grid is not None:
+            self._grids.move_to_end((year, month))
+        return grid
+
+    def put(self, grid: MonthGrid, generation: Optional[int] = None) -> bool:
+        """
+        Stores a grid, unless it was built from a snapshot taken before the latest change.
+        Returns whether it was stored.
+        """
+        if generation is not None and generation != self.generation:
+            return False
+        self._grids[(grid.year, grid.month)] = grid
+        self._grids.move_to_end((grid.year, grid.month))
+        while len(self._grids) > self.maxsize:
+            self._grids.popitem(last=False)
+        return True
+
+    def snapshot(self, year: int, month: int):
+        """
+        Returns (paychecks, bills, generation): the items active in the month, to build its
+        grid from off the Tk thread, and the generation to hand back to `put`.
+        """
+        first, last = date(year, month, 1), date(year, month, days_in_month(year, month))
+        return (self.repository.index(PAY_PERIODS).overlapping(first, last),
+                self.repository.index(BILLS).overlapping(first, last), self.generation)
+
+    def month(self, year: int, month: int) -> MonthGrid:
+        """
+        Returns the month's grid, building and caching it first if needed.
+        """
+        grid = self.get(year, month)
+        if grid is None:
+            grid = build_month_grid(self.repository.index(PAY_PERIODS), self.repository.index(BILLS), year, month)
+            self.put(grid)
+        return grid
+
+    def on_change(self, event):
+        self.generation += 1
+        if event.kind == RELOADED:
+            self._grids.clear()
+            return
+        for grid in self._grids.values():
+            if event.previous is not None:
+                grid.drop(event.collection, event.previous)
+            if event.item is not None:
+                grid.place(event.collection, event.item)
@@ -0,0 +1,56 @@
+import random
+from datetime import date, timedelta
+
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from utils.allocation import allocate
+
+JOB = RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10))
+RENT = RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1))
+GYM = RecurringBill("Gym", 15.0, "weekly", "Friday", date(2025, 1, 3))
+
+
+def test_bills_go_to_latest_paycheck_on_or_before_them():
+    report = allocate([JOB], [RENT, GYM], date(2025, 5, 1), date(2025, 5, 31))
+
+    assert report.unfunded == []
+    # April 18th's paycheck, found through the lookback, funds May 1st's rent
+    first = report.allocations[0]
+    assert first.date == date(2025, 4, 18)
+    assert first.bills == [(RENT, date(2025, 5, 1))]
+    assert first.committed == 900 and first.free == 100
+    # Gym on pay day is funded by that day's paycheck
+    assert [a.date for a in report.allocations] == [date(2025, 4, 18), date(2025, 5, 2), date(2025, 5, 16),
+                                                    date(2025, 5, 30)]
+    assert report.allocations[1].bills == [(GYM, date(2025, 5, 2)), (GYM, date(2025, 5, 9))]
+    assert report.allocations[1].committed == 30 and report.allocations[1].free == 970
+
+
+def test_bills_before_any_paycheck_are_unfunded():
+    report = allocate([JOB], [RENT], date(2024, 12, 1), date(2025, 1, 31), lookback_days=0)
+    assert report.unfunded == [(RENT, date(2024, 12, 1)), (RENT, date(2025, 1, 1))]
+    assert [(a.date, a.bills) for a in report.allocations] == [(date(2025, 1, 10), []), (date(2025, 1, 24), [])]
+
+
+def test_matches_nested_rescan():
+    rng = random.Random(7)
+    pays = [RecurringPayPeriod(f"Pay {i}", 500.0 + i, rng.choice(["weekly", "biweekly", "monthly", "semimonthly"]),
+                               "Friday", date(2024, 1, 1) + timedelta(days=rng.randrange(60))) for i in range(3)]
+    bills = [RecurringBill(f"Bill {i}", 10.0 + i, rng.choice(["weekly", "biweekly", "monthly"]),
+                           rng.choice(["Monday", "Friday", "5", "20"]), date(2024, 1, 1) + timedelta(days=rng.randrange(300)))
+             for i in range(25)]
+    start, end = date(2024, 3, 1), date(2026, 3, 1)
+    report = allocate(pays, bills, start, end)
+
+    pay_dates = sorted((d, i) for i, pay in enumerate(pays)
+                       for d in pay.get_occurrences_between(start - timedelta(days=31), end))
+    expected = {}
+    for bill in bills:
+        for d in bill.get_occurrences_between(start, end):
+            funding = [entry for entry in pay_dates if entry[0] <= d]
+            expected.setdefault(funding[-1][0] if funding else None, []).append((bill.name, d))
+
+    actual = {a.date: sorted((bill.name, d) for bill, d in a.bills) for a in report.allocations if a.bills}
+    if report.unfunded:
+        actual[None] = sorted((bill.name, d) for bill, d in report.unfunded)
+    assert actual == {k: sorted(v) for k, v in expected.items()}
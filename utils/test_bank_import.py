@@ -0,0 +1,69 @@
+import sqlite3
+from contextlib import closing
+from datetime import date
+
+from models.bill import RecurringBill
+from storage.ledger import PAID, PaymentLedger
+from utils.bank_import import (Transaction, iter_csv_transactions, iter_ofx_transactions, match_transactions,
+                               parse_cents)
+
+RENT = RecurringBill("Rent", 900.0, "monthly", "1", date(2025, 1, 1))
+PHONE = RecurringBill("Phone", 60.0, "monthly", "18", date(2025, 1, 18))
+GYM = RecurringBill("Gym", 15.0, "weekly", "Monday", date(2025, 1, 6))
+
+
+def test_parse_cents():
+    assert parse_cents("$1,234.56") == 123456
+    assert parse_cents("(60.00)") == -6000
+    assert parse_cents("-15") == -1500
+    assert parse_cents("0.29") == 29  # float("0.29") * 100 is 28.999...
+
+
+def test_csv_with_signed_amounts_and_debit_columns(tmp_path):
+    signed = tmp_path / "signed.csv"
+    signed.write_text("Date,Description,Amount\n05/01/2025,LANDLORD,-900.00\n05/02/2025,PAYROLL,\"1,500.00\"\n")
+    assert list(iter_csv_transactions(str(signed))) == [
+        Transaction(date(2025, 5, 1), -90000, "LANDLORD"), Transaction(date(2025, 5, 2), 150000, "PAYROLL")]
+
+    split = tmp_path / "split.csv"
+    split.write_text("Posted Date,Payee,Debit,Credit\n2025-05-19,PHONE CO,60.00,\n2025-05-20,REFUND,,5.00\n")
+    assert list(iter_csv_transactions(str(split))) == [
+        Transaction(date(2025, 5, 19), -6000, "PHONE CO"), Transaction(date(2025, 5, 20), 500, "REFUND")]
+
+
+def test_ofx_sgml_is_streamed_across_chunks(tmp_path):
+    ofx = tmp_path / "statement.ofx"
+    ofx.write_text("OFXHEADER:100\n<OFX><BANKTRANLIST>"
+                   "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250501120000[-5:EST]<TRNAMT>-900.00<NAME>LANDLORD\n"
+                   "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250519<TRNAMT>-60.00<NAME>PHONE CO</STMTTRN>\n"
+                   "</BANKTRANLIST></OFX>\n")
+    expected = [Transaction(date(2025, 5, 1), -90000, "LANDLORD"), Transaction(date(2025, 5, 19), -6000, "PHONE CO")]
+    assert list(iter_ofx_transactions(str(ofx))) == expected
+    assert list(iter_ofx_transactions(str(ofx), chunk_size=7)) == expected
+
+
+def test_matches_within_window_and_marks_paid(tmp_path):
+    ledger = PaymentLedger(str(tmp_path / "ledger.db"))
+    transactions = [
+        Transaction(date(2025, 4, 30), -90000, "LANDLORD"),  # A day early for May 1st
+        Transaction(date(2025, 5, 5), -1500, "GYM"),
+        Transaction(date(2025, 5, 6), 150000, "PAYROLL"),
+        Transaction(date(2025, 5, 12), -1500, "GYM"),
+        Transaction(date(2025, 5, 12), -1500, "GYM DUPLICATE"),  # The 12th is already taken, the 19th is too far
+        Transaction(date(2025, 5, 23), -6000, "PHONE CO"),  # Five days after the 18th, outside the window
+    ]
+    report = match_transactions([RENT, PHONE, GYM], transactions, ledger, window_days=3)
+
+    assert [(bill.name, d) for _, bill, d in report.matched] == [
+        ("Rent", date(2025, 5, 1)), ("Gym", date(2025, 5, 5)), ("Gym", date(2025, 5, 12))]
+    assert [t.description for t in report.unmatched] == ["GYM DUPLICATE", "PHONE CO"]
+    assert [(bill.name, d) for bill, d in report.missing] == [("Phone", date(2025, 5, 18)), ("Gym", date(2025, 5, 19))]
+    assert report.credits == 1
+    assert ledger.history(GYM) == {date(2025, 5, 5): PAID, date(2025, 5, 12): PAID}
+    with closing(sqlite3.connect(str(tmp_path / "ledger.db"))) as connection:
+        assert connection.execute("SELECT DISTINCT typeof(amount_cents), amount_cents FROM payments "
+                                  "WHERE occurrence = '2025-05-01'").fetchall() == [("integer", 90000)]
+
+    # Importing the same statement again doesn't pay the same occurrences twice
+    again = match_transactions([RENT, PHONE, GYM], transactions, ledger, window_days=3)
+    assert again.matched == []
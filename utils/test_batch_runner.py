@@ -0,0 +1,32 @@
+import os
+from datetime import date
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from storage.data_manager import save_bills, save_pay_periods
+from utils.batch_runner import aggregate, run_batch
+
+
+def test_batch_report_across_tenants(tmp_path):
+    for i in range(5):
+        tenant = tmp_path / "households" / f"tenant{i}"
+        save_bills([RecurringBill("Gym", 10.0 * (i + 1), "weekly", "Tuesday", date(2025, 1, 7))],
+                   str(tenant / "bills.json"))
+        save_pay_periods([RecurringPayPeriod("Job", 1000.0, "weekly", "Monday", date(2025, 1, 6))],
+                         str(tenant / "pay_periods.json"))
+    broken = tmp_path / "households" / "broken"
+    os.makedirs(broken)
+    (broken / "bills.json").write_text('[{"name": "x"}]')
+
+    report = run_batch(str(tmp_path), date(2025, 5, 8), workers=2, forecast_years=1)
+    assert report["tenant_count"] == 6
+    assert [error["tenant"] for error in report["errors"]] == [os.path.join("households", "broken")]
+    assert report["totals"]["total_bills"] == 150.0
+    assert report["totals"]["total_income"] == 5000.0
+    assert all(result["forecast"]["years"] == 1 for result in report["tenants"])
+
+
+def test_money_totals_are_summed_in_cents():
+    results = [{"tenant": str(i), "bills": 1, "pay_periods": 0, "overdue": 0, "total_income": 0.0,
+                "total_bills": 0.1, "disposable_income": -0.1} for i in range(3)]
+    totals = aggregate(results, date(2025, 5, 8))["totals"]
+    assert totals["total_bills"] == 0.3 and totals["disposable_income"] == -0.3  # Float sums give 0.30000000000000004
@@ -0,0 +1,51 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.recurrence import WEEKDAYS
+from utils.weekly_snapshot import calculate_balance_and_income, get_bills_this_week, get_paychecks_this_week
+
+pytest.importorskip("numpy")
+from utils.batch_schedule import (calculate_balance_and_income_batch, get_bills_this_week_batch,  # noqa: E402
+                                  get_paychecks_this_week_batch)
+
+FREQUENCIES = ["weekly", "biweekly", "monthly", "semimonthly", "every 9 days"]
+
+
+def random_items(rng, count):
+    bills, pays = [], []
+    for i in range(count):
+        start_date = date(1995, 1, 1) + timedelta(days=rng.randrange(365 * 30))
+        frequency = rng.choice(FREQUENCIES)
+        day = rng.choice(WEEKDAYS)
+        if frequency == "monthly" and rng.random() < 0.3:
+            day = str(rng.randrange(1, 32))
+        elif frequency in ("weekly", "biweekly") and rng.random() < 0.5:
+            day = WEEKDAYS[start_date.weekday()]
+        end_date = start_date + timedelta(days=rng.randrange(0, 365 * 20)) if rng.random() < 0.4 else None
+        bills.append(RecurringBill(f"Bill {i}", 10.0, frequency, day, start_date, end_date))
+        pays.append(RecurringPayPeriod(f"Pay {i}", 100.0, rng.choice(FREQUENCIES + ["once"]),
+                                       rng.choice(WEEKDAYS), start_date))
+    return bills, pays
+
+
+def test_batch_matches_per_item_loop():
+    rng = random.Random(7)
+    bills, pays = random_items(rng, 600)
+    for _ in range(40):
+        today = date(1995, 1, 1) + timedelta(days=rng.randrange(365 * 50))
+        assert get_bills_this_week_batch(bills, today) == get_bills_this_week(bills, today)
+        assert get_paychecks_this_week_batch(pays, today) == get_paychecks_this_week(pays, today)
+
+
+def test_batch_totals_match_and_are_exact_cents():
+    rng = random.Random(11)
+    bills, pays = random_items(rng, 300)
+    for index, bill in enumerate(bills):
+        bill.amount = 0.1 + index * 0.01  # Amounts that don't add up exactly as floats
+    for _ in range(20):
+        today = date(1995, 1, 1) + timedelta(days=rng.randrange(365 * 50))
+        assert calculate_balance_and_income_batch(pays, bills, today) == calculate_balance_and_income(pays, bills, today)
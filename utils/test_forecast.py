@@ -0,0 +1,36 @@
+import csv
+import itertools
+from datetime import date
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from utils.forecast import forecast, write_forecast_csv
+from utils.weekly_snapshot import cash_flow_timeline
+
+BILLS = [
+    RecurringBill("Rent", 900.0, "monthly", "1", date(2020, 1, 1)),
+    RecurringBill("Gym", 15.0, "weekly", "Tuesday", date(2025, 1, 7), end_date=date(2026, 1, 1)),
+]
+PAYS = [RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10))]
+
+
+def test_monthly_forecast_totals_match_timeline():
+    rows = list(forecast(PAYS, BILLS, date(2025, 3, 14), years=2, granularity="month", opening_balance=50.0))
+    assert rows[0].period_start == date(2025, 3, 1)
+    assert rows[-1].period_end == date(2027, 3, 31)
+    assert len(rows) == 25
+
+    events = list(cash_flow_timeline(PAYS, BILLS, date(2025, 3, 1), date(2027, 3, 31), opening_balance=50.0))
+    assert rows[-1].balance == events[-1].balance
+    march = [e for e in events if e.date.month == 3 and e.date.year == 2025]
+    assert rows[0].bills == sum(e.amount for e in march if e.kind == "bill")
+
+
+def test_forecast_is_lazy_and_streams_to_csv(tmp_path):
+    # A 30-year weekly horizon is only evaluated as far as it is consumed
+    first_weeks = list(itertools.islice(forecast(PAYS, BILLS, date(2025, 5, 7), years=30), 3))
+    assert [row.period_start for row in first_weeks] == [date(2025, 5, 5), date(2025, 5, 12), date(2025, 5, 19)]
+
+    path = tmp_path / "forecast.csv"
+    count = write_forecast_csv(forecast(PAYS, BILLS, date(2025, 5, 7), years=1), str(path))
+    with open(path) as csv_file:
+        assert len(list(csv.reader(csv_file))) == count + 1
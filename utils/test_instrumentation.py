@@ -0,0 +1,78 @@
+import json
+import os
+import pstats
+import subprocess
+import sys
+from datetime import date
+
+from models.bill import RecurringBill
+from storage import data_manager
+from utils import instrumentation, weekly_snapshot
+
+BILLS = [
+    RecurringBill("Rent", 900.0, "monthly", "Monday", date(2024, 1, 1)),
+    RecurringBill("Gym", 15.0, "weekly", "Monday", date(2024, 1, 1), date(2026, 1, 1)),
+]
+
+
+def test_nothing_is_recorded_while_disabled(tmp_path):
+    instrumentation.reset()
+    data_manager.save_bills(BILLS, str(tmp_path / "bills.json"))
+    assert instrumentation.snapshot() == {"functions": {}, "counters": {}}
+
+
+def test_records_calls_bytes_and_steps(tmp_path):
+    path = str(tmp_path / "bills.json")
+    with instrumentation.recording():
+        data_manager.save_bills(BILLS, path)
+        bills = data_manager.load_bills(path)
+        weekly_snapshot.calculate_balance_and_income([], bills, date(2025, 5, 7))
+        for bill in bills:
+            bill.get_occurrences_between(date(2025, 1, 1), date(2025, 12, 31))
+    assert not instrumentation.enabled
+
+    stats = instrumentation.snapshot()
+    functions = stats["functions"]
+    assert functions["models.bill.RecurringBill.from_dict"]["calls"] == 2
+    assert functions["storage.data_manager._read_json"]["calls"] == 1
+    load = functions["storage.data_manager.load_bills"]
+    assert load["cumulative"] >= load["own"] >= 0
+    assert stats["counters"]["bytes_written"] == stats["counters"]["bytes_read"] == os.path.getsize(path)
+    assert stats["counters"]["recurrence_steps"] >= 12 + 52
+
+
+def test_dumps_json_and_pstats(tmp_path):
+    with instrumentation.recording():
+        data_manager.load_bills(str(tmp_path / "missing.json"))
+        data_manager.save_bills(BILLS, str(tmp_path / "bills.json"))
+
+    instrumentation.dump(str(tmp_path / "profile.json"))
+    with open(tmp_path / "profile.json") as profile_file:
+        assert "storage.data_manager.save_bills" in json.load(profile_file)["functions"]
+
+    instrumentation.dump(str(tmp_path / "profile.prof"))
+    stats = pstats.Stats(str(tmp_path / "profile.prof"))
+    names = {name for _, _, name in stats.stats}
+    assert {"save_bills", "to_dict", "load_bills"} <= names
+    # to_dict is called from save_bills, so the caller edge is recorded
+    to_dict = next(entry for key, entry in stats.stats.items() if key[2] == "to_dict")
+    assert {key[2] for key in to_dict[4]} == {"save_bills"}
+
+
+def test_functions_are_plain_while_disabled():
+    assert not instrumentation.enabled
+    assert not hasattr(data_manager.load_bills, "__wrapped__")
+    assert not hasattr(RecurringBill.__dict__["from_dict"].__func__, "__wrapped__")
+    with instrumentation.recording():
+        assert data_manager.load_bills.__wrapped__
+        assert RecurringBill.from_dict.__wrapped__
+    assert not hasattr(data_manager.load_bills, "__wrapped__")
+
+
+def test_instrumentation_imports_nothing_from_the_app():
+    # models, storage and utils all import it, so it must not import any of them back
+    code = "import sys, utils.instrumentation; print(sorted(m for m in sys.modules if m.split('.')[0] in " \
+           "('models', 'storage', 'utils', 'billtracker')))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.strip() == "['utils', 'utils.instrumentation']"
@@ -0,0 +1,41 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from utils.money import format_cents, from_cents, to_cents
+from utils.weekly_snapshot import weekly_summary
+
+
+def test_to_cents_and_format_cents():
+    assert to_cents(19.99) == 1999
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(12) == 1200
+    assert to_cents("$1,234.565") == 123457
+    assert to_cents(Decimal("2.005")) == 201
+    assert from_cents(1999) == 19.99
+    assert format_cents(1999) == "$19.99"
+    assert format_cents(5) == "$0.05"
+    assert format_cents(-123456) == "-$1234.56"
+    with pytest.raises(TypeError):
+        to_cents(True)
+
+
+def test_models_store_cents_and_keep_json_format():
+    bill = RecurringBill.from_dict({"name": "Phone", "amount": 60.1, "frequency": "monthly", "day_of_week": "5",
+                                    "start_date": "2025-01-05", "end_date": None})
+    assert bill.amount_cents == 6010 and bill.amount == 60.1
+    assert bill.to_dict()["amount"] == 60.1
+
+    bill.amount = 0.29
+    assert bill.amount_cents == 29
+    pay = RecurringPayPeriod("Job", 1000, "weekly", "Friday", date(2025, 1, 3))
+    assert pay.to_dict()["amount"] == 1000.0 and pay.amount_cents == 100000
+
+
+def test_weekly_totals_do_not_drift():
+    bills = [RecurringBill(f"Bill {i}", 0.1, "weekly", "Monday", date(2025, 1, 6)) for i in range(30)]
+    summary = weekly_summary([], bills, date(2025, 5, 7))
+    assert summary.total_bills == 3.0  # Thirty float 0.1s would sum to 3.0000000000000013
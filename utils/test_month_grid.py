@@ -0,0 +1,65 @@
+import random
+from datetime import date
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.repository import BILLS, PAY_PERIODS, Repository
+from utils.month_grid import MonthGridCache, build_month_grid, shift_month
+
+PAYS = [RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10))]
+
+
+def cells(grid):
+    return {collection: [[item.fingerprint() for item in cell] for cell in days]
+            for collection, days in grid.cells.items()}
+
+
+def test_grid_matches_occurrence_queries():
+    bills = [RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)),
+             RecurringBill("Gym", 15.0, "weekly", "Tuesday", date(2025, 1, 7), date(2025, 5, 20))]
+    grid = build_month_grid(PAYS, bills, 2025, 5)
+
+    for day in range(1, grid.days + 1):
+        d = date(2025, 5, day)
+        paychecks, due = grid.day(day)
+        assert paychecks == [pay for pay in PAYS if d in pay.get_occurrences_between(d, d)]
+        assert due == [bill for bill in bills if d in bill.get_occurrences_between(d, d)]
+    assert grid.totals() == (3 * 100000, 90000 + 3 * 1500)  # Paid May 2, 16 and 30
+    assert shift_month(2025, 1, -1) == (2024, 12) and shift_month(2025, 12, 1) == (2026, 1)
+
+
+def test_cache_is_patched_by_repository_edits():
+    rng = random.Random(3)
+    repository = Repository(pay_periods=PAYS)
+    cache = MonthGridCache(repository)
+    months = [(2025, 4), (2025, 5), (2025, 6)]
+    for year, month in months:
+        cache.month(year, month)
+
+    for step in range(40):
+        bill = RecurringBill(f"Bill {step}", rng.randint(1, 300), rng.choice(["weekly", "biweekly", "monthly"]),
+                             rng.choice(["Monday", "Friday"]), date(2025, rng.randint(1, 6), rng.randint(1, 28)))
+        action = rng.random()
+        if action < 0.5 or not repository.bills:
+            repository.add(BILLS, bill)
+        elif action < 0.8:
+            repository.update(BILLS, rng.randrange(len(repository.bills)), bill)
+        else:
+            repository.remove(BILLS, rng.randrange(len(repository.bills)))
+        for year, month in months:
+            assert cells(cache.get(year, month)) == cells(build_month_grid(PAYS, repository.bills, year, month))
+
+
+def test_stale_background_grid_is_not_stored():
+    repository = Repository(pay_periods=PAYS)
+    cache = MonthGridCache(repository, maxsize=2)
+    paychecks, bills, generation = cache.snapshot(2025, 5)
+    repository.add(BILLS, RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)))
+    assert not cache.put(build_month_grid(paychecks, bills, 2025, 5), generation)
+    assert (2025, 5) not in cache
+
+    for month in (5, 6, 7):
+        cache.month(2025, month)
+    assert (2025, 5) not in cache and (2025, 7) in cache
+
+    repository.replace_all(PAY_PERIODS, [])
+    assert (2025, 7) not in cache
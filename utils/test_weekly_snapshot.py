@@ -0,0 +1,88 @@
+import random
+from datetime import date
+from models.bill import RecurringBill
+from models.pay_period import RecurringPayPeriod
+from models.repository import BILLS as BILL_ITEMS, PAY_PERIODS, Repository
+from storage.ledger import PAID, SKIPPED, UNPAID, PaymentLedger
+from utils.weekly_snapshot import (LiveWeeklySummary, cash_flow_timeline, get_bills_this_week,
+                                   get_paychecks_this_week, weekly_summary)
+
+BILLS = [
+    RecurringBill("Phone Bill", 60.0, "monthly", "Wednesday", date(2024, 1, 15)),
+    RecurringBill("Internet", 80.0, "monthly", "Friday", date(2025, 1, 3)),
+    RecurringBill("Gym", 15.0, "weekly", "Tuesday", date(2025, 1, 7)),
+    RecurringBill("Rent", 900.0, "monthly", "1", date(2024, 6, 1)),
+]
+
+PAYS = [
+    RecurringPayPeriod("Job", 1000.0, "biweekly", "Friday", date(2025, 1, 10)),
+    RecurringPayPeriod("Side Gig", 500.0, "monthly", "Monday", date(2025, 1, 6)),
+]
+
+
+def test_weekly_summary_matches_separate_queries():
+    for today in (date(2025, 4, 30), date(2025, 5, 2), date(2025, 5, 9), date(2025, 6, 4)):
+        summary = weekly_summary(PAYS, BILLS, today)
+        due, overdue = get_bills_this_week(BILLS, today)
+        occurred, upcoming = get_paychecks_this_week(PAYS, today)
+
+        assert sorted(summary.bills_due, key=lambda e: e[1]) == sorted(due, key=lambda e: e[1])
+        assert sorted(summary.overdue, key=lambda e: e[1]) == sorted(overdue, key=lambda e: e[1])
+        assert summary.pay_occurred == sorted(occurred, key=lambda e: e[1])
+        assert summary.pay_upcoming == sorted(upcoming, key=lambda e: e[1])
+        assert summary.total_income == sum(pay.amount for pay, _ in occurred)
+        assert summary.total_bills == sum(bill.amount for bill, _ in due + overdue)
+
+
+def test_timeline_is_date_ordered_with_running_balance():
+    events = list(cash_flow_timeline(PAYS, BILLS, date(2025, 1, 1), date(2025, 12, 31), opening_balance=100.0))
+    assert [e.date for e in events] == sorted(e.date for e in events)
+
+    balance = 100.0
+    for event in events:
+        balance += event.amount if event.kind == "pay" else -event.amount
+        assert event.balance == balance
+
+
+def test_live_summary_follows_repository_edits():
+    rng = random.Random(7)
+    today = date(2025, 5, 7)
+    repository = Repository()
+    live = LiveWeeklySummary(repository, today)
+    repository.replace_all(PAY_PERIODS, PAYS)
+    repository.replace_all(BILL_ITEMS, BILLS)
+    assert live.summary() == weekly_summary(PAYS, BILLS, today)
+
+    for step in range(40):
+        bill = RecurringBill(f"Bill {step}", rng.randint(1, 500) + 0.25, rng.choice(["weekly", "biweekly", "monthly"]),
+                             rng.choice(["Monday", "Friday"]), date(2025, rng.randint(1, 5), 1))
+        action = rng.random()
+        if action < 0.5 or not repository.bills:
+            repository.add(BILL_ITEMS, bill)
+        elif action < 0.8:
+            repository.update(BILL_ITEMS, rng.randrange(len(repository.bills)), bill)
+        else:
+            repository.remove(BILL_ITEMS, rng.randrange(len(repository.bills)))
+        assert live.summary() == weekly_summary(PAYS, repository.bills, today)
+
+    # Moving into the next week rebuilds from the repository
+    live.set_today(date(2025, 5, 14))
+    assert live.summary() == weekly_summary(PAYS, repository.bills, date(2025, 5, 14))
+
+
+def test_summaries_settle_bills_from_the_ledger(tmp_path):
+    ledger = PaymentLedger(str(tmp_path / "ledger.db"))
+    phone, internet, gym, rent = BILLS
+    today = date(2025, 5, 9)  # Gym was due Tuesday the 6th, Internet was due Friday the 2nd
+    ledger.record_many([(gym, date(2025, 5, 6), PAID, None), (internet, date(2025, 5, 2), UNPAID, None),
+                        (phone, date(2025, 5, 7), SKIPPED, None)])
+
+    summary = weekly_summary(PAYS, BILLS, today, ledger)
+    due, overdue = get_bills_this_week(BILLS, today, ledger)
+    assert summary.overdue == overdue == [(internet, date(2025, 5, 2))]
+    assert summary.bills_due == due
+    assert summary.total_bills == internet.amount + sum(bill.amount for bill, _ in due)
+
+    repository = Repository(BILLS, PAYS)
+    assert LiveWeeklySummary(repository, today, ledger).summary() == summary
+    assert LiveWeeklySummary(repository, today).summary() == weekly_summary(PAYS, BILLS, today)
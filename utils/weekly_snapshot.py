@@ -1,7 +1,14 @@
+import heapq
+import threading
 from datetime import date, timedelta
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
 from models.bill import RecurringBill
+from models.occurrence_cache import occurrence_cache
 from models.pay_period import RecurringPayPeriod
+from models.repository import ADDED, BILLS, PAY_PERIODS, RELOADED, REMOVED, UPDATED
+from storage.ledger import PAID, SKIPPED, UNPAID
+from utils import instrumentation
+from utils.money import from_cents, to_cents
 
 
 # Function to get the start and end of the week
@@ -13,19 +20,52 @@ def get_week_range(today: date) -> Tuple[date, date]:
     end_of_week = start_of_week + timedelta(days=6)  # End of the week (Sunday)
     return start_of_week, end_of_week
 
+def active_between(items, start: date, end: date):
+    """
+    Narrows bills or pay periods down to those that can occur between `start` and `end`.
+    An IntervalIndex answers this from its index; a plain list is returned as is.
+    """
+    overlapping = getattr(items, "overlapping", None)
+    return overlapping(start, end) if overlapping else items
+
+def _ledger_view(ledger, bills: Iterable[RecurringBill], start: date, today: date):
+    """
+    Returns (settled, carried) for the week starting at `start`: the (bill key, occurrence)
+    pairs recorded as paid or skipped up to today, and the (bill, occurrence) pairs recorded
+    as unpaid in earlier weeks. Without a ledger both are empty.
+    """
+    if ledger is None:
+        return (), []
+    settled = ledger.settled_between(start, today)
+    carried = []
+    unpaid = ledger.unpaid_before(start)
+    if unpaid:
+        by_key = {}
+        for bill in bills:
+            by_key.setdefault(ledger.key_for(bill), []).append(bill)
+        carried = [(bill, occ) for key, occ in unpaid for bill in by_key.get(key, ())]
+    return settled, carried
+
 # Function to get bills due and overdue this week
-def get_bills_this_week(bills: List[RecurringBill], today: date):
+@instrumentation.instrumented()
+def get_bills_this_week(bills: List[RecurringBill], today: date, ledger=None):
     """
     Returns all bills scheduled this week, and a list of bills that are overdue.
+
+    With a PaymentLedger, occurrences recorded as paid or skipped are no longer overdue, and
+    occurrences from earlier weeks that were recorded as unpaid are carried into the overdue
+    list. Both come from one indexed ledger query each, then a set lookup per occurrence.
     """
     start, end = get_week_range(today)
     bills_due = []
-    overdue = []
+    settled, overdue = _ledger_view(ledger, bills, start, today)
 
-    for bill in bills:
-        occurrences = bill.get_occurrences_between(start, end)
+    for bill in active_between(bills, start, end):
+        occurrences = occurrence_cache.occurrences(bill, start, end)
         for occ in occurrences:
             if occ < today:
+                if settled and (ledger.key_for(bill), occ) in settled:
+                    continue  # Already paid or skipped
                 overdue.append((bill, occ))  # If bill due date is before today, it is overdue
             else:
                 bills_due.append((bill, occ))  # If bill due date is after today, it is due this week
@@ -33,6 +73,7 @@ def get_bills_this_week(bills: List[RecurringBill], today: date):
     return bills_due, overdue
 
 # Function to get paychecks due this week
+@instrumentation.instrumented()
 def get_paychecks_this_week(pay_periods: List[RecurringPayPeriod], today: date):
     """
     Returns all paychecks this week and flags if they are past or upcoming.
@@ -41,8 +82,8 @@ def get_paychecks_this_week(pay_periods: List[RecurringPayPeriod], today: date):
     occurred = []
     upcoming = []
 
-    for period in pay_periods:
-        pay_dates = period.get_occurrences_between(start, end)
+    for period in active_between(pay_periods, start, end):
+        pay_dates = occurrence_cache.occurrences(period, start, end)
         for pd in pay_dates:
             if pd < today:
                 occurred.append((period, pd))  # Paycheck that has already occurred
@@ -51,43 +92,229 @@ def get_paychecks_this_week(pay_periods: List[RecurringPayPeriod], today: date):
 
     return occurred, upcoming
 
-# Global balance and disposable income calculation
-def calculate_balance_and_income(paychecks: List[RecurringPayPeriod], bills: List[RecurringBill], today: date):
+# Occurrence stream for a single bill or pay period
+def iter_occurrences(item, start: date, end: date) -> Iterator[date]:
     """
-    Calculates the global balance and estimated disposable income for the week.
+    Lazily yields the dates a bill or pay period occurs between `start` and `end`, inclusive.
+    """
+    if item.start_date is None:
+        return iter(())
+    return item.rule.iter_between(start, end, getattr(item, "end_date", None))
+
+
+class CashFlowEvent(NamedTuple):
+    date: date
+    kind: str  # "pay" or "bill"
+    item: object
+    amount: float
+    balance: float  # Running balance after this event
+
+
+# Paychecks sort ahead of bills on the same day so that day's income can cover them
+PAY, BILL = 0, 1
+
+
+def cash_flow_timeline(paychecks: Iterable[RecurringPayPeriod], bills: Iterable[RecurringBill], start: date,
+                       end: date, opening_balance: float = 0.0) -> Iterator[CashFlowEvent]:
+    """
+    Merges every paycheck and bill occurrence between `start` and `end` into one date-ordered
+    stream with a running balance. Each item contributes a lazy generator and the streams are
+    k-way merged with a heap, so the cost is linear in the number of events.
+    """
+    def stream(order, index, item):
+        for occ in iter_occurrences(item, start, end):
+            yield occ, order, index, item
+
+    streams = [stream(PAY, index, pay) for index, pay in enumerate(active_between(paychecks, start, end))]
+    streams += [stream(BILL, index, bill) for index, bill in enumerate(active_between(bills, start, end))]
+
+    # The running balance is kept in integer cents so it never drifts over long ranges
+    balance = to_cents(opening_balance)
+    for occ, order, _, item in heapq.merge(*streams, key=lambda event: event[:3]):
+        if order == PAY:
+            balance += item.amount_cents
+            yield CashFlowEvent(occ, "pay", item, item.amount, from_cents(balance))
+        else:
+            balance -= item.amount_cents
+            yield CashFlowEvent(occ, "bill", item, item.amount, from_cents(balance))
+
+
+class WeeklySummary(NamedTuple):
+    bills_due: List[Tuple[RecurringBill, date]]
+    overdue: List[Tuple[RecurringBill, date]]
+    pay_occurred: List[Tuple[RecurringPayPeriod, date]]
+    pay_upcoming: List[Tuple[RecurringPayPeriod, date]]
+    total_income: float
+    total_bills: float
+    disposable_income: float
+
+
+@instrumentation.instrumented()
+def weekly_summary(paychecks: List[RecurringPayPeriod], bills: List[RecurringBill], today: date,
+                   ledger=None) -> WeeklySummary:
+    """
+    Builds the week's due/overdue bills, paychecks and totals from a single pass over the timeline.
+
+    With a PaymentLedger, bills are settled the way get_bills_this_week settles them: paid or
+    skipped occurrences drop out of the overdue list and the bill total, and occurrences left
+    unpaid in earlier weeks are carried in.
     """
+    start, end = get_week_range(today)
+    settled, carried = _ledger_view(ledger, bills, start, today)
+    return _summarize(((event.date, event.kind == "pay", event.item)
+                       for event in cash_flow_timeline(paychecks, bills, start, end)), today,
+                      ledger, settled, carried)
+
+
+def _summarize(events: Iterable[Tuple[date, bool, object]], today: date, ledger=None, settled=(),
+               carried=()) -> WeeklySummary:
+    # Groups date-ordered (date, is_pay, item) events into a WeeklySummary, after the bills
+    # carried from earlier weeks and skipping settled ones (see _ledger_view)
+    bills_due, overdue, pay_occurred, pay_upcoming = [], list(carried), [], []
     total_income = 0
-    total_bills = 0
+    total_bills = sum(bill.amount_cents for bill, _ in carried)
+
+    for occ, is_pay, item in events:
+        if is_pay:
+            if occ < today:
+                pay_occurred.append((item, occ))
+                total_income += item.amount_cents  # Only pay that has already arrived counts as income
+            else:
+                pay_upcoming.append((item, occ))
+        else:
+            if occ < today:
+                if settled and (ledger.key_for(item), occ) in settled:
+                    continue  # Already paid or skipped
+                overdue.append((item, occ))
+            else:
+                bills_due.append((item, occ))
+            total_bills += item.amount_cents
+
+    # Totals are summed in cents and converted once
+    return WeeklySummary(bills_due, overdue, pay_occurred, pay_upcoming, from_cents(total_income),
+                         from_cents(total_bills), from_cents(total_income - total_bills))
+
+
+class LiveWeeklySummary:
+    """
+    This week's summary for a Repository, kept current from its change events.
+
+    Every item's dates in the week are stored next to it, so adding, editing or removing one
+    item recomputes just that item, and `summary()` only regroups the stored dates. A reloaded
+    collection is marked stale and rebuilt by the next `summary()` call, which can run on a
+    background thread: events that arrive during the rebuild keep it stale instead of being lost.
 
-    # Add income from occurred paychecks
-    occurred, _ = get_paychecks_this_week(paychecks, today)
-    for pay, _ in occurred:
-        total_income += pay.amount
+    Payments are recorded outside the repository, so with a PaymentLedger each `summary()`
+    asks it afresh which of the week's bills are settled, as weekly_summary does.
+    """
+
+    def __init__(self, repository, today: date, ledger=None):
+        self.repository = repository
+        self.ledger = ledger
+        self._lock = threading.Lock()
+        self._entries = {BILLS: [], PAY_PERIODS: []}  # Collection -> [(item, dates this week)]
+        self._generations = {BILLS: 0, PAY_PERIODS: 0}
+        self._stale = {BILLS, PAY_PERIODS}
+        self.set_today(today)
+        self.unsubscribe = repository.subscribe(self.on_change)
+
+    def set_today(self, today: date):
+        """
+        Moves the summary to a new day; crossing into a new week rebuilds it.
+        """
+        week = get_week_range(today)
+        with self._lock:
+            if getattr(self, "week", None) != week:
+                self.week = week
+                for collection in self._entries:
+                    self._generations[collection] += 1
+                    self._stale.add(collection)
+            self.today = today
+
+    def _entry(self, item):
+        return item, tuple(iter_occurrences(item, *self.week))
+
+    def on_change(self, event):
+        with self._lock:
+            self._generations[event.collection] += 1
+            if event.kind == RELOADED:
+                self._stale.add(event.collection)
+            if event.collection in self._stale:
+                return  # Rebuilt in full by the next summary()
+            entries = self._entries[event.collection]
+            if event.kind == ADDED:
+                entries.append(self._entry(event.item))
+            elif event.kind == UPDATED:
+                entries[event.index] = self._entry(event.item)
+            elif event.kind == REMOVED:
+                del entries[event.index]
+
+    @property
+    def stale(self) -> bool:
+        return bool(self._stale)
+
+    def _rebuild(self, collection):
+        with self._lock:
+            generation = self._generations[collection]
+            items = list(getattr(self.repository, collection))
+        entries = [self._entry(item) for item in items]
+        with self._lock:
+            if self._generations[collection] == generation:
+                self._entries[collection] = entries
+                self._stale.discard(collection)
 
-    # Add bills that have occurred this week (or are overdue)
-    due_bills, overdue_bills = get_bills_this_week(bills, today)
-    for bill, _ in due_bills + overdue_bills:
-        total_bills += bill.amount
+    def summary(self) -> WeeklySummary:
+        while self._stale:
+            for collection in list(self._stale):
+                self._rebuild(collection)
 
-    disposable_income = total_income - total_bills
+        with self._lock:
+            events = [(occ, PAY, index, item) for index, (item, dates) in enumerate(self._entries[PAY_PERIODS])
+                      for occ in dates]
+            events += [(occ, BILL, index, item) for index, (item, dates) in enumerate(self._entries[BILLS])
+                       for occ in dates]
+            today, week = self.today, self.week
+            bills = [item for item, _ in self._entries[BILLS]] if self.ledger is not None else ()
+        events.sort(key=lambda event: event[:3])
+        settled, carried = _ledger_view(self.ledger, bills, week[0], today)
+        return _summarize(((occ, order == PAY, item) for occ, order, _, item in events), today,
+                          self.ledger, settled, carried)
 
-    return total_income, total_bills, disposable_income
+
+# Global balance and disposable income calculation
+@instrumentation.instrumented()
+def calculate_balance_and_income(paychecks: List[RecurringPayPeriod], bills: List[RecurringBill], today: date):
+    """
+    Calculates the global balance and estimated disposable income for the week.
+    """
+    summary = weekly_summary(paychecks, bills, today)
+    return summary.total_income, summary.total_bills, summary.disposable_income
 
 # Confirm if a bill has been processed if it's overdue
-def confirm_bill_payment(bills: List[RecurringBill], today: date):
+def confirm_bill_payment(bills: List[RecurringBill], today: date, ledger=None):
     """
     Ask the user to confirm if overdue bills have been processed.
+    Answers are recorded in the ledger, when one is given, so they aren't asked about again.
     """
-    _, overdue_bills = get_bills_this_week(bills, today)
+    _, overdue_bills = get_bills_this_week(bills, today, ledger)
+    answers = []
     for bill, date_due in overdue_bills:
         # Show overdue bills and ask for confirmation
         print(f"Bill: {bill.name} due on {date_due.strftime('%A %m/%d')}")
-        confirmation = input(f"Has {bill.name} been processed? (y/n): ").lower()
+        confirmation = input(f"Has {bill.name} been processed? (y/n, s to skip): ").lower()
         if confirmation == 'y':
             # Process payment and update balance
             print(f"{bill.name} payment confirmed.")
+            answers.append((bill, date_due, PAID, None))
+        elif confirmation == 's':
+            print(f"{bill.name} payment skipped.")
+            answers.append((bill, date_due, SKIPPED, None))
         else:
             print(f"{bill.name} payment still pending.")
+            answers.append((bill, date_due, UNPAID, None))
+
+    if ledger is not None and answers:
+        ledger.record_many(answers)
 
 if __name__ == "__main__":
     test_dates = [